@@ -0,0 +1,72 @@
+"""
+Benchmark: binary columnar input (.npz / .h5) vs. the .nk text path.
+
+    python benchmarks/bench_binary_input.py --rows 1000 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from optical_constant_plugin.parsers.optical_io import load_nk_arrays, load_nk_text
+
+
+def synthetic(rows):
+    wl = np.linspace(250.0, 2500.0, rows)
+    n = 2.0 + 0.3 * np.exp(-wl / 500.0)
+    k = 0.5 * np.exp(-wl / 300.0)
+    return wl, n, k
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        # touch the data so memory-mapped arrays are actually read
+        float(np.sum(out[1]))
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = ap.parse_args()
+
+    try:
+        import h5py
+    except ImportError:
+        h5py = None
+
+    print(f"{'rows':>10} {'format':>14} {'size MB':>8} {'load s':>8} {'vs .nk':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            wl, n, k = synthetic(rows)
+            paths = {}
+
+            paths[".nk"] = os.path.join(tmp, f"m_{rows}.nk")
+            np.savetxt(paths[".nk"], np.column_stack([wl, n, k]), fmt="%.6f %.6f %.6e")
+            paths[".npz"] = os.path.join(tmp, f"m_{rows}.npz")
+            np.savez(paths[".npz"], wavelength=wl, n=n, k=k, method="synthetic")
+            paths[".npz (zip)"] = os.path.join(tmp, f"m_{rows}_c.npz")
+            np.savez_compressed(paths[".npz (zip)"], wavelength=wl, n=n, k=k)
+            if h5py is not None:
+                paths[".h5"] = os.path.join(tmp, f"m_{rows}.h5")
+                with h5py.File(paths[".h5"], "w") as f:
+                    for name, arr in (("wavelength", wl), ("n", n), ("k", k)):
+                        f[name] = arr
+                    f.attrs["method"] = "synthetic"
+
+            t_text = timed(lambda p: (lambda a: (a[:, 0], a[:, 1], a[:, 2]))(load_nk_text(p)), paths[".nk"])
+            for fmt, path in paths.items():
+                t = t_text if fmt == ".nk" else timed(load_nk_arrays, path)
+                size = os.path.getsize(path) / 1e6
+                print(f"{rows:>10} {fmt:>14} {size:>8.2f} {t:>8.4f} {t_text / t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: streaming first-non-empty scan in parse_electrical_csv vs. the
+legacy list(reader) + per-column rescan.
+
+Two layouts: "dense" (all columns filled on the first row, early exit) and
+"sparse" (one column only filled at the very last row, full scan).
+
+    python benchmarks/bench_electrical_csv.py --rows 1000000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from optical_constant_plugin.parsers.electrical_io import CSV_COLUMNS, ffloat, parse_electrical_csv
+
+
+def legacy_parse(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return None
+
+    def first(col):
+        for r in rows:
+            v = r.get(col)
+            if v is None or str(v).strip() == "":
+                continue
+            return v
+        return None
+
+    keys = ("Eg", "chi", "mu_e", "mu_h", "Nc", "Nv", "eps_r", "Ec", "Ev", "mdos_e", "mdos_h")
+    out = {k: ffloat(first(col)) for k, col in zip(keys, CSV_COLUMNS)}
+    if all(v is None for v in out.values()):
+        return None
+    return out
+
+
+def write_synthetic(path, rows, sparse):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(CSV_COLUMNS)
+        for i in range(rows):
+            vals = ["%.4f" % (1.0 + (i % 97) * 1e-3) for _ in CSV_COLUMNS]
+            if sparse:
+                vals[-1] = "0.45" if i == rows - 1 else ""
+            w.writerow(vals)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    args = ap.parse_args()
+
+    print(f"{'rows':>10} {'layout':>7} {'legacy s':>9} {'stream s':>9} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for sparse in (False, True):
+                path = os.path.join(tmp, f"el_{rows}_{sparse}.csv")
+                write_synthetic(path, rows, sparse)
+                old, t_old = timed(legacy_parse, path)
+                new, t_new = timed(parse_electrical_csv, path)
+                assert old == {k: new[k] for k in old}, (old, new)
+                layout = "sparse" if sparse else "dense"
+                print(f"{rows:>10} {layout:>7} {t_old:>9.3f} {t_new:>9.4f} {t_old / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: archive size and read latency with inline vs HDF5-offloaded arrays.
+
+Builds an optical entry shaped like the normalizer's output (datasets with
+wavelength, n, k, six derived arrays and downsampled plot copies, plus the
+entry's plot arrays), writes it as archive JSON (what optical-ingest
+writes, arrays as lists) with everything inline and with the offloadable
+arrays (wavelength/n/k, the derived ones and the spread arrays; the *_plot
+copies stay inline) moved to an HDF5 side file by
+array_storage.offload_arrays under several storage options. Reports the
+archive + side file sizes, the latency of loading the archive to read one
+scalar, and the latency of lazily reading one dataset's wavelength/n/k
+afterwards.
+
+    python benchmarks/bench_hdf5_storage.py --datasets 3 --points 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from optical_constant_plugin.array_storage import DATASET_ARRAYS, PLOT_ARRAYS, offload_arrays, section_arrays
+
+OPTIONS = (
+    ("float64, none", False, "none"),
+    ("float64, gzip", False, "gzip"),
+    ("float32, gzip", True, "gzip"),
+    ("float32, lzf", True, "lzf"),
+)
+
+
+def make_entry(n_datasets, points, plot_points, seed=0):
+    rng = np.random.default_rng(seed)
+    datasets = []
+    for i in range(n_datasets):
+        wl = np.sort(rng.uniform(250.0, 2500.0, points))
+        n = 1.5 + 0.5 / (wl / 1000.0) ** 2 + rng.normal(0, 1e-3, points)
+        k = 0.5 / (1.0 + np.exp((wl - 500.0 - 50 * i) / 30.0))
+        ds = SimpleNamespace(source_name=f"dataset {i}", wavelength=wl, n=n, k=k)
+        for name in DATASET_ARRAYS:
+            if not hasattr(ds, name):
+                setattr(ds, name, n * k + rng.normal(0, 1e-3, points))
+            setattr(ds, f"{name}_ref", None)
+        step = max(1, points // plot_points)
+        ds.wavelength_plot, ds.n_plot, ds.k_plot = wl[::step], n[::step], k[::step]
+        datasets.append(ds)
+    data = SimpleNamespace(material="X", n_400nm=2.1, k_400nm=0.3, kk_score=0.9, datasets=datasets)
+    for name in ("wavelength_plot", "n_plot", "k_plot", *PLOT_ARRAYS):
+        setattr(data, name, np.linspace(0.0, 1.0, plot_points))
+    for name in PLOT_ARRAYS:
+        setattr(data, f"{name}_ref", None)
+    return data
+
+
+def to_dict(section):
+    out = {}
+    for name, value in vars(section).items():
+        if value is None:
+            continue
+        if isinstance(value, np.ndarray):
+            out[name] = value.tolist()
+        elif isinstance(value, list):
+            out[name] = [to_dict(v) for v in value]
+        else:
+            out[name] = value
+    return out
+
+
+def write_archive(path, data):
+    with open(path, "w") as f:
+        json.dump({"data": to_dict(data)}, f)
+
+
+def read_scalar(path, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        with open(path) as f:
+            value = json.load(f)["data"]["n_400nm"]
+        times.append(time.perf_counter() - t0)
+        assert value == 2.1
+    return np.median(times) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--datasets", type=int, default=3)
+    ap.add_argument("--points", type=int, default=20000)
+    ap.add_argument("--plot-points", type=int, default=2000)
+    ap.add_argument("--min-points", type=int, default=1000)
+    ap.add_argument("--repeats", type=int, default=10)
+    args = ap.parse_args()
+
+    print(f"{'storage':>16} {'archive MB':>10} {'side MB':>8} {'scalar ms':>10} {'lazy n,k ms':>13}")
+    with tempfile.TemporaryDirectory() as root:
+        data = make_entry(args.datasets, args.points, args.plot_points)
+        path = os.path.join(root, "inline.archive.json")
+        write_archive(path, data)
+        size = os.path.getsize(path) / 1e6
+        print(f"{'inline':>16} {size:>10.2f} {'-':>8} {read_scalar(path, args.repeats):>10.2f} {'-':>13}")
+
+        for i, (label, float32, compression) in enumerate(OPTIONS):
+            data = make_entry(args.datasets, args.points, args.plot_points)
+            archive = SimpleNamespace(data=data, metadata=SimpleNamespace(mainfile=f"entry{i}.nk"))
+            sections = [(ds, f"datasets/{j}", DATASET_ARRAYS) for j, ds in enumerate(data.datasets)]
+            sections.append((data, "", PLOT_ARRAYS))
+            offload_arrays(archive, sections, args.min_points, root=root, float32=float32, compression=compression)
+
+            path = os.path.join(root, f"entry{i}.archive.json")
+            write_archive(path, data)
+            side = os.path.getsize(os.path.join(root, f"entry{i}.nk.arrays.h5")) / 1e6
+
+            times = []
+            for _ in range(args.repeats):
+                t0 = time.perf_counter()
+                section_arrays(archive, data.datasets[0], ("wavelength", "n", "k"), root=root)
+                times.append(time.perf_counter() - t0)
+            print(f"{label:>16} {os.path.getsize(path) / 1e6:>10.3f} {side:>8.2f} "
+                  f"{read_scalar(path, args.repeats):>10.3f} {np.median(times) * 1e3:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark: FFT Kramers-Kronig check (kk_consistency) vs. a naive
+O(N^2) principal-value KK integral, on a Lorentz-oscillator n,k spectrum.
+
+The naive integral is only run up to --naive-max points; every size is
+checked against the per-entry normalize budget.
+
+    python benchmarks/bench_kramers_kronig.py --points 1000 10000 100000 1000000 --budget 0.5
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from optical_constant_plugin.normalizers.optical_math import HC_EV_NM, kk_consistency
+
+
+def lorentz_nk(wl, E0=3.0, f=20.0, gamma=0.3, eps_inf=2.0):
+    E = HC_EV_NM / wl
+    N = np.sqrt(eps_inf + f / (E0 ** 2 - E ** 2 - 1j * gamma * E))
+    return N.real, N.imag
+
+
+def naive_kk(wl, k):
+    """n - 1 = 2/pi P int E' k(E') / (E'^2 - E^2) dE' by trapezoids, skipping E' = E."""
+    E = (HC_EV_NM / wl)[::-1]
+    kE = k[::-1]
+    w = np.gradient(E)
+    out = np.empty_like(E)
+    for i, e in enumerate(E):
+        d = E * E - e * e
+        d[i] = np.inf
+        out[i] = 2.0 / np.pi * np.sum(w * E * kE / d)
+    return out[::-1]
+
+
+def best_of(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--points", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    ap.add_argument("--naive-max", type=int, default=20_000, help="Largest size for the O(N^2) integral.")
+    ap.add_argument("--budget", type=float, default=0.5, help="Per-entry normalize budget (s).")
+    args = ap.parse_args()
+
+    print(f"{'points':>9} {'naive s':>9} {'fft s':>8} {'speedup':>8} {'score':>7} {'budget':>7}")
+    for N in args.points:
+        wl = np.linspace(200.0, 2000.0, N)
+        n, k = lorentz_nk(wl)
+
+        (score, _), t_fft = best_of(kk_consistency, wl, n, k)
+        if N <= args.naive_max:
+            _, t_naive = best_of(naive_kk, wl, k, repeat=1)
+            naive, speedup = f"{t_naive:>9.3f}", f"{t_naive / t_fft:>7.0f}x"
+        else:
+            naive, speedup = f"{'-':>9}", f"{'-':>8}"
+        ok = "ok" if t_fft <= args.budget else "OVER"
+        print(f"{N:>9} {naive} {t_fft:>8.4f} {speedup} {score:>7.3f} {ok:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: mainfile matching throughput on a synthetic mixed upload.
+
+Compares the old extension-only matchers with the content-sniffing ones and
+reports how many files each would hand to a full parse.
+
+    python benchmarks/bench_mainfile_matching.py --files 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from optical_constant_plugin.parsers.electrical_io import sniff_electrical_csv_buffer, sniff_tibercad_buffer
+from optical_constant_plugin.parsers.optical_io import read_head, sniff_nk_buffer
+
+NOMAD_BUFFER_BYTES = 2048
+
+
+def _nk(rng):
+    wl = np.linspace(300, 1200, 200)
+    rows = np.column_stack([wl, 2 + rng.random(200) * 0.1, rng.random(200) * 0.01])
+    return "# wavelength n k\n" + "\n".join("%.3f %.5f %.5e" % tuple(r) for r in rows) + "\n"
+
+
+def _dat(rng):
+    return (
+        "[bandgap]\nEg_G = %.3f\n\n[valenceband]\nE_v = -5.4\nm_dos = 0.8\n"
+        "[conductionband]\nm_dos = 0.3\n[mobility/constant]\nmu_max = (20, 5)\n"
+        % (1 + rng.random())
+    )
+
+
+def _csv(rng):
+    return "Eg_eV,chi_eV,eps_r\n%.3f,4.1,6.5\n" % (1 + rng.random())
+
+
+def _log(rng):
+    return "".join("INFO step %d converged in %.2f s\n" % (i, rng.random()) for i in range(80))
+
+
+def _other_csv(rng):
+    return "time,voltage,current\n" + "".join("%d,%.3f,%.3e\n" % (i, rng.random(), rng.random()) for i in range(80))
+
+
+def _other_dat(rng):
+    return "".join("%.4f\t%.4f\n" % (rng.random(), rng.random()) for i in range(200))
+
+
+KINDS = [
+    ("data.nk", _nk), ("data.txt", _nk), ("mat.dat", _dat), ("mat.csv", _csv),
+    ("notes.txt", _log), ("scan.csv", _other_csv), ("trace.dat", _other_dat), ("readme.txt", _log),
+]
+
+
+def make_upload(root, n_files, seed=0):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(n_files):
+        suffix, gen = KINDS[i % len(KINDS)]
+        path = os.path.join(root, f"f{i:06d}_{suffix}")
+        with open(path, "w") as f:
+            f.write(gen(rng))
+        paths.append(path)
+    return paths
+
+
+def old_optical(path, head):
+    fn = path.lower()
+    return fn.endswith(".txt") or fn.endswith(".nk")
+
+
+def old_electrical(path, head):
+    fn = path.lower()
+    return fn.endswith(".dat") or fn.endswith(".csv")
+
+
+def new_optical(path, head):
+    fn = path.lower()
+    return (fn.endswith(".txt") or fn.endswith(".nk")) and sniff_nk_buffer(head)
+
+
+def new_electrical(path, head):
+    fn = path.lower()
+    if fn.endswith(".dat"):
+        return sniff_tibercad_buffer(head)
+    if fn.endswith(".csv"):
+        return sniff_electrical_csv_buffer(head)
+    return False
+
+
+def run(paths, heads, matchers):
+    t0 = time.perf_counter()
+    claimed = 0
+    for path, head in zip(paths, heads):
+        claimed += sum(bool(m(path, head)) for m in matchers)
+    return claimed, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--files", type=int, default=10_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_upload(tmp, args.files)
+        t0 = time.perf_counter()
+        # NOMAD reads the head once and hands the same buffer to every parser
+        heads = [read_head(p, NOMAD_BUFFER_BYTES) for p in paths]
+        t_read = time.perf_counter() - t0
+
+    expected = sum(1 for i in range(args.files) if KINDS[i % len(KINDS)][0].startswith(("data", "mat")))
+    print(f"files: {args.files}  (real mainfiles: {expected}, head read: {t_read:.3f} s, "
+          f"buffer {NOMAD_BUFFER_BYTES} B)")
+    print(f"{'matcher':>10} {'claimed':>8} {'time s':>8} {'files/s':>10}")
+    for label, matchers in (("old", (old_optical, old_electrical)), ("new", (new_optical, new_electrical))):
+        claimed, dt = run(paths, heads, matchers)
+        print(f"{label:>10} {claimed:>8} {dt:>8.3f} {args.files / dt:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: SQLite material index joining optical and electrical entries.
+
+Fills an index with synthetic entries (two optical + one electrical entry
+per material) from several writer processes at once, as parallel ingest
+workers do, then reports upsert throughput, single-material lookup
+latency (median / p95), batched lookup of every material and the
+materials-with-both-kinds join, next to a client-side join of two
+per-kind entry lists.
+
+    python benchmarks/bench_material_index.py --materials 5000 --writers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from optical_constant_plugin.material_index import MaterialIndex, material_key
+
+
+def names(N):
+    return [f"Mat_{i:05d}" for i in range(N)]
+
+
+def write_part(args):
+    path, N, part, writers = args
+    index = MaterialIndex(path)
+    rng = np.random.default_rng(part)
+    count = 0
+    for i, name in enumerate(names(N)):
+        if i % writers != part:
+            continue
+        for j in range(2):
+            index.upsert(f"opt-{i}-{j}", "optical", name, {"n_vis": float(rng.uniform(1.3, 3.5))})
+        index.upsert(f"el-{i}", "electrical", name.lower(), {"Eg": float(rng.uniform(0.5, 5.0))})
+        count += 3
+    index.close()
+    return count
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--materials", type=int, default=5000)
+    ap.add_argument("--writers", type=int, default=4)
+    ap.add_argument("--lookups", type=int, default=2000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "materials.sqlite")
+        MaterialIndex(path).close()
+
+        t0 = time.perf_counter()
+        with Pool(args.writers) as pool:
+            parts = [(path, args.materials, p, args.writers) for p in range(args.writers)]
+            total = sum(pool.map(write_part, parts))
+        dt = time.perf_counter() - t0
+        print(f"upserts: {total} from {args.writers} processes in {dt:.2f} s ({total / dt:.0f}/s)")
+
+        index = MaterialIndex(path)
+        all_names = names(args.materials)
+        rng = np.random.default_rng(0)
+        lat = []
+        for i in rng.integers(0, args.materials, args.lookups):
+            t0 = time.perf_counter()
+            rec = index.lookup(all_names[i].upper())
+            lat.append(time.perf_counter() - t0)
+            assert rec and len(rec["optical"]) == 2 and len(rec["electrical"]) == 1
+        lat = np.array(lat) * 1e3
+        print(f"lookup: p50 {np.median(lat):.3f} ms  p95 {np.percentile(lat, 95):.3f} ms  ({len(index)} materials)")
+
+        t0 = time.perf_counter()
+        recs = index.lookup_many(all_names)
+        print(f"lookup_many: {len(recs)} materials in {time.perf_counter() - t0:.3f} s")
+
+        t0 = time.perf_counter()
+        both = index.joined()
+        print(f"joined: {len(both)} materials in {time.perf_counter() - t0:.3f} s")
+
+        # client-side join of two per-kind result lists, per queried material
+        optical = [(f"opt-{i}-{j}", n) for i, n in enumerate(all_names) for j in range(2)]
+        electrical = [(f"el-{i}", n.lower()) for i, n in enumerate(all_names)]
+        queries = rng.integers(0, args.materials, 200)
+        t0 = time.perf_counter()
+        for i in queries:
+            key = material_key(all_names[i])
+            [e for e, n in optical if material_key(n) == key]
+            [e for e, n in electrical if material_key(n) == key]
+        per = (time.perf_counter() - t0) / len(queries) * 1e3
+        print(f"client-side scan join: {per:.3f} ms per material")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
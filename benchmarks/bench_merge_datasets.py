@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: merging many n,k datasets onto their union grid
+(merge_spectra) vs. a per-dataset interp_at loop + np.nanmedian.
+
+    python benchmarks/bench_merge_datasets.py --datasets 10 100 500
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from optical_constant_plugin.normalizers.optical_math import (
+    interp_at,
+    merge_spectra,
+    union_grid,
+)
+
+
+def make_datasets(D, points, seed=0):
+    rng = np.random.default_rng(seed)
+    wls, ns, ks = [], [], []
+    for _ in range(D):
+        m = int(rng.integers(points // 2, points))
+        wl = np.sort(rng.uniform(rng.uniform(250, 400), rng.uniform(900, 2500), m))
+        k = 0.5 * np.exp(-wl / 300.0)
+        k[rng.integers(0, m, size=3)] = np.nan
+        wls.append(wl)
+        ns.append(2.0 + 0.3 * np.exp(-wl / 500.0) + rng.normal(0, 0.01, m))
+        ks.append(k)
+    return wls, ns, ks
+
+
+def legacy(wls, ns, ks, max_points):
+    grid = union_grid(wls, max_points)
+    N = np.vstack([interp_at(wl, [n], grid) for wl, n in zip(wls, ns)])
+    K = np.vstack([interp_at(wl, [k], grid) for wl, k in zip(wls, ks)])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return grid, np.nanmedian(N, axis=0), np.nanmedian(K, axis=0)
+
+
+def best_of(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--datasets", type=int, nargs="+", default=[10, 100, 500])
+    ap.add_argument("--points", type=int, default=2000, help="Max points per dataset.")
+    ap.add_argument("--max-points", type=int, default=20000, help="Cap of the union grid.")
+    args = ap.parse_args()
+
+    print(f"{'datasets':>9} {'grid':>7} {'legacy s':>9} {'merged s':>9} {'speedup':>8}")
+    for D in args.datasets:
+        wls, ns, ks = make_datasets(D, args.points)
+
+        (grid, n_ref, k_ref), t_old = best_of(legacy, wls, ns, ks, args.max_points)
+        (grid2, merged), t_new = best_of(merge_spectra, wls, ns, ks, args.max_points)
+        np.testing.assert_array_equal(grid, grid2)
+        np.testing.assert_allclose(merged["n"], n_ref, equal_nan=True)
+        np.testing.assert_allclose(merged["k"], k_ref, equal_nan=True)
+        print(f"{D:>9} {grid.size:>7} {t_old:>9.4f} {t_new:>9.4f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: vectorized .nk loader vs. the legacy per-line loop.
+
+    python benchmarks/bench_nk_loader.py                 # 1k, 1M, 10M rows
+    python benchmarks/bench_nk_loader.py --rows 1000 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from optical_constant_plugin.parsers.optical_io import load_nk_text
+
+
+def legacy_loop(path):
+    data = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            try:
+                data.append((float(parts[0]), float(parts[1]), float(parts[2])))
+            except ValueError:
+                continue
+    arr = np.array(data, dtype=float)
+    return arr[np.argsort(arr[:, 0], kind="stable")]
+
+
+def write_synthetic(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    wl = np.linspace(250.0, 2500.0, rows)
+    n = 2.0 + 0.3 * np.exp(-wl / 500.0) + 1e-3 * rng.standard_normal(rows)
+    k = np.abs(0.5 * np.exp(-wl / 300.0) + 1e-4 * rng.standard_normal(rows))
+    with open(path, "w") as f:
+        f.write("# wavelength(nm) n k\n")
+        np.savetxt(f, np.column_stack([wl, n, k]), fmt="%.6f %.6f %.6e")
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 1_000_000, 10_000_000])
+    ap.add_argument("--skip-legacy-above", type=int, default=None,
+                    help="Skip the legacy loop for files larger than this many rows.")
+    args = ap.parse_args()
+
+    print(f"{'rows':>12} {'size MB':>9} {'legacy s':>10} {'bulk s':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"bench_{rows}.nk")
+            write_synthetic(path, rows)
+            size_mb = os.path.getsize(path) / 1e6
+
+            new, t_new = timed(load_nk_text, path)
+            if args.skip_legacy_above is not None and rows > args.skip_legacy_above:
+                print(f"{rows:>12} {size_mb:>9.1f} {'-':>10} {t_new:>10.3f} {'-':>8}")
+                continue
+
+            old, t_old = timed(legacy_loop, path)
+            assert np.array_equal(old, new), "loaders disagree"
+            print(f"{rows:>12} {size_mb:>9.1f} {t_old:>10.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: similarity index over canonical n,k vectors at library scale.
+
+Builds an index of synthetic Cauchy + absorption-edge spectra with partial
+coverage, then reports PCA fit time, single-query latency (median / p95),
+batched query throughput and recall@top against an exact brute-force
+spectral_distance search.
+
+    python benchmarks/bench_similarity_index.py --entries 10000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from optical_constant_plugin.normalizers.optical_math import canonical_grid
+from optical_constant_plugin.similarity import SimilarityIndex, spectral_distance
+
+
+def make_library(N, grid, seed=0):
+    rng = np.random.default_rng(seed)
+    lam = grid / 1000.0
+    A = rng.uniform(1.3, 3.5, (N, 1))
+    B = rng.uniform(0.0, 0.05, (N, 1))
+    edge = rng.uniform(300.0, 1200.0, (N, 1))
+    width = rng.uniform(20.0, 200.0, (N, 1))
+    n = (A + B / lam ** 2).astype(np.float32)
+    k = (rng.uniform(0.1, 2.0, (N, 1)) / (1.0 + np.exp((grid - edge) / width))).astype(np.float32)
+    idx = np.arange(grid.size)
+    lo = rng.integers(0, grid.size // 3, N)[:, None]
+    hi = rng.integers(2 * grid.size // 3, grid.size + 1, N)[:, None]
+    return n, k, (idx >= lo) & (idx < hi)
+
+
+def exact(V, M, v, m, top):
+    rms = spectral_distance(V, M, v[None, :], m[None, :])
+    return set(np.argsort(rms, kind="stable")[:top].tolist())
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--entries", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--components", type=int, default=32)
+    ap.add_argument("--candidates", type=int, default=64)
+    args = ap.parse_args()
+
+    grid = canonical_grid()
+    print(f"{'entries':>8} {'add s':>7} {'fit s':>7} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'batch q/s':>10} {'recall':>7}")
+    for N in args.entries:
+        n, k, M = make_library(N, grid)
+        V = np.concatenate([n, k], axis=1)
+        qn, qk, qm = make_library(args.queries, grid, seed=1)
+
+        index = SimilarityIndex(components=args.components)
+        t0 = time.perf_counter()
+        for i in range(N):
+            index.add(f"entry{i}", n[i], k[i], M[i], material=f"m{i % 1000}")
+        t_add = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        index.fit()
+        t_fit = time.perf_counter() - t0
+
+        lat = []
+        recall = []
+        for q in range(args.queries):
+            t0 = time.perf_counter()
+            hits = index.query(qn[q], qk[q], qm[q], top=args.top, candidates=args.candidates)
+            lat.append(time.perf_counter() - t0)
+            if q < 20:
+                truth = exact(V, M, np.concatenate([qn[q], qk[q]]), qm[q], args.top)
+                found = {int(h[0][len("entry"):]) for h in hits}
+                recall.append(len(truth & found) / args.top)
+
+        t0 = time.perf_counter()
+        index.query_batch(qn, qk, qm, top=args.top, candidates=args.candidates)
+        t_batch = time.perf_counter() - t0
+
+        lat = np.array(lat) * 1e3
+        print(f"{N:>8} {t_add:>7.2f} {t_fit:>7.2f} {np.median(lat):>7.2f} {np.percentile(lat, 95):>7.2f} "
+              f"{args.queries / t_batch:>10.0f} {np.mean(recall):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: vectorized Nc/Nv/Eg/n_i(T) evaluation vs. a per-temperature,
+per-material Python loop built on the scalar dos_3d_cm3.
+
+    python benchmarks/bench_temperature_models.py --materials 100 500 --points 1000 5000
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from optical_constant_plugin.normalizers.electrical_model import KB_EV, evaluate_temperature_models
+
+
+def dos_3d_cm3(mdos_rel, T=300.0):
+    kB = 1.380649e-23
+    h = 6.62607015e-34
+    m0 = 9.1093837015e-31
+    mdos = float(mdos_rel) * m0
+    return float(2.0 * ((2.0 * np.pi * mdos * kB * T) / (h ** 2)) ** 1.5 / 1e6)
+
+
+def loop(T, Eg, mdos_e, mdos_h, alpha, beta):
+    out = np.empty((4, len(Eg), len(T)))
+    for m in range(len(Eg)):
+        Eg0 = Eg[m] + alpha[m] * 300.0 ** 2 / (300.0 + beta[m])
+        for j, t in enumerate(T):
+            Nc = dos_3d_cm3(mdos_e[m], t)
+            Nv = dos_3d_cm3(mdos_h[m], t)
+            Eg_t = Eg0 - alpha[m] * t * t / (t + beta[m])
+            out[:, m, j] = Nc, Nv, Eg_t, math.sqrt(Nc * Nv) * math.exp(-Eg_t / (2 * KB_EV * t))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--materials", type=int, nargs="+", default=[100, 500])
+    ap.add_argument("--points", type=int, nargs="+", default=[1000, 5000])
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'materials':>10} {'points':>8} {'loop s':>9} {'vector s':>9} {'speedup':>8}")
+    for M in args.materials:
+        Eg = rng.uniform(0.5, 3.5, M)
+        mdos_e = rng.uniform(0.05, 1.0, M)
+        mdos_h = rng.uniform(0.3, 1.5, M)
+        alpha = rng.uniform(2e-4, 6e-4, M)
+        beta = rng.uniform(100, 700, M)
+        for N in args.points:
+            T = np.linspace(50.0, 600.0, N)
+
+            t0 = time.perf_counter()
+            ref = loop(T, Eg, mdos_e, mdos_h, alpha, beta)
+            t_loop = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            res = evaluate_temperature_models(T, Eg=Eg, mdos_e=mdos_e, mdos_h=mdos_h, alpha=alpha, beta=beta)
+            t_vec = time.perf_counter() - t0
+
+            for i, name in enumerate(("Nc", "Nv", "Eg", "ni")):
+                np.testing.assert_allclose(res[name], ref[i], rtol=1e-9)
+            print(f"{M:>10} {N:>8} {t_loop:>9.3f} {t_vec:>9.4f} {t_loop / t_vec:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: table-driven TiberCAD .dat extractor vs. the legacy regex loop.
+
+By default the synthetic files are laid out like real TiberCAD material
+files: many unrelated sections (SRH, doping, thermal, ...) with the band
+sections at the end, so the comparison shows the single-pass cost.
+--wanted-first puts the band sections first, the best case for the early
+exit; --without-ec drops the optional E_c key, which the early exit does
+not wait for.
+
+    python benchmarks/bench_tibercad_dat.py --blocks 1000 100000
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from optical_constant_plugin.parsers.electrical_io import ffloat, parse_tibercad_dat
+
+WANTED = """[bandgap]
+Eg_G = 1.55
+[valenceband]
+E_v = -5.4
+m_dos = 0.8
+[conductionband]
+{ec}m_dos = 0.25
+[permittivity]
+permittivity = (6.5, 6.7)
+[mobility/constant]
+mu_max = (20.0, 5.0)
+"""
+
+FILLER = """[recombination/srh_{i}]
+tau_n = 1e-9   # s
+tau_p = 1e-9
+[doping_{i}]
+N_D = 1e16
+N_A = 0.0
+[thermal_{i}]
+kappa = 1.3
+c_p = 300.0
+"""
+
+
+def legacy_parse(path):
+    section = None
+    out = {"Eg": None, "Ec": None, "Ev": None, "eps_r": None,
+           "mu_e": None, "mu_h": None, "mdos_e": None, "mdos_h": None}
+    re_section = re.compile(r"^\s*\[(.+?)\]\s*$")
+    re_kv = re.compile(r"^\s*([A-Za-z0-9_]+)\s*=\s*(.+?)\s*$")
+    re_tuple = re.compile(r"^\(\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*,\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*\)\s*$")
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            m = re_section.match(line)
+            if m:
+                section = m.group(1).strip().lower()
+                continue
+            m = re_kv.match(line)
+            if not m:
+                continue
+            key = m.group(1).strip()
+            val = m.group(2).split("#", 1)[0].strip()
+            if section == "bandgap" and key == "Eg_G":
+                out["Eg"] = ffloat(val)
+            if section == "valenceband" and key in ("E_v", "Ev"):
+                out["Ev"] = ffloat(val)
+            if section == "conductionband" and key in ("E_c", "Ec", "E_c0"):
+                out["Ec"] = ffloat(val)
+            if section == "permittivity" and key == "permittivity":
+                mt = re_tuple.match(val)
+                if mt:
+                    out["eps_r"] = 0.5 * (ffloat(mt.group(1)) + ffloat(mt.group(2)))
+                else:
+                    out["eps_r"] = ffloat(val)
+            if section == "mobility/constant" and key == "mu_max":
+                mt = re_tuple.match(val)
+                if mt:
+                    out["mu_e"] = ffloat(mt.group(1))
+                    out["mu_h"] = ffloat(mt.group(2))
+            if section == "conductionband" and key == "m_dos":
+                out["mdos_e"] = ffloat(val)
+            if section == "valenceband" and key == "m_dos":
+                out["mdos_h"] = ffloat(val)
+    return out
+
+
+def write_synthetic(path, blocks, wanted_first, with_ec=True):
+    filler = "".join(FILLER.format(i=i) for i in range(blocks))
+    wanted = WANTED.format(ec="E_c = -3.9\n" if with_ec else "")
+    with open(path, "w") as f:
+        f.write(wanted + filler if wanted_first else filler + wanted)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--blocks", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    ap.add_argument("--wanted-first", action="store_true", help="Band sections before the filler (best case).")
+    ap.add_argument("--without-ec", action="store_true", help="Leave out the optional E_c key.")
+    args = ap.parse_args()
+
+    print(f"{'blocks':>10} {'size MB':>8} {'legacy s':>9} {'table s':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for blocks in args.blocks:
+            path = os.path.join(tmp, f"mat_{blocks}.dat")
+            write_synthetic(path, blocks, args.wanted_first, with_ec=not args.without_ec)
+            old, t_old = timed(legacy_parse, path)
+            new, t_new = timed(parse_tibercad_dat, path)
+            assert old == new, (old, new)
+            size = os.path.getsize(path) / 1e6
+            print(f"{blocks:>10} {size:>8.1f} {t_old:>9.3f} {t_new:>9.4f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: vectorized thin-film transfer-matrix sweeps.
+
+Simulates a glass | ITO | ZnO | perovskite | C60 | air stack built from
+synthetic n,k tables, sweeping wavelengths x angles x perovskite
+thicknesses (default 1000 x 10 x 100 = 10^6 points per polarization), and
+compares against a per-point loop of explicit 2x2 matrix products on a
+subset of the points (timing extrapolated, results checked for agreement).
+A second sweep on the same grid shows the interpolation cache at work.
+
+    python benchmarks/bench_transfer_matrix.py --wavelengths 1000 --angles 10 --thicknesses 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from optical_constant_plugin.tmm import Material, simulate_stack
+
+
+def synthetic(name, A, B, edge=None, kmax=0.0, width=30.0):
+    wl = np.linspace(250.0, 1500.0, 600)
+    n = A + B / (wl / 1000.0) ** 2
+    k = kmax / (1.0 + np.exp((wl - edge) / width)) if edge else np.zeros_like(wl)
+    return Material(wl, n, k, name=name)
+
+
+def loop_reference(layers, wl, angles, n0, n_exit, pol):
+    """One point at a time: explicit 2x2 characteristic matrices (N = n - ik)."""
+    out = np.empty((len(angles), len(wl)))
+    for a, theta in enumerate(angles):
+        for w, lam in enumerate(wl):
+            s0 = n0.real * np.sin(theta)
+
+            def admittance(N):
+                cos = np.sqrt(1 - (s0 / N) ** 2 + 0j)
+                cos = -cos if (N * cos).imag > 0 else cos
+                return (N * cos if pol == "s" else N / cos), cos
+
+            M = np.eye(2, dtype=complex)
+            for N, d in layers:
+                N = np.conj(N[w])
+                eta, cos = admittance(N)
+                delta = 2 * np.pi * N * cos * d / lam
+                M = M @ np.array([[np.cos(delta), 1j * np.sin(delta) / eta],
+                                  [1j * eta * np.sin(delta), np.cos(delta)]])
+            eta0, _ = admittance(n0)
+            eta_s, _ = admittance(np.conj(n_exit[w]))
+            B, C = M @ np.array([1.0, eta_s])
+            out[a, w] = abs((eta0 * B - C) / (eta0 * B + C)) ** 2
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--wavelengths", type=int, default=1000)
+    ap.add_argument("--angles", type=int, default=10)
+    ap.add_argument("--thicknesses", type=int, default=100)
+    ap.add_argument("--loop-points", type=int, default=2000, help="points timed for the per-point reference")
+    args = ap.parse_args()
+
+    glass = synthetic("glass", 1.50, 0.004)
+    ito = synthetic("ITO", 1.85, 0.01, edge=320.0, kmax=0.4)
+    zno = synthetic("ZnO", 1.95, 0.015, edge=370.0, kmax=0.6, width=10.0)
+    pvk = synthetic("perovskite", 2.3, 0.04, edge=780.0, kmax=0.8, width=15.0)
+    c60 = synthetic("C60", 1.9, 0.05, edge=450.0, kmax=0.5, width=40.0)
+
+    wl = np.linspace(300.0, 1200.0, args.wavelengths)
+    angles = np.linspace(0.0, 70.0, args.angles)
+    d_pvk = np.linspace(200.0, 1000.0, args.thicknesses)
+    stack = [(ito, 150.0), (zno, 30.0), (pvk, d_pvk), (c60, 40.0)]
+    points = wl.size * angles.size * d_pvk.size
+
+    for label in ("cold", "cached"):
+        t0 = time.perf_counter()
+        res = simulate_stack(stack, wl, angles, incident=glass, exit=1.0, polarization="s")
+        dt = time.perf_counter() - t0
+        print(f"vectorized s-pol ({label:>6}): {points:>9} points  {dt:7.3f} s  {points / dt / 1e6:6.2f} M points/s")
+
+    t0 = time.perf_counter()
+    res_u = simulate_stack(stack, wl, angles, incident=glass, exit=1.0)
+    dt = time.perf_counter() - t0
+    print(f"vectorized unpolarized   : {points:>9} points  {dt:7.3f} s")
+    balance = np.abs(res_u["A_layers"].sum(axis=0) - res_u["A"]).max()
+    print(f"energy balance |sum A_layers - A|max = {balance:.2e}")
+
+    # per-point loop on one thickness and a wavelength subset
+    n_wl = max(1, args.loop_points // angles.size)
+    sub = np.linspace(0, wl.size - 1, n_wl).astype(int)
+    idx = [m.index(wl[sub]) for m in (ito, zno, pvk, c60)]
+    layers = list(zip(idx, (150.0, 30.0, d_pvk[0], 40.0)))
+    t0 = time.perf_counter()
+    ref = loop_reference(layers, wl[sub], np.deg2rad(angles), glass.index(wl[sub])[0].real + 0j,
+                         np.ones(sub.size, dtype=complex), "s")
+    dt_loop = time.perf_counter() - t0
+    per_point = dt_loop / ref.size
+    print(f"per-point loop           : {ref.size:>9} points  {dt_loop:7.3f} s  "
+          f"(~{per_point * points:.0f} s extrapolated to {points} points)")
+
+    # the loop uses a constant incident index; compare on a matching run
+    check = simulate_stack(stack, wl[sub], angles, incident=float(glass.index(wl[sub])[0].real), exit=1.0,
+                           polarization="s")["R"][0]
+    print(f"max |R_vectorized - R_loop| = {np.abs(check - ref).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,10 +35,28 @@ optical_app = AppEntryPoint(
             include=[
                 qopt("material"),
                 qopt("reference"),
+                qopt("k_solar_weighted"),
+                qopt("solar_absorptance"),
+                qopt("solar_spectrum"),
+                qopt("n_uv"),
+                qopt("n_vis"),
+                qopt("n_nir"),
+                qopt("n_400nm"),
+                qopt("k_400nm"),
+                qopt("n_700nm"),
+                qopt("k_700nm"),
             ]
         ),
         filters_locked={"section_defs.definition_qualified_name": [schema_def_opt]},
-        menu=None,
+        menu=Menu(
+            size="sm",
+            items=[
+                MenuItemTerms(search_quantity=qopt("material"), options=50),
+                MenuItemHistogram(x=Axis(search_quantity=qopt("k_solar_weighted"))),
+                MenuItemHistogram(x=Axis(search_quantity=qopt("solar_absorptance"))),
+                MenuItemHistogram(x=Axis(search_quantity=qopt("n_vis"))),
+            ],
+        ),
         dashboard=Dashboard(
             widgets=[
                 WidgetTerms(
@@ -52,6 +70,16 @@ optical_app = AppEntryPoint(
             Column(quantity="entry_name", selected=True),
             Column(quantity=qopt("material"), label="Material", selected=True),
             Column(quantity=qopt("reference"), label="Reference", selected=True),
+            Column(quantity=qopt("k_solar_weighted"), label="Solar-weighted k", selected=True),
+            Column(quantity=qopt("solar_absorptance"), label="Solar absorptance", selected=True),
+            Column(quantity=qopt("solar_spectrum"), label="Solar spectrum", selected=False),
+            Column(quantity=qopt("n_uv"), label="n (UV)", selected=False),
+            Column(quantity=qopt("n_vis"), label="n (VIS)", selected=False),
+            Column(quantity=qopt("n_nir"), label="n (NIR)", selected=False),
+            Column(quantity=qopt("n_400nm"), label="n @400 nm", selected=False),
+            Column(quantity=qopt("k_400nm"), label="k @400 nm", selected=False),
+            Column(quantity=qopt("n_700nm"), label="n @700 nm", selected=False),
+            Column(quantity=qopt("k_700nm"), label="k @700 nm", selected=False),
             Column(quantity="upload_create_time"),
         ],
     ),
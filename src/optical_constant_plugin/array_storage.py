@@ -0,0 +1,179 @@
+"""
+HDF5 side-file storage for the large per-point arrays of optical entries.
+
+With offloading enabled, the normalizer moves every long array of an
+OpticalDataset (wavelength, n, k and the derived ones; optionally also the
+entry's spread arrays) into ``<mainfile>.arrays.h5`` and stores a NOMAD
+HDF5 reference (``"<file>#/<group>/<path>"``) in the matching ``<name>_ref``
+quantity, leaving the inline value empty. Loading an archive for its
+scalars then no longer pulls the arrays; section_array/section_arrays read
+them from the side file only when an analysis asks for them. The plots
+read the small downsampled *_plot copies, which always stay inline.
+
+Files are accessed through the archive's NOMAD context (upload raw files)
+or, offline, below a local directory (root). Arrays can be stored as
+float32 and compressed (gzip with byte shuffle, or lzf).
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+SIDE_FILE_SUFFIX = ".arrays.h5"
+COMPRESSIONS = ("none", "gzip", "lzf")
+
+# OpticalDataset / OpticalConstantsEntry arrays that can be offloaded; each has a <name>_ref quantity.
+# Not the plotted *_plot copies: the plotly annotations read them inline.
+DATASET_ARRAYS = (
+    "wavelength", "n", "k",
+    "absorption_coefficient", "eps1", "eps2", "reflectance", "penetration_depth", "kk_residual",
+)
+PLOT_ARRAYS = ("n_spread_plot", "k_spread_plot")
+
+
+def _h5py():
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError("HDF5 array storage requires h5py.") from e
+    return h5py
+
+
+def split_ref(ref):
+    """("file", "/dataset/path") of an HDF5 reference string."""
+    filename, _, path = str(ref).partition("#")
+    return filename, path
+
+
+def side_file(archive):
+    """Side file name (relative to the upload/root) and HDF5 group of an archive's arrays."""
+    meta = getattr(archive, "metadata", None)
+    mainfile = getattr(meta, "mainfile", None) or "entry"
+    key = getattr(meta, "mainfile_key", None)
+    # child entries of one mainfile share its side file, one group each
+    group = "/entry_" + hashlib.blake2b(str(key).encode(), digest_size=8).hexdigest() if key else "/entry"
+    return mainfile + SIDE_FILE_SUFFIX, group
+
+
+def _open(archive, filename, mode, root=None):
+    if root:
+        path = os.path.join(root, filename)
+        if mode != "rb":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return open(path, mode)
+    context = getattr(archive, "m_context", None)
+    if context is None:
+        raise ValueError("No archive context and no local root to store HDF5 arrays in.")
+    return context.raw_file(filename, mode)
+
+
+def write_arrays(archive, arrays, root=None, float32=False, compression="gzip", level=4):
+    """
+    Write {path: array} (paths relative to the archive's group) into the
+    archive's side file in one pass, replacing existing datasets.
+    Returns {path: reference}.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    h5py = _h5py()
+    filename, group = side_file(archive)
+    opts = {}
+    if compression == "gzip":
+        opts = {"compression": "gzip", "compression_opts": level, "shuffle": True}
+    elif compression == "lzf":
+        opts = {"compression": "lzf", "shuffle": True}
+
+    try:
+        f = _open(archive, filename, "r+b", root)
+    except (FileNotFoundError, OSError):
+        f = _open(archive, filename, "w+b", root)
+    refs = {}
+    with f, h5py.File(f, "a") as h5:
+        for path, values in arrays.items():
+            full = f"{group}/{path}"
+            data = np.asarray(values, dtype=np.float32 if float32 else np.float64)
+            opts_used = opts if data.size > 1 else {}
+            old = h5.get(full)
+            if (old is not None and old.shape == data.shape and old.dtype == data.dtype
+                    and old.compression == opts_used.get("compression")):
+                # rewrite in place: HDF5 does not reclaim the space of deleted datasets
+                old[...] = data
+            else:
+                if old is not None:
+                    del h5[full]
+                h5.create_dataset(full, data=data, **opts_used)
+            refs[path] = f"{filename}#{full}"
+    return refs
+
+
+def read_arrays(archive, refs, root=None):
+    """Arrays (float64) of several references, opening each side file once."""
+    h5py = _h5py()
+    by_file = {}
+    for ref in refs:
+        filename, path = split_ref(ref)
+        by_file.setdefault(filename, []).append((ref, path))
+    out = {}
+    for filename, items in by_file.items():
+        with _open(archive, filename, "rb", root) as f, h5py.File(f, "r") as h5:
+            for ref, path in items:
+                out[ref] = np.asarray(h5[path][()], dtype=np.float64)
+    return [out[ref] for ref in refs]
+
+
+def section_arrays(archive, section, names, root=None):
+    """
+    Arrays of a section: the inline value where present, else read (lazily,
+    one file open) from the <name>_ref reference. None where neither exists.
+    """
+    out = {}
+    pending = {}
+    for name in names:
+        value = getattr(section, name, None)
+        if value is not None and len(value):
+            out[name] = value
+            continue
+        ref = getattr(section, f"{name}_ref", None)
+        if ref:
+            pending[name] = ref
+        else:
+            out[name] = None
+    if pending:
+        out.update(zip(pending, read_arrays(archive, list(pending.values()), root)))
+    return [out[name] for name in names]
+
+
+def section_array(archive, section, name, root=None):
+    return section_arrays(archive, section, [name], root)[0]
+
+
+def offload_arrays(archive, sections, min_points, root=None, float32=False, compression="gzip", level=4):
+    """
+    Move arrays with at least min_points values from the given sections
+    [(section, path prefix, names)] into the side file: sets <name>_ref and
+    clears the inline value. Shorter arrays stay inline (stale refs are
+    dropped). Returns the number of arrays written.
+    """
+    arrays = {}
+    targets = {}
+    for section, prefix, names in sections:
+        for name in names:
+            if not hasattr(section, f"{name}_ref"):
+                continue
+            value = getattr(section, name, None)
+            if value is None or not len(value):
+                continue            # already offloaded (or empty): keep the reference
+            if len(value) < min_points:
+                setattr(section, f"{name}_ref", None)
+                continue
+            path = f"{prefix}/{name}" if prefix else name
+            arrays[path] = value
+            targets[path] = (section, name)
+    if not arrays:
+        return 0
+    refs = write_arrays(archive, arrays, root=root, float32=float32, compression=compression, level=level)
+    for path, (section, name) in targets.items():
+        setattr(section, f"{name}_ref", refs[path])
+        setattr(section, name, None)
+    return len(arrays)
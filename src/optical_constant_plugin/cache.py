@@ -0,0 +1,179 @@
+"""
+Content-addressed cache for parse/normalize results.
+
+Results are stored as compressed .npz files under
+``<root>/<key[:2]>/<key>.npz`` where the key is a hash of the input content
+(file bytes or input arrays) and the version tag of the code that produced
+them. Eviction is least-recently-used by file mtime (touched on every hit)
+once the cache grows above max_bytes.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# bump when the cached output of a component changes
+VERSIONS = {
+    "optical_parser": "1",
+    "electrical_parser": "3",
+    "dispersion_fit": "1",
+}
+
+_HASH_CHUNK = 4 * 1024 ** 2
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=20)
+
+
+def file_digest(path):
+    h = _hasher()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _numeric_array(v):
+    """v as a float64 array if it is a numeric array or a long numeric sequence, else None."""
+    if isinstance(v, np.ndarray):
+        a = v
+    elif isinstance(v, (list, tuple)) and len(v) > 8:
+        try:
+            a = np.asarray(v)
+        except ValueError:      # ragged
+            return None
+    else:
+        return None
+    if a.dtype.kind not in "biuf":
+        return None
+    return np.ascontiguousarray(a, dtype=np.float64)
+
+
+def content_digest(*values):
+    """Digest of numeric arrays and other values (None, numbers, strings, lists of those)."""
+    h = _hasher()
+    for v in values:
+        a = _numeric_array(v)
+        if a is not None:
+            h.update(b"a%d:" % a.size)
+            h.update(a.tobytes())
+        elif isinstance(v, np.ndarray):
+            h.update(repr(v.tolist()).encode())
+        else:
+            h.update(repr(v).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Maps key -> dict of arrays. Scalars are stored as 0-d arrays; None
+    values are simply left out and come back as missing keys.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(component, *parts):
+        return content_digest(component, VERSIONS.get(component), *parts)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + ".npz")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                out = {name: z[name] for name in z.files}
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return out
+
+    def put(self, key, values):
+        arrays = {k: np.asarray(v) for k, v in values.items() if v is not None}
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temp file first so concurrent readers never see partial data
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += os.path.getsize(path)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".npz"):
+                    p = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(p)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, p
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # drop least recently used files until 10 % below the limit
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = 0.9 * self.max_bytes
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                continue
+        self._size = total
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_cache(root, max_bytes=DEFAULT_MAX_BYTES):
+    """Shared cache instance per directory (None -> caching disabled)."""
+    if not root:
+        return None
+    return ResultCache(os.path.expanduser(root), max_bytes=max_bytes)
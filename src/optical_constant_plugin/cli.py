@@ -0,0 +1,294 @@
+"""
+Offline batch ingest: run the optical/electrical parsers and normalizers on a
+directory tree without a NOMAD server.
+
+    optical-ingest DATA_DIR -o OUT_DIR [-j 8] [--format json|summary|both]
+
+Files are matched with the parsers' own is_mainfile, dispatched to a process
+pool and written as archive JSON (<relpath>.archive.json) and/or one row in
+OUT_DIR/summary.csv with per-file timings and result-cache hits/misses. With --similarity-index DIR the
+canonical n,k vectors of optical entries are added to a spectral similarity
+index (see similarity.py), consolidated into DIR/index.npz at the end.
+With --material-index FILE every optical and electrical entry is upserted
+into a SQLite index joining both kinds by material (see material_index.py).
+With --hdf5-min-points N optical arrays of at least N points are written to
+OUT_DIR/<relpath>.arrays.h5 and referenced from the archive (see
+array_storage.py).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SUMMARY_FIELDS = (
+    "file", "parser", "status", "material", "n_datasets", "n_entries", "cache_hits", "cache_misses",
+    "seconds", "error",
+)
+
+# per worker process: parsers/normalizers are loaded once by _init_worker
+_worker = {}
+
+
+class _Logger:
+    """Minimal stand-in for NOMAD's structured logger."""
+
+    def __init__(self):
+        self.records = []
+
+    def _log(self, level, event, **kwargs):
+        self.records.append((level, event, kwargs))
+
+    def debug(self, event, **kwargs):
+        self._log("debug", event, **kwargs)
+
+    def info(self, event, **kwargs):
+        self._log("info", event, **kwargs)
+
+    def warning(self, event, **kwargs):
+        self._log("warning", event, **kwargs)
+
+    def error(self, event, **kwargs):
+        self._log("error", event, **kwargs)
+
+    def exception(self, event, **kwargs):
+        self._log("error", event, **kwargs)
+
+
+def _init_worker(options):
+    from optical_constant_plugin.normalizers.mynormalizer import (
+        ElectricalNormalizerEntryPoint,
+        OpticalNormalizerEntryPoint,
+    )
+    from optical_constant_plugin.parsers.myparsers import (
+        ElectricalParserEntryPoint,
+        OpticalParserEntryPoint,
+    )
+
+    cache = {"cache_dir": options.get("cache_dir")}
+    index = {"material_index_path": options.get("material_index")}
+    hdf5 = {
+        "hdf5_min_points": options.get("hdf5_min_points") or 0,
+        "hdf5_float32": options.get("hdf5_float32", False),
+        "hdf5_compression": options.get("hdf5_compression") or "gzip",
+        "hdf5_dir": options.get("out"),
+    }
+    _worker["parsers"] = [
+        ("optical_parser", OpticalParserEntryPoint(
+            group_by_material=options.get("group_by_material", False), **cache
+        ).load()),
+        ("electrical_parser", ElectricalParserEntryPoint(
+            fan_out_materials=options.get("fan_out_materials", False), **cache
+        ).load()),
+    ]
+    # each entry type only goes through its own normalizer
+    _worker["normalizers"] = {
+        "optical_parser": OpticalNormalizerEntryPoint(
+            similarity_index_dir=options.get("similarity_index"), **hdf5, **index, **cache
+        ).load(),
+        "electrical_parser": ElectricalNormalizerEntryPoint(**index).load(),
+    }
+    _worker["options"] = options
+
+
+def _cache_counts():
+    """(hits, misses) so far of this process's result cache (zeros if caching is off)."""
+    from optical_constant_plugin.cache import DEFAULT_MAX_BYTES, get_cache
+
+    # same arguments as the parsers/normalizer pass, so the same shared instance
+    cache = get_cache(_worker["options"].get("cache_dir"), DEFAULT_MAX_BYTES)
+    return (cache.hits, cache.misses) if cache is not None else (0, 0)
+
+
+def _match(path):
+    from optical_constant_plugin.parsers.optical_io import read_head
+
+    head = read_head(path)
+    for name, parser in _worker["parsers"]:
+        matched = parser.is_mainfile(path, buffer=head)
+        if matched:
+            return name, parser, matched
+    return None, None, None
+
+
+def _process(path):
+    """Match, parse, normalize and write one file. Returns a summary row."""
+    from nomad.datamodel import EntryArchive, EntryMetadata
+
+    options = _worker["options"]
+    t0 = time.perf_counter()
+    hits, misses = _cache_counts()
+    row = dict.fromkeys(SUMMARY_FIELDS)
+    row["file"] = os.path.relpath(path, options["root"])
+
+    try:
+        # matching reads (and for libraries parses) the file, so it can fail too
+        name, parser, matched = _match(path)
+        if parser is None:
+            row["status"] = "skipped"
+            row["seconds"] = time.perf_counter() - t0
+            return row
+
+        row["parser"] = name
+        logger = _Logger()
+        archive = EntryArchive(metadata=EntryMetadata(mainfile=row["file"]))
+        # a set of keys from is_mainfile means one child archive per key
+        children = {
+            key: EntryArchive(metadata=EntryMetadata(mainfile=row["file"], mainfile_key=key))
+            for key in matched
+        } if matched is not True else {}
+
+        if children:
+            parser.parse(path, archive, logger, child_archives=children)
+        else:
+            parser.parse(path, archive, logger)
+
+        archives = {"": archive, **children}
+        archives = {key: a for key, a in archives.items() if a.data is not None}
+        for a in archives.values():
+            _worker["normalizers"][name].normalize(a, logger)
+
+        data = archive.data
+        row["material"] = getattr(data, "material", None)
+        row["n_datasets"] = len(getattr(data, "datasets", None) or [])
+        row["n_entries"] = len(archives)
+        row["status"] = "ok"
+
+        if options["format"] in ("json", "both"):
+            for key, a in archives.items():
+                suffix = f".{key}.archive.json" if key else ".archive.json"
+                out = os.path.join(options["out"], row["file"] + suffix)
+                os.makedirs(os.path.dirname(out), exist_ok=True)
+                with open(out, "w") as f:
+                    json.dump(a.m_to_dict(), f)
+    except Exception as e:
+        row["status"] = "failed"
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    row["cache_hits"], row["cache_misses"] = (a - b for a, b in zip(_cache_counts(), (hits, misses)))
+    row["seconds"] = time.perf_counter() - t0
+    return row
+
+
+def iter_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            yield os.path.join(dirpath, name)
+
+
+def run(root, out, jobs=None, fmt="both", group_by_material=False, fan_out_materials=False,
+        cache_dir=None, similarity_index=None, material_index=None, hdf5_min_points=0,
+        hdf5_float32=False, hdf5_compression="gzip", chunksize=16):
+    """
+    Ingest every matching file below root; returns the list of summary rows.
+    """
+    options = {
+        "root": os.path.abspath(root),
+        "out": os.path.abspath(out),
+        "format": fmt,
+        "group_by_material": group_by_material,
+        "fan_out_materials": fan_out_materials,
+        "cache_dir": cache_dir,
+        "similarity_index": similarity_index,
+        "material_index": material_index,
+        "hdf5_min_points": hdf5_min_points,
+        "hdf5_float32": hdf5_float32,
+        "hdf5_compression": hdf5_compression,
+    }
+    os.makedirs(options["out"], exist_ok=True)
+    files = list(iter_files(options["root"]))
+
+    if jobs == 1:
+        _init_worker(options)
+        return [_process(p) for p in files]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as pool:
+        return list(pool.map(_process, files, chunksize=chunksize))
+
+
+def write_summary(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "seconds": f"{row['seconds']:.6f}"})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="optical-ingest",
+        description="Parse and normalize optical/electrical files offline.",
+    )
+    ap.add_argument("root", help="Directory tree to ingest.")
+    ap.add_argument("-o", "--out", required=True, help="Output directory.")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes.")
+    ap.add_argument("--format", choices=("json", "summary", "both"), default="both")
+    ap.add_argument("--group-by-material", action="store_true",
+                    help="Merge optical files sharing a material prefix into one entry.")
+    ap.add_argument("--fan-out-materials", action="store_true",
+                    help="One entry per row/block of multi-material CSV/.dat libraries.")
+    ap.add_argument("--cache-dir", default=None, help="Result cache directory.")
+    ap.add_argument("--similarity-index", default=None,
+                    help="Spectral similarity index directory to add optical entries to.")
+    ap.add_argument("--material-index", default=None,
+                    help="SQLite material index file joining optical and electrical entries.")
+    ap.add_argument("--hdf5-min-points", type=int, default=0,
+                    help="Store optical arrays with at least N points in HDF5 side files (0: inline).")
+    ap.add_argument("--hdf5-float32", action="store_true", help="Store side-file arrays as float32.")
+    ap.add_argument("--hdf5-compression", choices=("none", "gzip", "lzf"), default="gzip")
+    ap.add_argument("--slowest", type=int, default=5, help="Report the N slowest files.")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rows = run(
+        args.root, args.out, jobs=args.jobs, fmt=args.format,
+        group_by_material=args.group_by_material, fan_out_materials=args.fan_out_materials,
+        cache_dir=args.cache_dir, similarity_index=args.similarity_index,
+        material_index=args.material_index, hdf5_min_points=args.hdf5_min_points,
+        hdf5_float32=args.hdf5_float32, hdf5_compression=args.hdf5_compression,
+    )
+    wall = time.perf_counter() - t0
+
+    if args.similarity_index:
+        from optical_constant_plugin.similarity import SimilarityIndex
+
+        # consolidate the per-entry vector files written by the workers
+        index = SimilarityIndex(args.similarity_index)
+        index.refresh()
+        index.save()
+        print(f"similarity index: {len(index)} entries")
+
+    if args.material_index:
+        from optical_constant_plugin.material_index import MaterialIndex
+
+        index = MaterialIndex(args.material_index)
+        print(f"material index: {len(index)} materials, {len(index.joined())} with optical + electrical entries")
+        index.close()
+
+    if args.format in ("summary", "both"):
+        write_summary(rows, os.path.join(args.out, "summary.csv"))
+
+    parsed = [r for r in rows if r["status"] != "skipped"]
+    failed = [r for r in parsed if r["status"] == "failed"]
+    print(f"files: {len(rows)}  matched: {len(parsed)}  failed: {len(failed)}")
+    print(f"wall: {wall:.2f} s  throughput: {len(parsed) / wall if wall else 0:.1f} files/s  "
+          f"workers: {args.jobs}")
+    if args.cache_dir:
+        hits = sum(r["cache_hits"] or 0 for r in rows)
+        misses = sum(r["cache_misses"] or 0 for r in rows)
+        lookups = hits + misses
+        print(f"cache: {hits} hits  {misses} misses  hit rate: {hits / lookups if lookups else 0.0:.1%}")
+    for r in sorted(parsed, key=lambda r: r["seconds"], reverse=True)[:args.slowest]:
+        print(f"  {r['seconds']:8.3f} s  {r['file']}")
+    for r in failed:
+        print(f"  FAILED {r['file']}: {r['error']}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Persistent material index joining optical and electrical entries.
+
+Optical and electrical entries only share the free-text ``material`` string.
+The normalizers upsert every entry they process into a local SQLite file,
+keyed by a normalized material name (material_key), together with a few
+summary scalars. Tools needing e.g. Eg and n,k of the same material then do
+one indexed lookup (or one batched query for thousands of materials)
+instead of two searches joined on the client.
+
+The database runs in WAL mode, so parallel ingest workers can write while
+readers query; each upsert is one short transaction.
+
+    index = MaterialIndex("~/materials.sqlite")
+    index.lookup("TiO2")["electrical"]    # {entry_id: {"Eg": 3.2, ...}}
+    for rec in index.joined(): ...        # materials with both kinds
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+
+KINDS = ("optical", "electrical")
+
+OPTICAL_SUMMARY = (
+    "n_400nm", "k_400nm", "n_700nm", "k_700nm", "n_vis", "k_vis",
+    "kk_score", "k_solar_weighted", "solar_absorptance", "alpha_max", "reflectance_mean",
+)
+ELECTRICAL_SUMMARY = ("Eg", "chi", "mu_e", "mu_h", "Nc_300K", "Nv_300K", "eps_r")
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    entry_id TEXT PRIMARY KEY,
+    material_key TEXT NOT NULL,
+    material TEXT,
+    kind TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_material_key ON entries (material_key, kind);
+"""
+
+
+def material_key(name):
+    """
+    Normalized material name: Unicode NFKC (TiO₂ -> TiO2), case-folded,
+    without whitespace, '_' and '-' ("Ti O2", "tio_2" -> "tio2").
+    """
+    if not name:
+        return None
+    key = _SEPARATORS.sub("", unicodedata.normalize("NFKC", str(name)).casefold())
+    return key or None
+
+
+def entry_identifier(archive):
+    """entry_id, else mainfile (+ #mainfile_key for child entries)."""
+    meta = getattr(archive, "metadata", None)
+    if getattr(meta, "entry_id", None):
+        return meta.entry_id
+    mainfile = getattr(meta, "mainfile", None)
+    if not mainfile:
+        return None
+    key = getattr(meta, "mainfile_key", None)
+    return f"{mainfile}#{key}" if key else mainfile
+
+
+def summary_scalars(data, names):
+    """{name: float} of the finite scalars among names (pint magnitudes)."""
+    out = {}
+    for name in names:
+        v = getattr(data, name, None)
+        v = getattr(v, "magnitude", v)
+        try:
+            v = float(v)
+        except (TypeError, ValueError):
+            continue
+        if v == v and abs(v) != float("inf"):
+            out[name] = v
+    return out
+
+
+class MaterialIndex:
+    """
+    SQLite-backed map material_key -> optical/electrical entry ids and
+    summary scalars. One connection per instance, shared by its threads.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = os.path.expanduser(path)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT material_key) FROM entries").fetchone()[0]
+
+    # ----- updates -----
+
+    def upsert(self, entry_id, kind, material, summary=None):
+        """Add or replace one entry; an entry whose material changed moves to the new key."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown entry kind: {kind}")
+        key = material_key(material)
+        if not entry_id or key is None:
+            return False
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (entry_id, material_key, material, kind, summary, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(entry_id), key, material, kind, json.dumps(summary or {}), time.time()),
+            )
+        return True
+
+    def remove(self, entry_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE entry_id = ?", (str(entry_id),))
+
+    # ----- lookups -----
+
+    @staticmethod
+    def _records(rows):
+        out = {}
+        for key, material, entry_id, kind, summary in rows:
+            rec = out.get(key)
+            if rec is None:
+                rec = out[key] = {"material_key": key, "names": [], "optical": {}, "electrical": {}}
+            if material not in rec["names"]:
+                rec["names"].append(material)
+            rec[kind][entry_id] = json.loads(summary)
+        return out
+
+    def lookup_many(self, names, chunk=500):
+        """{material_key: record} for the given material names (unknown ones omitted)."""
+        keys = list(dict.fromkeys(k for k in map(material_key, names) if k))
+        out = {}
+        with self._lock:
+            for s in range(0, len(keys), chunk):
+                part = keys[s:s + chunk]
+                rows = self._conn.execute(
+                    "SELECT material_key, material, entry_id, kind, summary FROM entries "
+                    f"WHERE material_key IN ({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+                out.update(self._records(rows))
+        return out
+
+    def lookup(self, name):
+        """
+        Record of one material: {"material_key", "names" (raw spellings),
+        "optical": {entry_id: summary}, "electrical": {entry_id: summary}},
+        or None if unknown.
+        """
+        return self.lookup_many([name]).get(material_key(name))
+
+    def materials(self, kind=None):
+        """Sorted material keys (optionally only those with entries of one kind)."""
+        sql = "SELECT DISTINCT material_key FROM entries"
+        args = ()
+        if kind:
+            sql += " WHERE kind = ?"
+            args = (kind,)
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql + " ORDER BY material_key", args)]
+
+    def joined(self):
+        """Records of all materials that have both optical and electrical entries."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT material_key, material, entry_id, kind, summary FROM entries WHERE material_key IN ("
+                " SELECT material_key FROM entries GROUP BY material_key HAVING COUNT(DISTINCT kind) = 2"
+                ") ORDER BY material_key"
+            ).fetchall()
+        return list(self._records(rows).values())
+
+
+@lru_cache(maxsize=None)
+def get_material_index(path):
+    """Shared index per database file and process (None -> no index)."""
+    if not path:
+        return None
+    return MaterialIndex(path)
@@ -0,0 +1,270 @@
+"""
+Dispersion models (Cauchy, Sellmeier, Tauc-Lorentz) and their vectorized
+least-squares fits to n,k spectra.
+
+Every model is linear in some parameters and nonlinear in a few others
+(pole positions, gap, broadening). The fits search the nonlinear ones on a
+coarse-to-fine grid and solve the linear ones for all grid candidates at
+once with batched normal equations, so a fit is a handful of NumPy passes
+instead of an iterative optimizer. Kept free of NOMAD imports.
+
+Units: Cauchy and Sellmeier use wavelength in um, Tauc-Lorentz photon
+energy in eV; all public functions take wavelength in nm.
+"""
+
+import numpy as np
+
+from optical_constant_plugin.normalizers.optical_math import HC_EV_NM
+
+MODELS = ("cauchy", "sellmeier", "tauc_lorentz")
+
+PARAMETER_NAMES = {
+    "cauchy": ("A", "B_um2", "C_um4"),
+    "sellmeier": ("A", "B1", "C1_um2", "B2", "C2_um2"),
+    "tauc_lorentz": ("eps_inf", "A_eV", "E0_eV", "C_eV", "Eg_eV"),
+}
+
+# Cauchy/Sellmeier describe transparent regions only
+TRANSPARENT_MODELS = ("cauchy", "sellmeier")
+
+
+# =========================
+# MODELS
+# =========================
+
+def _sellmeier_terms(lam2, C1, C2):
+    return lam2 / (lam2 - C1), lam2 / (lam2 - C2)
+
+
+def tauc_lorentz_eps(E, A, E0, C, Eg, eps_inf=1.0):
+    """
+    Jellison-Modine Tauc-Lorentz permittivity (eps1, eps2) at photon
+    energies E [eV]. Broadcasts over parameter arrays (requires C < 2 E0).
+    """
+    E = np.asarray(E, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        above = E > Eg
+        eps2 = np.where(
+            above,
+            A * E0 * C * (E - Eg) ** 2 / (((E * E - E0 * E0) ** 2 + C * C * E * E) * E),
+            0.0,
+        )
+
+        E2, E02, Eg2, C2 = E * E, E0 * E0, Eg * Eg, C * C
+        a_ln = (Eg2 - E02) * E2 + Eg2 * C2 - E02 * (E02 + 3.0 * Eg2)
+        a_atan = (E2 - E02) * (E02 + Eg2) + Eg2 * C2
+        alpha = np.sqrt(4.0 * E02 - C2)
+        gamma2 = E02 - C2 / 2.0
+        zeta4 = (E2 - gamma2) ** 2 + alpha * alpha * C2 / 4.0
+        dE = np.abs(E - Eg)
+        # E = Eg is a removable singularity of the last two log terms
+        dE = np.where(dE > 0, dE, 1e-12)
+
+        eps1 = (
+            eps_inf
+            + A * C * a_ln / (2.0 * np.pi * zeta4 * alpha * E0)
+            * np.log((E02 + Eg2 + alpha * Eg) / (E02 + Eg2 - alpha * Eg))
+            - A * a_atan / (np.pi * zeta4 * E0)
+            * (np.pi - np.arctan((2.0 * Eg + alpha) / C) + np.arctan((alpha - 2.0 * Eg) / C))
+            + 2.0 * A * E0 * Eg * (E2 - gamma2) / (np.pi * zeta4 * alpha)
+            * (np.pi + 2.0 * np.arctan(2.0 * (gamma2 - Eg2) / (alpha * C)))
+            - A * E0 * C * (E2 + Eg2) / (np.pi * zeta4 * E) * np.log(dE / (E + Eg))
+            + 2.0 * A * E0 * C * Eg / (np.pi * zeta4)
+            * np.log(dE * (E + Eg) / np.sqrt((E02 - Eg2) ** 2 + Eg2 * C2))
+        )
+    return eps1, eps2
+
+
+def nk_from_eps(eps1, eps2):
+    mod = np.hypot(eps1, eps2)
+    return np.sqrt(np.maximum((mod + eps1) / 2.0, 0.0)), np.sqrt(np.maximum((mod - eps1) / 2.0, 0.0))
+
+
+def evaluate_model(model, params, wl):
+    """n, k of a fitted model at wavelengths wl [nm]."""
+    wl = np.asarray(wl, dtype=float)
+    p = [float(v) for v in params]
+    if model == "cauchy":
+        inv2 = (wl / 1000.0) ** -2
+        return p[0] + p[1] * inv2 + p[2] * inv2 * inv2, np.zeros_like(wl)
+    if model == "sellmeier":
+        lam2 = (wl / 1000.0) ** 2
+        t1, t2 = _sellmeier_terms(lam2, p[2], p[4])
+        return np.sqrt(np.maximum(p[0] + p[1] * t1 + p[3] * t2, 0.0)), np.zeros_like(wl)
+    if model == "tauc_lorentz":
+        eps_inf, A, E0, C, Eg = p
+        return nk_from_eps(*tauc_lorentz_eps(HC_EV_NM / wl, A, E0, C, Eg, eps_inf))
+    raise ValueError(f"Unknown dispersion model: {model}")
+
+
+# =========================
+# FITTING
+# =========================
+
+def _batched_lstsq(X, y):
+    """
+    Least squares for a batch of design matrices X (P, m, q) against y (m,)
+    via normal equations (batched matmul). Returns (coef (P, q), sse (P,));
+    singular or non-finite candidates get sse = inf.
+    """
+    Xt = np.swapaxes(X, 1, 2)
+    G = Xt @ X
+    b = Xt @ y
+    G += 1e-12 * np.trace(G, axis1=1, axis2=2)[:, None, None] * np.eye(X.shape[2])
+    with np.errstate(invalid="ignore", over="ignore"):
+        try:
+            coef = np.linalg.solve(G, b[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            coef = np.stack([np.linalg.lstsq(Gi, bi, rcond=None)[0] for Gi, bi in zip(G, b)])
+        # |y - X c|^2 without forming the residuals
+        sse = y @ y - 2.0 * np.einsum("pi,pi->p", coef, b) + np.einsum("pi,pij,pj->p", coef, G, coef)
+    sse[~np.isfinite(sse)] = np.inf
+    return coef, np.maximum(sse, 0.0)
+
+
+def _grid_search(objective, bounds, points=12, rounds=20, refine_points=5):
+    """
+    Coarse-to-fine search over log-spaced nonlinear parameters.
+
+    objective(theta (P, d)) -> (coef (P, q), loss (P,)) is evaluated on a
+    full grid of points**d candidates, then on small refine_points**d
+    grids centred on the best candidate so far. Their half-width starts at
+    one coarse step and halves whenever a round brings no improvement. Returns (theta, coef, loss) of the
+    best candidate, or None if no candidate is finite.
+    """
+    lo = np.log(np.array([b[0] for b in bounds], dtype=float))
+    hi = np.log(np.array([b[1] for b in bounds], dtype=float))
+    axes = [np.linspace(a, b, points) for a, b in zip(lo, hi)]
+    half = (hi - lo) / (points - 1)
+
+    best = None
+    for _ in range(rounds):
+        theta = np.exp(np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(bounds)))
+        coef, loss = objective(theta)
+        i = int(np.argmin(loss))
+        if not np.isfinite(loss[i]):
+            break
+        moved = best is None or loss[i] < best[2]
+        if moved:
+            best = (theta[i], coef[i], loss[i])
+        else:
+            half = half / 2.0
+
+        centre = np.log(best[0])
+        axes = [
+            np.linspace(max(c - h, a), min(c + h, b), refine_points)
+            for c, h, a, b in zip(centre, half, lo, hi)
+        ]
+    return best
+
+
+def _fit_cauchy(lam, n, k):
+    inv2 = lam ** -2
+    X = np.stack([np.ones_like(lam), inv2, inv2 * inv2], axis=1)
+    coef, *_ = np.linalg.lstsq(X, n, rcond=None)
+    return coef
+
+
+def _fit_sellmeier(lam, n, k, points, rounds):
+    lam2 = lam * lam
+    y = n * n
+    ones = np.ones_like(lam2)
+
+    def objective(theta):
+        # theta: (UV pole, IR pole) wavelengths in um
+        C1 = theta[:, 0:1] ** 2
+        C2 = theta[:, 1:2] ** 2
+        t1, t2 = _sellmeier_terms(lam2[None, :], C1, C2)
+        X = np.stack([np.broadcast_to(ones, t1.shape), t1, t2], axis=-1)
+        return _batched_lstsq(X, y)
+
+    bounds = [(0.01, 0.95 * lam.min()), (1.05 * lam.max(), max(100.0, 2.0 * lam.max()))]
+    best = _grid_search(objective, bounds, points=points, rounds=rounds)
+    if best is None:
+        return None
+    (uv, ir), (A, B1, B2), _ = best
+    return np.array([A, B1, uv * uv, B2, ir * ir])
+
+
+def _fit_tauc_lorentz(E, n, k, points, rounds):
+    e1 = n * n - k * k
+    e2 = 2.0 * n * k
+    y = np.concatenate([e1, e2])
+    Emin, Emax = E.min(), E.max()
+
+    def objective(theta):
+        coef = np.zeros((len(theta), 2))
+        sse = np.full(len(theta), np.inf)
+        # only physical candidates are evaluated: C < 2 E0 and E0 > Eg
+        ok = (theta[:, 2] < 2.0 * theta[:, 1]) & (theta[:, 1] > theta[:, 0])
+        Eg, E0, C = (theta[ok, i:i + 1] for i in range(3))
+        f1, f2 = tauc_lorentz_eps(E[None, :], 1.0, E0, C, Eg, eps_inf=0.0)
+        X = np.stack([
+            np.concatenate([np.ones_like(f1), np.zeros_like(f2)], axis=1),
+            np.concatenate([f1, f2], axis=1),
+        ], axis=-1)
+        coef[ok], sse[ok] = _batched_lstsq(X, y)
+        sse[coef[:, 1] <= 0] = np.inf
+        return coef, sse
+
+    bounds = [(0.1, Emax), (max(0.5, 0.5 * Emin), 3.0 * Emax), (0.05, 20.0)]
+    best = _grid_search(objective, bounds, points=points, rounds=rounds)
+    if best is None:
+        return None
+    (Eg, E0, C), (eps_inf, A), _ = best
+    return np.array([eps_inf, A, E0, C, Eg])
+
+
+def fit_dispersion(wl, n, k, models=MODELS, max_fit_points=256, transparent_k=0.01,
+                   grid_points=12, rounds=20):
+    """
+    Fit dispersion models to one n,k spectrum (wl in nm).
+
+    Cauchy and Sellmeier are fitted to the transparent part (k <=
+    transparent_k), Tauc-Lorentz to the whole spectrum (via eps1/eps2).
+    Fits use at most max_fit_points evenly spaced points; goodness of fit
+    is evaluated on all points of the fitted range.
+
+    Returns a list of dicts: model, parameter_names, parameters, rms_n,
+    rms_k, wavelength_min, wavelength_max, n_points. Models with fewer
+    usable points than 2x their parameters are skipped.
+    """
+    wl = np.asarray(wl, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+    m = np.isfinite(wl) & np.isfinite(n) & np.isfinite(k) & (wl > 0)
+    wl, n, k = wl[m], n[m], k[m]
+
+    fits = []
+    for model in models:
+        if model not in PARAMETER_NAMES:
+            raise ValueError(f"Unknown dispersion model: {model}")
+        sel = k <= transparent_k if model in TRANSPARENT_MODELS else np.ones(wl.shape, dtype=bool)
+        x, nn, kk = wl[sel], n[sel], k[sel]
+        if x.size < 2 * len(PARAMETER_NAMES[model]):
+            continue
+
+        sub = np.unique(np.linspace(0, x.size - 1, min(x.size, max_fit_points)).astype(int))
+        xs, ns, ks = x[sub], n[sel][sub], k[sel][sub]
+        with np.errstate(all="ignore"):
+            if model == "cauchy":
+                params = _fit_cauchy(xs / 1000.0, ns, ks)
+            elif model == "sellmeier":
+                params = _fit_sellmeier(xs / 1000.0, ns, ks, grid_points, rounds)
+            else:
+                params = _fit_tauc_lorentz(HC_EV_NM / xs, ns, ks, grid_points, rounds)
+            if params is None or not np.all(np.isfinite(params)):
+                continue
+
+            n_fit, k_fit = evaluate_model(model, params, x)
+        fits.append({
+            "model": model,
+            "parameter_names": list(PARAMETER_NAMES[model]),
+            "parameters": params,
+            "rms_n": float(np.sqrt(np.mean((n_fit - nn) ** 2))),
+            "rms_k": float(np.sqrt(np.mean((k_fit - kk) ** 2))),
+            "wavelength_min": float(x.min()),
+            "wavelength_max": float(x.max()),
+            "n_points": int(x.size),
+        })
+    return fits
@@ -0,0 +1,130 @@
+"""
+Vectorized temperature-dependent electrical models.
+
+All functions broadcast over NumPy arrays: pass per-material parameters with
+shape (M, 1) and a temperature grid with shape (T,) to get (M, T) results in
+one pass. Missing parameters are NaN.
+"""
+
+import numpy as np
+
+KB = 1.380649e-23           # J/K
+KB_EV = 8.617333262e-5      # eV/K
+H = 6.62607015e-34          # J s
+M0 = 9.1093837015e-31       # kg
+T_REF = 300.0
+
+# 2 * (2 pi m0 kB / h^2)^1.5 in cm^-3 K^-1.5, so that N = C * (mdos * T)^1.5
+_DOS_PREFACTOR = 2.0 * ((2.0 * np.pi * M0 * KB) / (H ** 2)) ** 1.5 / 1e6
+
+
+def dos_3d_cm3(mdos_rel, T=T_REF):
+    """
+    3D effective DOS (Nc or Nv) in cm^-3 at temperature T,
+    using DOS effective mass mdos_rel in units of electron mass m0.
+    """
+    mdos_rel = np.asarray(mdos_rel, dtype=float)
+    T = np.asarray(T, dtype=float)
+    return _DOS_PREFACTOR * (mdos_rel * T) ** 1.5
+
+
+def effective_dos(N_ref, mdos_rel, T):
+    """
+    N(T): scales an explicit 300 K value as (T/300)^1.5, else computes it
+    from the DOS mass.
+    """
+    N_ref = np.asarray(N_ref, dtype=float)
+    scaled = N_ref * (np.asarray(T, dtype=float) / T_REF) ** 1.5
+    return np.where(np.isfinite(N_ref), scaled, dos_3d_cm3(mdos_rel, T))
+
+
+def varshni_bandgap(Eg_ref, alpha, beta, T):
+    """
+    Varshni Eg(T) = Eg0 - alpha T^2 / (T + beta), anchored so that
+    Eg(300 K) = Eg_ref. Constant Eg_ref where alpha/beta are missing.
+    """
+    Eg_ref = np.asarray(Eg_ref, dtype=float)
+    alpha = np.asarray(alpha, dtype=float)
+    beta = np.asarray(beta, dtype=float)
+    T = np.asarray(T, dtype=float)
+
+    shift = alpha * (T_REF ** 2 / (T_REF + beta) - T ** 2 / (T + beta))
+    have = np.isfinite(alpha) & np.isfinite(beta)
+    return Eg_ref + np.where(have, shift, 0.0)
+
+
+def intrinsic_density(Nc, Nv, Eg, T):
+    """n_i = sqrt(Nc Nv) exp(-Eg / 2kT), in cm^-3."""
+    return np.sqrt(Nc * Nv) * np.exp(-Eg / (2.0 * KB_EV * np.asarray(T, dtype=float)))
+
+
+def evaluate_temperature_models(T, Eg=np.nan, Nc=np.nan, Nv=np.nan, mdos_e=np.nan, mdos_h=np.nan,
+                                alpha=np.nan, beta=np.nan):
+    """
+    Nc(T), Nv(T), Eg(T) and n_i(T) for a batch of materials over a
+    temperature grid in one NumPy pass.
+
+    Material parameters are scalars or 1-D arrays of length M (300 K
+    reference values); T is a 1-D grid of length N. Returns a dict of
+    (M, N) arrays (or (N,) for scalar parameters).
+    """
+    T = np.asarray(T, dtype=float)
+    params = [np.asarray(p, dtype=float) for p in (Eg, Nc, Nv, mdos_e, mdos_h, alpha, beta)]
+    batched = any(p.ndim for p in params)
+    if batched:
+        params = [p.reshape(-1, 1) if p.ndim else p for p in params]
+    Eg, Nc, Nv, mdos_e, mdos_h, alpha, beta = params
+
+    Nc_T = effective_dos(Nc, mdos_e, T)
+    Nv_T = effective_dos(Nv, mdos_h, T)
+    Eg_T = varshni_bandgap(Eg, alpha, beta, T)
+    ni_T = intrinsic_density(Nc_T, Nv_T, Eg_T, T)
+
+    shape = np.broadcast_shapes(*(a.shape for a in (Nc_T, Nv_T, Eg_T)))
+    return {
+        "T": T,
+        "Nc": np.broadcast_to(Nc_T, shape),
+        "Nv": np.broadcast_to(Nv_T, shape),
+        "Eg": np.broadcast_to(Eg_T, shape),
+        "ni": np.broadcast_to(ni_T, shape),
+    }
+
+
+def derive_band_parameters(Eg, Ec, Ev, chi, Nc, Nv, mdos_e, mdos_h):
+    """
+    Derived values for a batch of datasets (1-D arrays, NaN = missing):
+    chi from the band edges (-Ec, else -(Ev + Eg)) where no explicit chi is
+    given, and Nc/Nv at 300 K from the DOS masses where no explicit value
+    is given. Returns the completed chi, Nc, Nv and boolean *_derived masks.
+    """
+    Eg, Ec, Ev, chi, Nc, Nv, mdos_e, mdos_h = (
+        np.asarray(v, dtype=float) for v in (Eg, Ec, Ev, chi, Nc, Nv, mdos_e, mdos_h)
+    )
+    out = {}
+    chi_edges = np.where(np.isfinite(Ec), -Ec, -(Ev + Eg))
+    out["chi_derived"] = ~np.isfinite(chi) & np.isfinite(chi_edges)
+    out["chi"] = np.where(out["chi_derived"], chi_edges, chi)
+    for name, N, mdos in (("Nc", Nc, mdos_e), ("Nv", Nv, mdos_h)):
+        with np.errstate(invalid="ignore"):
+            N_mdos = dos_3d_cm3(mdos, T_REF)
+        out[f"{name}_derived"] = ~np.isfinite(N) & np.isfinite(N_mdos)
+        out[name] = np.where(out[f"{name}_derived"], N_mdos, N)
+    return out
+
+
+def quantity_statistics(X):
+    """
+    Median, min, max and count of every column of a (datasets, quantities)
+    array, ignoring NaN. One sort per call; NaN for columns without values.
+    """
+    X = np.asarray(X, dtype=float)
+    count = np.isfinite(X).sum(axis=0)
+    S = np.sort(X, axis=0)                          # NaN sorts last
+    cols = np.arange(X.shape[1])
+    have = count > 0
+    lo = np.maximum((count - 1) // 2, 0)
+    hi = np.maximum(count // 2, 0)
+    median = np.where(have, 0.5 * (S[lo, cols] + S[hi, cols]), np.nan)
+    minimum = np.where(have, S[0, cols], np.nan)
+    maximum = np.where(have, S[np.maximum(count - 1, 0), cols], np.nan)
+    return {"median": median, "min": minimum, "max": maximum, "count": count}
@@ -1,22 +1,253 @@
 from nomad.config.models.plugins import NormalizerEntryPoint
+from typing import Literal
+
+from pydantic import Field
 
 
 # =========================
-# OPTICAL NORMALIZER (UNCHANGED)
+# OPTICAL NORMALIZER
 # =========================
 
+# (quantity, wavelength nm) of the fixed-point table -> promoted searchable scalar
+PROMOTED_FIXED_POINTS = {
+    ("n", 400.0): "n_400nm",
+    ("k", 400.0): "k_400nm",
+    ("n", 700.0): "n_700nm",
+    ("k", 700.0): "k_700nm",
+    # deprecated aliases of fixed_n/fixed_k, kept for one release for existing searches
+    ("n", 800.0): "n_800nm",
+    ("k", 800.0): "k_800nm",
+    ("n", 900.0): "n_900nm",
+    ("k", 900.0): "k_900nm",
+    ("n", 1200.0): "n_1200nm",
+    ("k", 1200.0): "k_1200nm",
+}
+
+# band (bands_nm key) -> promoted searchable (mean n, mean k) scalars; other bands only fill band_n/band_k
+PROMOTED_BANDS = {
+    "uv": ("n_uv", "k_uv"),
+    "vis": ("n_vis", "k_vis"),
+    "nir": ("n_nir", "k_nir"),
+}
+
+
 class OpticalNormalizerEntryPoint(NormalizerEntryPoint):
     name: str = "optical_normalizer"
     description: str = "Populate main plot arrays, reference, and fixed-wavelength n/k points."
 
+    fixed_wavelengths_nm: list[float] = Field(
+        [400.0, 700.0, 800.0, 900.0, 1200.0],
+        description=(
+            "Wavelengths (nm) of the fixed-point table (fixed_n/fixed_k); 400 and 700 nm are "
+            "also promoted to the searchable n_400nm/k_400nm/n_700nm/k_700nm, and 800, 900 and "
+            "1200 nm to the deprecated n_800nm/k_800nm/... scalars."
+        ),
+    )
+    plot_max_points: int = Field(
+        2000,
+        description="Max points of the main plot arrays (0 keeps the full curve).",
+    )
+    plot_downsampling: Literal["minmax", "lttb"] = Field(
+        "minmax",
+        description="Shape-preserving downsampling used for the main plot arrays.",
+    )
+    merge_max_points: int = Field(
+        20000,
+        description="Max points of the union grid multiple datasets are merged on (0 = no cap).",
+    )
+    merge_statistic: Literal["median", "mean"] = Field(
+        "median",
+        description="Per-point statistic of the merged curve over all datasets.",
+    )
+    kk_check: bool = Field(True, description="Run the FFT Kramers-Kronig consistency check per dataset.")
+    kk_max_grid_points: int = Field(
+        2 ** 17,
+        description="Cap of the uniform energy grid used by the Kramers-Kronig check.",
+    )
+    kk_tolerance: float = Field(
+        0.02,
+        description="RMS residual in n at which the Kramers-Kronig score drops to 1/e.",
+    )
+    canonical_start_nm: float = Field(300.0, description="Start of the canonical n/k grid (nm).")
+    canonical_stop_nm: float = Field(2000.0, description="End of the canonical n/k grid (nm).")
+    canonical_points: int = Field(341, description="Points of the canonical n/k grid (0 disables).")
+    solar_spectrum_file: str | None = Field(
+        None,
+        description="Reference spectrum file (e.g. ASTM G173 AM1.5G); None uses a 5778 K blackbody.",
+    )
+    solar_spectrum_column: int = Field(
+        2,
+        description="Irradiance column of the spectrum file (ASTM G173: 2 = global tilt AM1.5G).",
+    )
+    absorption_thickness_nm: float = Field(
+        1000.0,
+        description="Film thickness for the photon-weighted solar absorptance (nm).",
+    )
+    bands_nm: dict[str, tuple[float, float]] = Field(
+        {"uv": (300.0, 400.0), "vis": (400.0, 700.0), "nir": (700.0, 1100.0)},
+        description=(
+            "Wavelength bands (nm) over which mean n and k are computed (band_names/band_n/band_k); "
+            "the uv, vis and nir bands are also promoted to n_uv/k_uv/... ."
+        ),
+    )
+    similarity_index_dir: str | None = Field(
+        None,
+        description="Directory of the spectral similarity index fed with canonical vectors (None disables).",
+    )
+    material_index_path: str | None = Field(
+        None,
+        description="SQLite material index joining optical and electrical entries (None disables).",
+    )
+    dispersion_models: list[Literal["cauchy", "sellmeier", "tauc_lorentz"]] = Field(
+        [],
+        description=(
+            "Dispersion models fitted to every dataset, e.g. [\"cauchy\", \"sellmeier\", \"tauc_lorentz\"] "
+            "(~0.15 s per dataset for all three; empty, the default, disables fitting)."
+        ),
+    )
+    dispersion_fit_points: int = Field(
+        256,
+        description="Max data points used by a dispersion fit (goodness of fit uses all points).",
+    )
+    dispersion_transparent_k: float = Field(
+        0.01,
+        description="k below which points count as transparent for Cauchy/Sellmeier fits.",
+    )
+
+    hdf5_min_points: int = Field(
+        0,
+        description="Arrays with at least this many points go to an HDF5 side file (0 keeps all arrays inline).",
+    )
+    hdf5_float32: bool = Field(False, description="Store offloaded arrays as float32.")
+    hdf5_compression: Literal["none", "gzip", "lzf"] = Field("gzip", description="Compression of offloaded arrays.")
+    hdf5_offload_plot: bool = Field(
+        False,
+        description="Also offload the entry's n/k spread arrays (the plotted *_plot arrays stay inline).",
+    )
+    hdf5_dir: str | None = Field(
+        None,
+        description="Local directory for HDF5 side files (None: the upload's raw files via the archive context).",
+    )
+    cache_dir: str | None = Field(
+        None,
+        description="Directory of the content-addressed dispersion-fit cache (None disables caching).",
+    )
+    cache_max_bytes: int = Field(2 * 1024 ** 3, description="Size above which the cache evicts LRU results.")
+
     def load(self):
         from nomad.normalizing.normalizer import Normalizer
+        import os
+
         import numpy as np
 
+        from optical_constant_plugin.array_storage import (
+            DATASET_ARRAYS,
+            PLOT_ARRAYS,
+            offload_arrays,
+            section_arrays,
+        )
+        from optical_constant_plugin.cache import get_cache
+        from optical_constant_plugin.material_index import (
+            OPTICAL_SUMMARY,
+            entry_identifier,
+            get_material_index,
+            summary_scalars,
+        )
+        from optical_constant_plugin.normalizers.dispersion import PARAMETER_NAMES, fit_dispersion
+        from optical_constant_plugin.normalizers.spectral_weights import (
+            band_averages,
+            solar_descriptors,
+            spectrum_label,
+        )
+        from optical_constant_plugin.schema_packages.mypackage import DispersionFit, OpticalConstantsEntry
+        from optical_constant_plugin.similarity import write_vector
+        from optical_constant_plugin.normalizers.optical_math import (
+            HC_EV_NM,
+            canonical_grid,
+            canonical_vector,
+            derived_quantities,
+            derived_scalars,
+            downsample_spectrum,
+            fixed_point_values,
+            kk_consistency,
+            merge_spectra,
+            sorted_spectrum,
+        )
+
+        config = self
+
+        FIT_FIELDS = ("parameters", "rms_n", "rms_k", "wavelength_min", "wavelength_max", "n_points")
+
+        def dataset_arrays(archive, ds):
+            """(wavelength, n, k) of a dataset (inline or from the HDF5 side file), or None if unusable."""
+            wl, n, k = section_arrays(archive, ds, ("wavelength", "n", "k"), root=config.hdf5_dir)
+
+            valid = (
+                wl is not None and n is not None and k is not None
+                and len(wl) > 0
+                and len(n) == len(wl)
+                and len(k) == len(wl)
+            )
+            return (wl, n, k) if valid else None
+
+        SOLAR_FIELDS = ("k_solar_weighted", "solar_absorptance", "solar_coverage")
+
+        def bandgap_nm(datasets):
+            """Absorption edge (nm) from the first dataset carrying a bandgap."""
+            for ds in datasets:
+                Eg = getattr(ds, "bandgap", None)
+                Eg = getattr(Eg, "magnitude", Eg)
+                if Eg is not None and np.isfinite(Eg) and Eg > 0:
+                    return HC_EV_NM / float(Eg)
+            return None
+
+        def fit_dispersion_models(ds, arrays):
+            """Replace ds.dispersion_fits with fresh (cached) model fits."""
+            models = list(config.dispersion_models)
+            cache = get_cache(config.cache_dir, config.cache_max_bytes)
+            key = cache.key(
+                "dispersion_fit", models, config.dispersion_fit_points, config.dispersion_transparent_k, *arrays
+            ) if cache else None
+            stored = cache.get(key) if cache else None
+
+            if stored is not None:
+                fits = [
+                    {
+                        "model": m,
+                        "parameter_names": list(PARAMETER_NAMES[m]),
+                        **{name: stored[f"{m}.{name}"] for name in FIT_FIELDS if f"{m}.{name}" in stored},
+                    }
+                    for m in models if f"{m}.parameters" in stored
+                ]
+            else:
+                fits = fit_dispersion(
+                    *arrays,
+                    models=models,
+                    max_fit_points=config.dispersion_fit_points,
+                    transparent_k=config.dispersion_transparent_k,
+                )
+                if cache:
+                    cache.put(key, {f"{f['model']}.{name}": f[name] for f in fits for name in FIT_FIELDS})
+
+            ds.dispersion_fits = [
+                DispersionFit(
+                    model=f["model"],
+                    parameter_names=f["parameter_names"],
+                    parameters=np.asarray(f["parameters"], dtype=float),
+                    rms_n=float(f["rms_n"]),
+                    rms_k=float(f["rms_k"]),
+                    wavelength_min=float(f["wavelength_min"]),
+                    wavelength_max=float(f["wavelength_max"]),
+                    n_points=int(f["n_points"]),
+                )
+                for f in fits
+            ]
+
         class OpticalNormalizer(Normalizer):
             def normalize(self, archive, logger):
+                # NOMAD runs every normalizer on every entry: only act on our own entry type
                 data = getattr(archive, "data", None)
-                if data is None:
+                if not isinstance(data, OpticalConstantsEntry):
                     return
 
                 # defaults for main plot
@@ -26,76 +257,220 @@ class OpticalNormalizerEntryPoint(NormalizerEntryPoint):
                     data.n_plot = []
                 if hasattr(data, "k_plot"):
                     data.k_plot = []
+                for name in ("n_spread_plot", "k_spread_plot"):
+                    if hasattr(data, name):
+                        setattr(data, name, [])
+                for name in PLOT_ARRAYS:
+                    if hasattr(data, f"{name}_ref"):
+                        setattr(data, f"{name}_ref", None)
+                for name in ("canonical_wavelength_range", "canonical_n", "canonical_k", "canonical_mask",
+                             "canonical_coverage", *SOLAR_FIELDS, "solar_absorptance_thickness", "solar_spectrum",
+                             "band_names", "band_n", "band_k"):
+                    if hasattr(data, name):
+                        setattr(data, name, None)
+                if hasattr(data, "n_datasets_merged"):
+                    data.n_datasets_merged = 0
 
                 # defaults for reference (string)
                 if hasattr(data, "reference"):
                     data.reference = None
 
-                # defaults for fixed points (floats)
-                targets = [400.0, 700.0, 800.0, 900.0, 1200.0]
-                for t in targets:
-                    if hasattr(data, f"n_{int(t)}nm"):
-                        setattr(data, f"n_{int(t)}nm", None)
-                    if hasattr(data, f"k_{int(t)}nm"):
-                        setattr(data, f"k_{int(t)}nm", None)
+                # defaults for the fixed-point table and its promoted values
+                targets = np.asarray(config.fixed_wavelengths_nm, dtype=float)
+                for name in ("fixed_wavelengths", "fixed_n", "fixed_k", *PROMOTED_FIXED_POINTS.values()):
+                    if hasattr(data, name):
+                        setattr(data, name, None)
+                for name in (q for pair in PROMOTED_BANDS.values() for q in pair):
+                    if hasattr(data, name):
+                        setattr(data, name, None)
+
+                # defaults for derived scalars
+                for name in ("alpha_max", "wavelength_alpha_max", "reflectance_mean", "kk_score"):
+                    if hasattr(data, name):
+                        setattr(data, name, None)
 
                 datasets = getattr(data, "datasets", None)
                 if not datasets:
                     return
 
-                def interp_safe(x, y, x0):
-                    x = np.asarray(x, dtype=float)
-                    y = np.asarray(y, dtype=float)
-                    m = np.isfinite(x) & np.isfinite(y)
-                    x = x[m]
-                    y = y[m]
-                    if x.size < 2:
-                        return None
-                    idx = np.argsort(x)
-                    x = x[idx]
-                    y = y[idx]
-                    if x0 < x[0] or x0 > x[-1]:
-                        return None
-                    return float(np.interp(x0, x, y))
-
-                for ds in datasets:
-                    wl = getattr(ds, "wavelength", None)
-                    n = getattr(ds, "n", None)
-                    k = getattr(ds, "k", None)
-
-                    valid = (
-                        wl is not None and n is not None and k is not None
-                        and len(wl) > 0
-                        and len(n) == len(wl)
-                        and len(k) == len(wl)
+                # derived arrays (alpha, eps1/eps2, R, penetration depth) for every dataset
+                derived = {}
+                inputs = {}
+                for i, ds in enumerate(datasets):
+                    ds.wavelength_plot, ds.n_plot, ds.k_plot = [], [], []
+                    arrays = dataset_arrays(archive, ds)
+                    if arrays is None:
+                        continue
+                    inputs[i] = arrays
+
+                    # small inline copy for the dataset plot (the full arrays may be offloaded)
+                    wl_ds, (n_ds, k_ds) = downsample_spectrum(
+                        *sorted_spectrum(*arrays),
+                        max_points=config.plot_max_points,
+                        method=config.plot_downsampling,
                     )
-                    if not valid:
+                    ds.wavelength_plot, ds.n_plot, ds.k_plot = wl_ds, n_ds, k_ds
+                    derived[i] = derived_quantities(*arrays)
+                    for name, values in derived[i].items():
+                        setattr(ds, name, values)
+
+                    # Kramers-Kronig consistency, O(N log N) via FFT Hilbert transform
+                    if config.kk_check:
+                        score, residual = kk_consistency(
+                            *arrays,
+                            max_grid_points=config.kk_max_grid_points,
+                            tolerance=config.kk_tolerance,
+                        )
+                        ds.kk_score = score if np.isfinite(score) else None
+                        ds.kk_residual = residual
+
+                    if config.dispersion_models:
+                        fit_dispersion_models(ds, arrays)
+
+                # entry-level KK score: the least consistent dataset
+                scores = [getattr(ds, "kk_score", None) for ds in datasets]
+                scores = [v for v in scores if v is not None]
+                if scores and hasattr(data, "kk_score"):
+                    data.kk_score = min(scores)
+
+                valid = sorted(derived)
+                if not valid:
+                    return
+                first = datasets[valid[0]]
+
+                # merged curve: the dataset itself, or the per-point median (mean)
+                # of all datasets resampled onto their union grid in one batch
+                spread = None
+                if len(valid) == 1:
+                    wl, (n, k) = sorted_spectrum(*inputs[valid[0]])
+                    derived_merged = derived_quantities(wl, n, k)
+                else:
+                    arrays = [inputs[i] for i in valid]
+                    wl, merged = merge_spectra(
+                        *zip(*arrays),
+                        max_points=config.merge_max_points,
+                        statistic=config.merge_statistic,
+                    )
+                    n, k = merged["n"], merged["k"]
+                    spread = (merged["n_spread"], merged["k_spread"])
+                    derived_merged = derived_quantities(wl, n, k)
+
+                if hasattr(data, "n_datasets_merged"):
+                    data.n_datasets_merged = len(valid)
+
+                # main plot: downsampled view, full resolution stays in the datasets
+                wl_plot, (n_plot, k_plot) = downsample_spectrum(
+                    wl, [n, k],
+                    max_points=config.plot_max_points,
+                    method=config.plot_downsampling,
+                )
+                data.wavelength_plot = wl_plot
+                data.n_plot = n_plot
+                data.k_plot = k_plot
+                if spread is not None:
+                    idx = np.searchsorted(wl, wl_plot)
+                    for name, values in zip(("n_spread_plot", "k_spread_plot"), spread):
+                        if hasattr(data, name):
+                            setattr(data, name, values[idx])
+
+                # canonical float32 vector of the merged curve
+                if config.canonical_points > 0 and hasattr(data, "canonical_n"):
+                    grid = canonical_grid(config.canonical_start_nm, config.canonical_stop_nm, config.canonical_points)
+                    n_vec, k_vec, mask = canonical_vector(wl, n, k, grid)
+                    data.canonical_wavelength_range = [float(grid[0]), float(grid[-1])]
+                    data.canonical_n = n_vec
+                    data.canonical_k = k_vec
+                    data.canonical_mask = mask
+                    data.canonical_coverage = float(mask.mean())
+
+                    # incremental similarity index update: one vector file per entry
+                    entry_id = entry_identifier(archive)
+                    if config.similarity_index_dir and entry_id and mask.any():
+                        write_vector(
+                            os.path.expanduser(config.similarity_index_dir), entry_id,
+                            n_vec, k_vec, mask, material=getattr(data, "material", None),
+                        )
+
+                # solar-weighted and band-averaged descriptors (weights cached per grid)
+                spectrum = (
+                    (config.solar_spectrum_file, config.solar_spectrum_column)
+                    if config.solar_spectrum_file else None
+                )
+                solar = solar_descriptors(
+                    wl, n, k, spectrum=spectrum,
+                    bandgap_nm=bandgap_nm(datasets[i] for i in valid),
+                    thickness_nm=config.absorption_thickness_nm,
+                )
+                for name, val in solar.items():
+                    if hasattr(data, name):
+                        setattr(data, name, val if np.isfinite(val) else None)
+                if hasattr(data, "solar_absorptance_thickness"):
+                    data.solar_absorptance_thickness = config.absorption_thickness_nm
+                if hasattr(data, "solar_spectrum"):
+                    data.solar_spectrum = spectrum_label(*spectrum) if spectrum else spectrum_label()
+
+                bands = band_averages(wl, n, k, config.bands_nm)
+                if hasattr(data, "band_names"):
+                    data.band_names = list(bands)
+                    data.band_n = [v[0] for v in bands.values()]
+                    data.band_k = [v[1] for v in bands.values()]
+                for name, values in bands.items():
+                    if name not in PROMOTED_BANDS:
+                        logger.warning(
+                            "Band has no searchable quantity, only stored in band_n/band_k", band=name
+                        )
                         continue
+                    for quantity, val in zip(PROMOTED_BANDS[name], values):
+                        if hasattr(data, quantity):
+                            setattr(data, quantity, val if np.isfinite(val) else None)
 
-                    # main plot
-                    data.wavelength_plot = list(wl)
-                    data.n_plot = list(n)
-                    data.k_plot = list(k)
-
-                    # reference (DOI preferred, else source_name)
-                    if hasattr(data, "reference"):
-                        ref = getattr(ds, "source_doi", None) or getattr(ds, "source_name", None)
-                        data.reference = ref
-
-                    # fixed-wavelength points for Explore scatter plots
-                    for t in targets:
-                        nval = interp_safe(wl, n, t)
-                        kval = interp_safe(wl, k, t)
-                        if hasattr(data, f"n_{int(t)}nm"):
-                            setattr(data, f"n_{int(t)}nm", nval)
-                        if hasattr(data, f"k_{int(t)}nm"):
-                            setattr(data, f"k_{int(t)}nm", kval)
-
-                    logger.info(
-                        "Populated main plot arrays + reference + fixed n/k points",
-                        n_points=len(wl),
+                # reference (DOI preferred, else source_name) of the first dataset
+                if hasattr(data, "reference"):
+                    ref = getattr(first, "source_doi", None) or getattr(first, "source_name", None)
+                    data.reference = ref
+
+                # fixed-wavelength table, promoted values for Explore filters
+                # (one sort + one np.interp per series over all targets)
+                n_vals, k_vals = fixed_point_values(wl, n, k, targets)
+                points = {"n": n_vals, "k": k_vals}
+
+                if hasattr(data, "fixed_wavelengths"):
+                    data.fixed_wavelengths = targets
+                    data.fixed_n = np.asarray(points["n"], dtype=float)
+                    data.fixed_k = np.asarray(points["k"], dtype=float)
+                for (q, t), name in PROMOTED_FIXED_POINTS.items():
+                    hit = np.flatnonzero(targets == t)
+                    if hit.size and hasattr(data, name):
+                        val = points[q][hit[0]]
+                        setattr(data, name, float(val) if np.isfinite(val) else None)
+
+                for name, val in derived_scalars(wl, derived_merged).items():
+                    if hasattr(data, name):
+                        setattr(data, name, val if np.isfinite(val) else None)
+
+                # large arrays to the HDF5 side file, once nothing above needs them inline
+                # (the plots read the *_plot copies)
+                if config.hdf5_min_points > 0:
+                    sections = [(ds, f"datasets/{i}", DATASET_ARRAYS) for i, ds in enumerate(datasets)]
+                    if config.hdf5_offload_plot:
+                        sections.append((data, "", PLOT_ARRAYS))
+                    offload_arrays(
+                        archive, sections, config.hdf5_min_points, root=config.hdf5_dir,
+                        float32=config.hdf5_float32, compression=config.hdf5_compression,
                     )
-                    break
+
+                index = get_material_index(config.material_index_path)
+                if index is not None:
+                    index.upsert(
+                        entry_identifier(archive), "optical", getattr(data, "material", None),
+                        summary_scalars(data, OPTICAL_SUMMARY),
+                    )
+
+                logger.info(
+                    "Populated main plot arrays + reference + fixed n/k points",
+                    n_points=len(wl),
+                    n_datasets=len(valid),
+                )
 
         return OpticalNormalizer()
 
@@ -104,139 +479,161 @@ optical_normalizer = OpticalNormalizerEntryPoint()
 
 
 # =========================
-# ELECTRICAL NORMALIZER (NEW)
+# ELECTRICAL NORMALIZER
 # =========================
 
 class ElectricalNormalizerEntryPoint(NormalizerEntryPoint):
     name: str = "electrical_normalizer"
-    description: str = "Derive chi from Ec (or Ev+Eg), derive Nc/Nv@300K from mdos; promote scalars to entry."
+    description: str = (
+        "Derive chi from Ec (or Ev+Eg), derive Nc/Nv@300K from mdos; aggregate all datasets "
+        "(median/min/max/count) and promote the medians to the entry."
+    )
+
+    temperature_min_K: float = Field(50.0, description="Start of the Nc/Nv/Eg/n_i(T) grid.")
+    temperature_max_K: float = Field(500.0, description="End of the Nc/Nv/Eg/n_i(T) grid.")
+    temperature_points: int = Field(91, description="Points of the temperature grid (0 disables).")
+    material_index_path: str | None = Field(
+        None,
+        description="SQLite material index joining optical and electrical entries (None disables).",
+    )
 
     def load(self):
         from nomad.normalizing.normalizer import Normalizer
         import numpy as np
 
+        from optical_constant_plugin.material_index import (
+            ELECTRICAL_SUMMARY,
+            entry_identifier,
+            get_material_index,
+            summary_scalars,
+        )
+        from optical_constant_plugin.normalizers import electrical_model as model
+        from optical_constant_plugin.schema_packages.mypackage import (
+            ElectricalConstantsEntry,
+            ElectricalStatistic,
+        )
+
+        config = self
+
         def ok(v):
             return v is not None and np.isfinite(v)
 
-        def dos_3d_cm3(mdos_rel, T=300.0):
+        def mag(v):
+            """Plain float (NaN if missing) from a scalar or pint quantity."""
+            v = getattr(v, "magnitude", v)
+            return float(v) if ok(v) else np.nan
+
+        def temperature_dependence(datasets):
             """
-            3D effective DOS (Nc or Nv) in cm^-3 at temperature T,
-            using DOS effective mass mdos_rel in units of electron mass m0.
+            Nc/Nv/Eg/n_i over the configured grid for all datasets of the
+            entry in one vectorized pass.
             """
-            kB = 1.380649e-23
-            h = 6.62607015e-34
-            m0 = 9.1093837015e-31
-            mdos = float(mdos_rel) * m0
-            N_m3 = 2.0 * ((2.0 * np.pi * mdos * kB * T) / (h ** 2)) ** 1.5
-            return float(N_m3 / 1e6)  # cm^-3
-
-        def derive_chi(Ec=None, Ev=None, Eg=None):
+            if config.temperature_points <= 0:
+                return
+            T = np.linspace(config.temperature_min_K, config.temperature_max_K, config.temperature_points)
+            params = np.array([
+                [
+                    mag(getattr(ds, name, None))
+                    for name in ("bandgap", "Nc", "Nv", "mdos_e", "mdos_h", "varshni_alpha", "varshni_beta")
+                ]
+                for ds in datasets
+            ]).T
+            res = model.evaluate_temperature_models(T, *params)
+
+            for i, ds in enumerate(datasets):
+                ds.temperature_grid = T
+                for name in ("Nc", "Nv", "Eg", "ni"):
+                    row = res[name][i]
+                    setattr(ds, f"{name}_T", row if np.isfinite(row).any() else None)
+
+        # promoted scalar -> (dataset quantity, unit of the statistics)
+        PROMOTED = {
+            "Eg": ("bandgap", "eV"),
+            "chi": ("electron_affinity", "eV"),
+            "mu_e": ("mobility_e", "cm^2/(V*s)"),
+            "mu_h": ("mobility_h", "cm^2/(V*s)"),
+            "Nc_300K": ("Nc", "1/cm^3"),
+            "Nv_300K": ("Nv", "1/cm^3"),
+            "eps_r": ("relative_permittivity", ""),
+        }
+        DERIVE_INPUTS = ("bandgap", "Ec", "Ev", "electron_affinity", "Nc", "Nv", "mdos_e", "mdos_h")
+
+        def derive_datasets(datasets):
             """
-            Vacuum-referenced energies (eV).
-            chi (electron affinity) = -Ec.
-            If Ec missing but Ev and Eg available -> Ec = Ev + Eg, then chi = -(Ev+Eg).
+            chi and Nc/Nv@300K for all datasets in one vectorized pass:
+            explicit values are kept, missing ones derived from the band
+            edges / DOS masses.
             """
-            if ok(Ec):
-                return float(-Ec), True
-            if ok(Ev) and ok(Eg):
-                Ec2 = float(Ev + Eg)
-                return float(-Ec2), True
-            return None, False
+            P = np.array([[mag(getattr(ds, name, None)) for name in DERIVE_INPUTS] for ds in datasets])
+            return model.derive_band_parameters(*P.T)
+
+        def statistic_section(name, unit, stats, j):
+            return ElectricalStatistic(
+                quantity=name,
+                unit=unit,
+                median=float(stats["median"][j]),
+                min=float(stats["min"][j]),
+                max=float(stats["max"][j]),
+                count=int(stats["count"][j]),
+            )
 
         class ElectricalNormalizer(Normalizer):
             def normalize(self, archive, logger):
+                # NOMAD runs every normalizer on every entry: only act on our own entry type
                 data = getattr(archive, "data", None)
-                if data is None:
+                if not isinstance(data, ElectricalConstantsEntry):
                     return
 
-                # only act on ElectricalConstantsEntry-like objects
-                if not hasattr(data, "datasets"):
-                    return
-                if not hasattr(data, "material"):
-                    return
-
-                datasets = getattr(data, "datasets", None) or []
+                datasets = data.datasets
                 if not datasets:
                     return
 
                 # defaults promoted scalars
-                if hasattr(data, "reference"):
-                    data.reference = None
-                data.Eg = None
-                data.chi = None
-                data.mu_e = None
-                data.mu_h = None
-                data.Nc_300K = None
-                data.Nv_300K = None
-                data.eps_r = None
-
-                for ds in datasets:
-                    # set reference
-                    if hasattr(data, "reference"):
-                        data.reference = getattr(ds, "source_doi", None) or getattr(ds, "source_name", None)
-
-                    Eg = getattr(ds, "bandgap", None)
-                    Ec = getattr(ds, "Ec", None)
-                    Ev = getattr(ds, "Ev", None)
-
-                    # chi: prefer explicit, else derive
-                    chi = getattr(ds, "electron_affinity", None)
-                    if not ok(chi):
-                        chi_val, derived = derive_chi(Ec=Ec, Ev=Ev, Eg=Eg)
-                        if chi_val is not None:
-                            ds.electron_affinity = chi_val
-                            ds.chi_derived = True
-                            chi = chi_val
-                        else:
-                            ds.chi_derived = False
-                    else:
-                        ds.chi_derived = False
-
-                    # Nc/Nv: prefer explicit, else derive from mdos
-                    Nc = getattr(ds, "Nc", None)
-                    if not ok(Nc):
-                        mdos_e = getattr(ds, "mdos_e", None)
-                        if ok(mdos_e):
-                            try:
-                                ds.Nc = dos_3d_cm3(mdos_e, T=300.0)
-                                ds.Nc_derived = True
-                                Nc = ds.Nc
-                            except Exception:
-                                ds.Nc_derived = False
-                        else:
-                            ds.Nc_derived = False
-                    else:
-                        ds.Nc_derived = False
-
-                    Nv = getattr(ds, "Nv", None)
-                    if not ok(Nv):
-                        mdos_h = getattr(ds, "mdos_h", None)
-                        if ok(mdos_h):
-                            try:
-                                ds.Nv = dos_3d_cm3(mdos_h, T=300.0)
-                                ds.Nv_derived = True
-                                Nv = ds.Nv
-                            except Exception:
-                                ds.Nv_derived = False
-                        else:
-                            ds.Nv_derived = False
-                    else:
-                        ds.Nv_derived = False
-
-                    # Promote scalars to entry (first dataset only, MVP)
-                    data.Eg = Eg
-                    data.chi = chi
-                    data.mu_e = getattr(ds, "mobility_e", None)
-                    data.mu_h = getattr(ds, "mobility_h", None)
-                    data.Nc_300K = Nc
-                    data.Nv_300K = Nv
-                    data.eps_r = getattr(ds, "relative_permittivity", None)
-
-                    logger.info(
-                        "Electrical normalized/promoted",
-                        material=getattr(data, "material", None),
+                data.reference = None
+                for name in PROMOTED:
+                    setattr(data, name, None)
+
+                derived = derive_datasets(datasets)
+                for i, ds in enumerate(datasets):
+                    for flag, quantity, value in (
+                        ("chi_derived", "electron_affinity", "chi"),
+                        ("Nc_derived", "Nc", "Nc"),
+                        ("Nv_derived", "Nv", "Nv"),
+                    ):
+                        setattr(ds, flag, bool(derived[flag][i]))
+                        if derived[flag][i]:
+                            setattr(ds, quantity, float(derived[value][i]))
+
+                # aggregate every dataset, promote the medians
+                X = np.array([[mag(getattr(ds, q, None)) for q, _ in PROMOTED.values()] for ds in datasets])
+                stats = model.quantity_statistics(X)
+                for j, name in enumerate(PROMOTED):
+                    if stats["count"][j]:
+                        setattr(data, name, float(stats["median"][j]))
+                data.statistics = [
+                    statistic_section(name, unit, stats, j)
+                    for j, (name, (_, unit)) in enumerate(PROMOTED.items())
+                    if stats["count"][j]
+                ]
+                data.n_datasets = len(datasets)
+
+                refs = [ds.source_doi or ds.source_name for ds in datasets]
+                data.reference = "; ".join(dict.fromkeys(r for r in refs if r)) or None
+
+                logger.info(
+                    "Electrical normalized/promoted",
+                    material=data.material,
+                    n_datasets=len(datasets),
+                )
+
+                temperature_dependence(datasets)
+
+                index = get_material_index(config.material_index_path)
+                if index is not None:
+                    index.upsert(
+                        entry_identifier(archive), "electrical", data.material,
+                        summary_scalars(data, ELECTRICAL_SUMMARY),
                     )
-                    break
 
         return ElectricalNormalizer()
 
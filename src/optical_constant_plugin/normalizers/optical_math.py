@@ -0,0 +1,430 @@
+"""
+Vectorized numerics on n,k spectra used by the optical normalizer.
+
+Kept free of NOMAD imports so they can be used (and benchmarked) on their own.
+"""
+
+import warnings
+
+import numpy as np
+
+# photon energy [eV] = HC_EV_NM / wavelength [nm]; the one definition used across the package
+HC_EV_NM = 1239.8419843320026
+
+DEFAULT_FIXED_WAVELENGTHS = (400.0, 700.0, 800.0, 900.0, 1200.0)
+
+
+def sorted_spectrum(wl, *ys):
+    """
+    Drop non-finite wavelengths and sort all series by wavelength once.
+    The argsort is skipped when the axis is already ascending (the parser
+    output), so the common case costs one finiteness check and one diff.
+    """
+    wl = np.asarray(wl, dtype=float)
+    ys = [np.asarray(y, dtype=float) for y in ys]
+
+    m = np.isfinite(wl)
+    if not m.all():
+        wl = wl[m]
+        ys = [y[m] for y in ys]
+
+    if wl.size > 1 and not np.all(wl[1:] >= wl[:-1]):
+        order = np.argsort(wl, kind="stable")
+        wl = wl[order]
+        ys = [y[order] for y in ys]
+    return wl, ys
+
+
+def interp_at(wl, ys, targets):
+    """
+    Interpolate every series in ys at the target wavelengths.
+
+    wl must be sorted (see sorted_spectrum). Each series only uses its own
+    finite points; targets outside that range (or series with fewer than
+    two points) give NaN. Returns a (len(ys), len(targets)) array.
+    """
+    targets = np.asarray(targets, dtype=float)
+    out = np.full((len(ys), targets.size), np.nan)
+    for i, y in enumerate(ys):
+        m = np.isfinite(y)
+        x = wl if m.all() else wl[m]
+        y = y if m.all() else y[m]
+        if x.size < 2:
+            continue
+        inside = (targets >= x[0]) & (targets <= x[-1])
+        out[i, inside] = np.interp(targets[inside], x, y)
+    return out
+
+
+def fixed_point_values(wl, n, k, targets=DEFAULT_FIXED_WAVELENGTHS):
+    """
+    n and k at the target wavelengths in one step: clean and sort once,
+    then one np.interp call per series over the whole grid.
+    Returns (n_values, k_values) arrays with NaN where undefined.
+    """
+    wl, (n, k) = sorted_spectrum(wl, n, k)
+    vals = interp_at(wl, [n, k], targets)
+    return vals[0], vals[1]
+
+
+# =========================
+# PLOT DOWNSAMPLING
+# =========================
+
+def minmax_indices(ys, max_points):
+    """
+    Indices keeping the minimum and maximum of every series in each bucket
+    (plus both end points), so peaks and absorption edges survive.
+    """
+    N = len(ys[0])
+    n_buckets = max(1, (max_points - 2) // (2 * len(ys)))
+    if N <= max_points or N <= n_buckets:
+        return np.arange(N)
+
+    size = -(-N // n_buckets)
+    pad = n_buckets * size - N
+    offsets = np.arange(n_buckets) * size
+
+    keep = [np.array([0, N - 1])]
+    for y in ys:
+        y = np.asarray(y, dtype=float)
+        lo = np.concatenate([np.where(np.isnan(y), np.inf, y), np.full(pad, np.inf)])
+        hi = np.concatenate([np.where(np.isnan(y), -np.inf, y), np.full(pad, -np.inf)])
+        keep.append(offsets + lo.reshape(n_buckets, size).argmin(axis=1))
+        keep.append(offsets + hi.reshape(n_buckets, size).argmax(axis=1))
+
+    idx = np.unique(np.concatenate(keep))
+    return idx[idx < N]
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets: picks, per bucket, the point spanning
+    the largest triangle with the previous pick and the next bucket mean.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    N = len(x)
+    if N <= max_points or max_points < 3:
+        return np.arange(N)
+
+    edges = np.linspace(1, N - 1, max_points - 1).astype(int)
+    out = np.empty(max_points, dtype=np.intp)
+    out[0] = 0
+    out[-1] = N - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            xc, yc = np.nanmean(x[nlo:nhi]), np.nanmean(y[nlo:nhi])
+        else:
+            xc, yc = x[-1], y[-1]
+
+        xa, ya = x[a], y[a]
+        area = np.abs((xa - xc) * (y[lo:hi] - ya) - (xa - x[lo:hi]) * (yc - ya))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return np.unique(out)
+
+
+def downsample_spectrum(wl, ys, max_points, method="minmax"):
+    """
+    Shape-preserving reduction of a sorted spectrum for plotting.
+
+    Returns (wl, ys) restricted to at most ~max_points shared indices.
+    "lttb" runs LTTB per series with max_points // len(ys) points each and
+    merges the picks; "minmax" keeps per-bucket extrema of every series.
+    max_points <= 0 returns the input unchanged.
+    """
+    if max_points <= 0 or len(wl) <= max_points:
+        return wl, ys
+    if method == "lttb":
+        per_series = max(3, max_points // len(ys))
+        idx = np.unique(np.concatenate([lttb_indices(wl, y, per_series) for y in ys]))
+    elif method == "minmax":
+        idx = minmax_indices(ys, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return wl[idx], [y[idx] for y in ys]
+
+
+# =========================
+# DERIVED OPTICAL QUANTITIES
+# =========================
+
+def derived_quantities(wl, n, k):
+    """
+    Absorption coefficient, complex permittivity, normal-incidence
+    reflectance and penetration depth in one vectorized pass.
+
+    wl in nm. Returns arrays: alpha [1/cm] = 4 pi k / lambda,
+    eps1 = n^2 - k^2, eps2 = 2 n k, reflectance = ((n-1)^2 + k^2) / ((n+1)^2 + k^2),
+    penetration_depth [nm] = 1 / alpha (NaN where k = 0).
+    """
+    wl = np.asarray(wl, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+
+    n2 = n * n
+    k2 = k * k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha_nm = 4.0 * np.pi * k / wl                        # 1/nm
+        depth = np.where(alpha_nm > 0, 1.0 / alpha_nm, np.nan)  # nm
+        reflectance = ((n - 1.0) ** 2 + k2) / ((n + 1.0) ** 2 + k2)
+
+    return {
+        "absorption_coefficient": alpha_nm * 1e7,  # 1/nm -> 1/cm
+        "eps1": n2 - k2,
+        "eps2": 2.0 * n * k,
+        "reflectance": reflectance,
+        "penetration_depth": depth,
+    }
+
+
+def derived_scalars(wl, derived):
+    """Entry-level summary of derived_quantities (NaN if undefined)."""
+    alpha = derived["absorption_coefficient"]
+    finite = np.isfinite(alpha)
+    if not finite.any():
+        return {"alpha_max": np.nan, "wavelength_alpha_max": np.nan, "reflectance_mean": np.nan}
+
+    i = int(np.where(finite, alpha, -np.inf).argmax())
+    R = derived["reflectance"]
+    return {
+        "alpha_max": float(alpha[i]),
+        "wavelength_alpha_max": float(np.asarray(wl, dtype=float)[i]),
+        "reflectance_mean": float(np.nanmean(R)) if np.isfinite(R).any() else np.nan,
+    }
+
+
+# =========================
+# MULTI-DATASET MERGING
+# =========================
+
+def union_grid(wls, max_points=20000):
+    """
+    Common wavelength grid of several spectra: the union of their finite
+    wavelengths, or a uniform grid over the union range when that union
+    has more than max_points values (max_points <= 0 never caps).
+    """
+    wls = [np.asarray(w, dtype=float) for w in wls]
+    wls = [w[np.isfinite(w)] for w in wls]
+    wls = [w for w in wls if w.size]
+    if not wls:
+        return np.empty(0)
+
+    grid = np.unique(np.concatenate(wls))
+    if max_points > 0 and grid.size > max_points:
+        return np.linspace(grid[0], grid[-1], max_points)
+    return grid
+
+
+def resample_batch(spectra, grid):
+    """
+    Resample many (wl, y) series onto one sorted grid into a single
+    (len(spectra), len(grid)) matrix.
+
+    Each series only uses its own finite points and is NaN outside its
+    range (or everywhere with fewer than two points). The covered slice of
+    the grid is found with searchsorted, so every series costs one np.interp
+    over just the points it spans.
+    """
+    grid = np.asarray(grid, dtype=float)
+    out = np.full((len(spectra), grid.size), np.nan)
+
+    for i, (x, y) in enumerate(spectra):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        m = np.isfinite(x) & np.isfinite(y)
+        if not m.all():
+            x, y = x[m], y[m]
+        if x.size < 2:
+            continue
+        if not np.all(x[1:] >= x[:-1]):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        lo = np.searchsorted(grid, x[0], side="left")
+        hi = np.searchsorted(grid, x[-1], side="right")
+        out[i, lo:hi] = np.interp(grid[lo:hi], x, y)
+    return out
+
+
+def column_median(M):
+    """
+    NaN-aware median over axis 0. Sorting pushes NaNs to the end of each
+    column, so the median is picked by index from the per-column count;
+    much faster than np.nanmedian on matrices with scattered NaNs.
+    """
+    count = np.isfinite(M).sum(axis=0)
+    if not M.shape[0]:
+        return np.full(M.shape[1], np.nan)
+    S = np.sort(M, axis=0)
+    cols = np.arange(M.shape[1])
+    lo = np.maximum((count - 1) // 2, 0)
+    hi = np.minimum(count // 2, M.shape[0] - 1)
+    med = 0.5 * (S[lo, cols] + S[hi, cols])
+    med[count == 0] = np.nan
+    return med
+
+
+def merge_spectra(wls, ns, ks, max_points=20000, statistic="median"):
+    """
+    Merge several n,k datasets onto their union grid.
+
+    Returns (grid, {"n", "k", "n_spread", "k_spread", "count"}): the
+    per-point median (or mean) over the datasets covering each grid point,
+    their standard deviation and how many datasets contributed to n.
+    """
+    reduce = {"median": column_median, "mean": lambda M: np.nanmean(M, axis=0)}.get(statistic)
+    if reduce is None:
+        raise ValueError(f"Unknown merge statistic: {statistic}")
+
+    grid = union_grid(wls, max_points)
+    N = resample_batch(list(zip(wls, ns)), grid)
+    K = resample_batch(list(zip(wls, ks)), grid)
+
+    with warnings.catch_warnings():
+        # all-NaN columns (no dataset covers the point) stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return grid, {
+            "n": reduce(N),
+            "k": reduce(K),
+            "n_spread": np.nanstd(N, axis=0),
+            "k_spread": np.nanstd(K, axis=0),
+            "count": np.isfinite(N).sum(axis=0),
+        }
+
+
+# =========================
+# KRAMERS-KRONIG CONSISTENCY
+# =========================
+
+# beyond the measured range k is tapered to zero over this fraction of the range width
+KK_TAPER = 1.0
+# this fraction of the lowest / highest energies is left out of the score
+KK_EDGE_MARGIN = 0.05
+# background poles at these multiples of the highest measured energy (absorption above the range)
+KK_BACKGROUND_POLES = (1.2, 2.0)
+
+
+def _cosine_taper(t):
+    """1 at t <= 0, smoothly down to 0 at t >= 1."""
+    return 0.5 * (1.0 + np.cos(np.pi * np.clip(t, 0.0, 1.0)))
+
+
+def kramers_kronig_n(energy, k, grid_points, taper=KK_TAPER):
+    """
+    n(E) - 1 predicted from k(E) by Kramers-Kronig, via an FFT Hilbert
+    transform in O(M log M).
+
+    k (energy ascending, eV) is resampled onto a uniform grid of
+    grid_points from 0 to the end of the high-energy taper. Outside the
+    measured range the edge values of k are tapered to zero (cosine over
+    taper x range width) instead of cut off: a jump of k to zero would put
+    a log singularity into n at both edges. The grid is extended as an odd
+    function and zero padded against wrap-around. Returns (grid, n_kk - 1)
+    on that grid.
+    """
+    M = int(grid_points)
+    lo, hi = energy[0], energy[-1]
+    width = max(taper * (hi - lo), 1e-12)
+    grid = np.linspace(0.0, hi + width, M)
+    kg = np.interp(grid, energy, k)
+    above = grid > hi
+    kg[above] = k[-1] * _cosine_taper((grid[above] - hi) / width)
+    below = grid < lo
+    kg[below] = k[0] * _cosine_taper((lo - grid[below]) / min(width, lo))
+
+    L = 4 * M
+    full = np.zeros(L)
+    full[:M] = kg
+    full[L - M + 1:] = -kg[:0:-1]
+    spec = np.fft.rfft(full)
+    spec[1:] *= 1j      # -(-i sign(nu)) on the non-negative frequencies
+    spec[0] = 0.0
+    return grid, np.fft.irfft(spec, L)[:M]
+
+
+def kk_consistency(wl, n, k, grid_points=None, max_grid_points=2 ** 17, tolerance=0.02):
+    """
+    Kramers-Kronig consistency of one n,k dataset.
+
+    n is compared to the KK transform of k (tapered beyond the measured
+    range, see kramers_kronig_n) plus a smooth background
+    c0 + c1 E^2 + c2 E^4 + c3 / E^2 + sum_j d_j / (P_j^2 - E^2) with poles
+    P_j above the range (KK_BACKGROUND_POLES), fitted by least squares,
+    which absorbs the contribution of absorption outside the measured
+    range. Jumps from stitched sources or k in wrong units leave a
+    residual it cannot fit. The KK_EDGE_MARGIN ends of the energy range,
+    where the unknown k outside the data matters most, are left out of
+    the fit and the score.
+
+    Returns (score, residual): score = exp(-rms(residual) / tolerance) in
+    (0, 1], 1 being consistent, and the residual in n aligned with the
+    input arrays (NaN where unusable, extrapolated from the fit in the
+    edge margins). (NaN, all-NaN) with fewer than 16 usable points. The
+    grid defaults to the next power of two >= 4 len(wl) (at least 4096;
+    it also spans the taper), capped at max_grid_points.
+    """
+    wl = np.asarray(wl, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+    residual = np.full(wl.shape, np.nan)
+
+    idx = np.flatnonzero(np.isfinite(wl) & np.isfinite(n) & np.isfinite(k) & (wl > 0))
+    if idx.size < 16:
+        return np.nan, residual
+
+    E = HC_EV_NM / wl[idx]
+    if np.all(E[1:] <= E[:-1]):
+        idx = idx[::-1]          # wavelength ascending -> energy ascending
+    elif not np.all(E[1:] >= E[:-1]):
+        idx = idx[np.argsort(E, kind="stable")]
+    E = HC_EV_NM / wl[idx]
+
+    if grid_points is None:
+        grid_points = min(max(4096, 1 << int(np.ceil(np.log2(4 * idx.size)))), max_grid_points)
+    grid, dn = kramers_kronig_n(E, k[idx], grid_points)
+    target = n[idx] - 1.0 - np.interp(E, grid, dn)
+
+    E2 = E * E
+    poles = [(p * E[-1]) ** 2 for p in KK_BACKGROUND_POLES]
+    A = np.stack([np.ones_like(E), E2, E2 * E2, 1.0 / E2, *(1.0 / (P - E2) for P in poles)], axis=1)
+    inner = (E >= E[0] * (1.0 + KK_EDGE_MARGIN)) & (E <= E[-1] * (1.0 - KK_EDGE_MARGIN))
+    if inner.sum() < 16:
+        inner[:] = True
+    coef, *_ = np.linalg.lstsq(A[inner], target[inner], rcond=None)
+    r = target - A @ coef
+
+    residual[idx] = r
+    rms = float(np.sqrt(np.mean(r[inner] ** 2)))
+    return float(np.exp(-rms / tolerance)), residual
+
+
+# =========================
+# CANONICAL VECTOR
+# =========================
+
+DEFAULT_CANONICAL_GRID = (300.0, 2000.0, 341)  # start nm, stop nm, points (5 nm step)
+
+
+def canonical_grid(start=DEFAULT_CANONICAL_GRID[0], stop=DEFAULT_CANONICAL_GRID[1],
+                   points=DEFAULT_CANONICAL_GRID[2]):
+    return np.linspace(start, stop, int(points))
+
+
+def canonical_vector(wl, n, k, grid):
+    """
+    Fixed-length float32 n,k on a canonical grid (see canonical_grid).
+
+    wl must be sorted. Grid points outside the measured range of either
+    series are 0 in both vectors and False in the coverage mask.
+    Returns (n_vec, k_vec, mask).
+    """
+    vals = interp_at(np.asarray(wl, dtype=float), [np.asarray(n, dtype=float), np.asarray(k, dtype=float)], grid)
+    mask = np.isfinite(vals).all(axis=0)
+    vals[:, ~mask] = 0.0
+    vals = vals.astype(np.float32)
+    return vals[0], vals[1], mask
@@ -0,0 +1,226 @@
+"""
+Solar-spectrum-weighted and band-averaged n,k descriptors.
+
+Every descriptor is an integral of the piecewise-linear n,k curve, i.e. a
+dot product with a weight vector on the curve's own wavelength grid:
+exact integrals of the linear interpolation's hat functions, times the
+reference spectrum pre-interpolated onto the grid. Those weights only
+depend on the grid, so they are cached by grid fingerprint and reused by
+every entry sharing a wavelength axis. Kept free of NOMAD imports.
+
+The reference spectrum is read from a tabulated file (e.g. ASTM G173
+AM1.5G, wavelength nm / irradiance W m^-2 nm^-1); without one, a 5778 K
+blackbody scaled to 1000 W m^-2 over 280-4000 nm stands in for it.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+H = 6.62607015e-34          # J s
+C = 2.99792458e8            # m/s
+KB = 1.380649e-23           # J/K
+
+DEFAULT_BANDS = {"uv": (300.0, 400.0), "vis": (400.0, 700.0), "nir": (700.0, 1100.0)}
+
+_SPLIT = re.compile(r"[,;\s]+")
+
+
+# =========================
+# REFERENCE SPECTRA
+# =========================
+
+def blackbody_spectrum(T=5778.0, lo=280.0, hi=4000.0, points=2000, total=1000.0):
+    """Planck spectrum (W m^-2 nm^-1) on [lo, hi] nm, scaled to `total` W m^-2."""
+    wl = np.linspace(lo, hi, points)
+    lam = wl * 1e-9
+    with np.errstate(over="ignore"):
+        irr = 2.0 * H * C ** 2 / lam ** 5 / np.expm1(H * C / (lam * KB * T))
+    return wl, irr * total / (hat_weights(wl, wl[0], wl[-1]) @ irr)
+
+
+def load_reference_spectrum(path, column=1):
+    """
+    Tabulated spectrum from a text/CSV file: wavelength (nm) in the first
+    column, irradiance in `column` (ASTM G173: 1 = extraterrestrial,
+    2 = global tilt AM1.5G, 3 = direct). Non-numeric lines are skipped.
+    """
+    rows = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            parts = _SPLIT.split(line.strip())
+            if len(parts) <= column:
+                continue
+            try:
+                rows.append((float(parts[0]), float(parts[column])))
+            except ValueError:
+                continue
+    if len(rows) < 2:
+        raise ValueError(f"No spectrum found in {path}")
+    arr = np.array(rows)
+    arr = arr[np.argsort(arr[:, 0], kind="stable")]
+    return arr[:, 0], arr[:, 1]
+
+
+def spectrum_label(path=None, column=1, T=5778.0):
+    """Human-readable name of the reference spectrum used, e.g. for the archive."""
+    return f"{os.path.basename(path)} (column {column})" if path else f"blackbody {T:g} K"
+
+
+@lru_cache(maxsize=8)
+def reference_spectrum(path=None, column=1):
+    """Cached (wl, irradiance) of a spectrum file, or the blackbody fallback for path=None."""
+    wl, irr = load_reference_spectrum(path, column) if path else blackbody_spectrum()
+    wl.flags.writeable = False
+    irr.flags.writeable = False
+    return wl, irr
+
+
+# =========================
+# WEIGHT TABLES
+# =========================
+
+def grid_fingerprint(wl):
+    a = np.ascontiguousarray(wl, dtype=np.float64)
+    return hashlib.blake2b(a.tobytes(), digest_size=16).hexdigest()
+
+
+def hat_weights(x, lo, hi):
+    """
+    w with w @ f = integral over [lo, hi] of the linear interpolant of f on
+    the sorted grid x (nothing outside x).
+    """
+    x = np.asarray(x, dtype=float)
+    w = np.zeros(x.size)
+    if x.size < 2 or hi <= lo:
+        return w
+    x0, x1 = x[:-1], x[1:]
+    h = x1 - x0
+    left = np.clip(lo, x0, x1)
+    right = np.clip(hi, x0, x1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tl = np.where(h > 0, (left - x0) / h, 0.0)
+        tr = np.where(h > 0, (right - x0) / h, 0.0)
+    upper = h * (tr * tr - tl * tl) / 2.0       # integral of the rising hat of x1
+    lower = (right - left) - upper              # integral of the falling hat of x0
+    w[:-1] += lower
+    w[1:] += upper
+    return w
+
+
+class WeightTables:
+    """
+    Bounded LRU of weight vectors keyed by (grid fingerprint, spectrum,
+    kind, lo, hi). Thread-safe; one instance is shared per process.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, wl, kind, lo, hi, spectrum=None, fingerprint=None):
+        """
+        kind: "band" (plain hat weights), "solar" (times irradiance) or
+        "photon" (times photon flux, irradiance * wavelength).
+        """
+        key = (fingerprint or grid_fingerprint(wl), spectrum, kind, float(lo), float(hi))
+        with self._lock:
+            w = self._tables.get(key)
+            if w is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return w
+            self.misses += 1
+
+        w = hat_weights(wl, lo, hi)
+        if kind in ("solar", "photon"):
+            s_wl, s_irr = reference_spectrum(*spectrum) if spectrum else reference_spectrum()
+            w = w * np.interp(wl, s_wl, s_irr, left=0.0, right=0.0)
+            if kind == "photon":
+                w = w * wl
+        elif kind != "band":
+            raise ValueError(f"Unknown weight kind: {kind}")
+        w.flags.writeable = False
+
+        with self._lock:
+            self._tables[key] = w
+            if len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return w
+
+
+_TABLES = WeightTables()
+
+
+def _weighted_mean(w, f):
+    ok = np.isfinite(f)
+    den = w @ ok
+    return float(w @ np.where(ok, f, 0.0) / den) if den > 0 else np.nan
+
+
+# =========================
+# DESCRIPTORS
+# =========================
+
+def solar_descriptors(wl, n, k, spectrum=None, bandgap_nm=None, thickness_nm=1000.0, tables=_TABLES):
+    """
+    Solar-weighted descriptors of a sorted n,k curve (wl in nm).
+
+    spectrum is (path, column) of a reference file or None (blackbody).
+    Returns k_solar_weighted (irradiance-weighted mean k), solar_absorptance
+    (photon-flux-weighted absorptance 1 - exp(-alpha d) of a film of
+    thickness_nm, for wavelengths up to bandgap_nm if given) and
+    solar_coverage (fraction of the spectrum's power inside the curve's
+    range). NaN where undefined.
+    """
+    wl = np.asarray(wl, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+    out = {"k_solar_weighted": np.nan, "solar_absorptance": np.nan, "solar_coverage": np.nan}
+    if wl.size < 2:
+        return out
+
+    s_wl, s_irr = reference_spectrum(*spectrum) if spectrum else reference_spectrum()
+    lo, hi = max(wl[0], s_wl[0]), min(wl[-1], s_wl[-1])
+    if hi <= lo:
+        out["solar_coverage"] = 0.0
+        return out
+
+    fp = grid_fingerprint(wl)
+    out["k_solar_weighted"] = _weighted_mean(tables.get(wl, "solar", lo, hi, spectrum, fp), k)
+    out["solar_coverage"] = float(hat_weights(s_wl, lo, hi) @ s_irr / (hat_weights(s_wl, s_wl[0], s_wl[-1]) @ s_irr))
+
+    hi_gap = min(hi, bandgap_nm) if bandgap_nm else hi
+    if hi_gap > lo:
+        with np.errstate(over="ignore", invalid="ignore"):
+            absorptance = -np.expm1(-4.0 * np.pi * k / wl * thickness_nm)
+        out["solar_absorptance"] = _weighted_mean(tables.get(wl, "photon", lo, hi_gap, spectrum, fp), absorptance)
+    return out
+
+
+def band_averages(wl, n, k, bands=DEFAULT_BANDS, tables=_TABLES):
+    """
+    Mean n and k over each band {name: (lo_nm, hi_nm)}, integrated over the
+    part of the band covered by the curve. Returns {name: (n_avg, k_avg)},
+    NaN for bands outside the curve.
+    """
+    wl = np.asarray(wl, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+    fp = grid_fingerprint(wl) if wl.size else None
+    out = {}
+    for name, (lo, hi) in bands.items():
+        if wl.size < 2 or min(hi, wl[-1]) <= max(lo, wl[0]):
+            out[name] = (np.nan, np.nan)
+            continue
+        w = tables.get(wl, "band", lo, hi, None, fp)
+        out[name] = (_weighted_mean(w, n), _weighted_mean(w, k))
+    return out
@@ -0,0 +1,386 @@
+"""
+Readers for electrical property files: TiberCAD material .dat and standard .csv.
+
+Kept free of NOMAD imports so they can be used (and benchmarked) on their own.
+"""
+
+import csv
+import re
+
+# TiberCAD sections the .dat reader extracts from
+TIBERCAD_SECTIONS = (
+    "bandgap",
+    "valenceband",
+    "conductionband",
+    "permittivity",
+    "mobility",
+)
+
+# recognized columns of the standard electrical CSV -> output field
+CSV_FIELDS = {
+    "Eg_eV": "Eg",
+    "chi_eV": "chi",
+    "mobility_e_cm2_Vs": "mu_e",
+    "mobility_h_cm2_Vs": "mu_h",
+    "Nc_cm-3": "Nc",
+    "Nv_cm-3": "Nv",
+    "eps_r": "eps_r",
+    "Ec_eV": "Ec",
+    "Ev_eV": "Ev",
+    "mdos_e": "mdos_e",
+    "mdos_h": "mdos_h",
+    "varshni_alpha_eV_K": "varshni_alpha",
+    "varshni_beta_K": "varshni_beta",
+}
+CSV_COLUMNS = tuple(CSV_FIELDS)
+
+_re_section_head = re.compile(r"^\s*\[\s*([A-Za-z0-9_/ ]+?)\s*\]\s*$", re.MULTILINE)
+
+
+def _as_text(buffer):
+    if isinstance(buffer, bytes):
+        return buffer.decode("utf-8", errors="ignore")
+    return buffer or ""
+
+
+def sniff_tibercad_buffer(buffer):
+    """True if the head of a file has a known TiberCAD [section] header."""
+    text = _as_text(buffer)
+    if "[" not in text:
+        return False
+    for m in _re_section_head.finditer(text):
+        name = m.group(1).lower()
+        if name.split("/", 1)[0] in TIBERCAD_SECTIONS:
+            return True
+    return False
+
+
+def sniff_electrical_csv_buffer(buffer):
+    """True if the first non-empty line of a file is a header with a known column."""
+    text = _as_text(buffer)
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        line = line.lstrip("\ufeff")
+        cols = {c.strip().strip('"').strip("'") for c in line.split(",")}
+        return not cols.isdisjoint(CSV_COLUMNS)
+    return False
+
+
+# =========================
+# TIBERCAD .dat
+# =========================
+
+_re_tuple = re.compile(
+    r"^\(\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*,\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*\)\s*$"
+)
+
+
+def ffloat(x):
+    if x is None:
+        return None
+    if isinstance(x, (int, float)):
+        return float(x)
+    s = str(x).strip()
+    if s == "":
+        return None
+    try:
+        return float(s)
+    except Exception:
+        return None
+
+
+def scalar_value(val):
+    return ffloat(val)
+
+
+def scalar_or_pair_mean(val):
+    """Scalar, or the mean of an ``(a, b)`` tuple (e.g. anisotropic permittivity)."""
+    mt = _re_tuple.match(val)
+    if not mt:
+        return ffloat(val)
+    a = ffloat(mt.group(1))
+    b = ffloat(mt.group(2))
+    if a is None or b is None:
+        return None
+    return 0.5 * (a + b)
+
+
+def pair_value(val):
+    """``(a, b)`` tuple -> (a, b); anything else -> None."""
+    mt = _re_tuple.match(val)
+    if not mt:
+        return None
+    return ffloat(mt.group(1)), ffloat(mt.group(2))
+
+
+# (section, key) -> (output field(s), converter)
+TIBERCAD_FIELDS = {
+    ("bandgap", "Eg_G"): ("Eg", scalar_value),
+    ("valenceband", "E_v"): ("Ev", scalar_value),
+    ("valenceband", "Ev"): ("Ev", scalar_value),
+    ("conductionband", "E_c"): ("Ec", scalar_value),
+    ("conductionband", "Ec"): ("Ec", scalar_value),
+    ("conductionband", "E_c0"): ("Ec", scalar_value),
+    ("permittivity", "permittivity"): ("eps_r", scalar_or_pair_mean),
+    ("mobility/constant", "mu_max"): (("mu_e", "mu_h"), pair_value),
+    ("conductionband", "m_dos"): ("mdos_e", scalar_value),
+    ("valenceband", "m_dos"): ("mdos_h", scalar_value),
+}
+
+DEFAULT_TIBERCAD_OUTPUTS = ("Eg", "Ec", "Ev", "eps_r", "mu_e", "mu_h", "mdos_e", "mdos_h")
+# not waited for across sections (chi falls back to -(Ev + Eg) without Ec), but still
+# read up to the end of the section in which the required fields were completed
+OPTIONAL_TIBERCAD_OUTPUTS = ("Ec",)
+
+
+def register_tibercad_field(section, key, field, converter=scalar_value):
+    """
+    Register an extra (section, key) to extract, e.g.
+
+        register_tibercad_field("srh", "tau_n", "tau_srh_e")
+        register_tibercad_field("auger", "C", ("C_n", "C_p"), pair_value)
+
+    Registered fields are only looked for when requested through
+    parse_tibercad_dat(..., fields=...), so the default path is unchanged.
+    """
+    TIBERCAD_FIELDS[(section.lower(), key)] = (field, converter)
+
+
+def _outputs(field):
+    return field if isinstance(field, tuple) else (field,)
+
+
+def _extract_tibercad(lines, fields):
+    wanted = set(fields)
+    table = {
+        sk: (field, conv) for sk, (field, conv) in TIBERCAD_FIELDS.items()
+        if not wanted.isdisjoint(_outputs(field))
+    }
+    sections = {section for section, _ in table}
+
+    out = dict.fromkeys(fields)
+    missing = set(wanted)
+    required = wanted.difference(OPTIONAL_TIBERCAD_OUTPUTS) or wanted
+    section = None
+    active = False
+    finishing = False       # required fields found: stop at the end of this section
+
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+
+        if line[0] == "[" and line[-1] == "]":
+            if finishing:
+                break
+            section = line[1:-1].strip().lower()
+            active = section in sections
+            continue
+        if not active:
+            continue
+
+        key, eq, val = line.partition("=")
+        if not eq:
+            continue
+        hit = table.get((section, key.strip()))
+        if hit is None:
+            continue
+
+        val = val.split("#", 1)[0].strip()
+        if not val:
+            continue
+        field, conv = hit
+        value = conv(val)
+        if value is None:
+            continue
+
+        if isinstance(field, tuple):
+            for name, v in zip(field, value):
+                if name in missing and v is not None:
+                    out[name] = v
+                    missing.discard(name)
+        elif field in missing:
+            out[field] = value
+            missing.discard(field)
+
+        if not missing:
+            break
+        finishing = missing.isdisjoint(required)
+
+    if all(v is None for v in out.values()):
+        return None
+    return out
+
+
+def parse_tibercad_dat(path, fields=DEFAULT_TIBERCAD_OUTPUTS):
+    """
+    Single-pass, table-driven extraction from a TiberCAD .dat file.
+
+    Only (section, key) pairs from TIBERCAD_FIELDS that produce one of the
+    requested `fields` are converted, and reading stops at the end of the
+    section in which every requested field outside OPTIONAL_TIBERCAD_OUTPUTS
+    got a value (first occurrence wins; optional fields are kept if seen
+    by then), or as soon as every requested field has one. Returns None if
+    nothing was found.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return _extract_tibercad(f, fields)
+
+
+def _tibercad_blocks(f):
+    """
+    Split a multi-material .dat into (name, lines) blocks. A block starts at
+    a ``[material]`` section whose ``name = ...`` key names the material;
+    lines before the first block are ignored.
+    """
+    name = None
+    lines = None
+    in_header = False
+    for line in f:
+        s = line.strip()
+        if s[:1] == "[" and s[-1:] == "]":
+            in_header = s[1:-1].strip().lower() == "material"
+            if in_header:
+                if lines is not None:
+                    yield name, lines
+                name, lines = None, []
+                continue
+        elif in_header and name is None:
+            key, eq, val = s.partition("=")
+            if eq and key.strip().lower() == "name":
+                name = val.split("#", 1)[0].strip() or None
+                continue
+        if lines is not None:
+            lines.append(line)
+    if lines is not None:
+        yield name, lines
+
+
+def tibercad_material_names(path):
+    """Material names of the [material] blocks of a .dat file (None if unnamed)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return [name for name, _ in _tibercad_blocks(f)]
+
+
+def parse_tibercad_blocks(path, fields=DEFAULT_TIBERCAD_OUTPUTS):
+    """
+    One pass over a multi-material .dat file: [(name, fields dict or None), ...]
+    in file order, one per [material] block.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return [(name, _extract_tibercad(lines, fields)) for name, lines in _tibercad_blocks(f)]
+
+
+# =========================
+# STANDARD CSV
+# =========================
+
+def parse_electrical_csv(path):
+    """
+    Standard CSV headers (one row is enough):
+      Eg_eV, chi_eV, mobility_e_cm2_Vs, mobility_h_cm2_Vs,
+      Nc_cm-3, Nv_cm-3, eps_r
+    Optional helpers:
+      Ec_eV, Ev_eV, mdos_e, mdos_h, varshni_alpha_eV_K, varshni_beta_K
+
+    Each column takes its first non-empty value. Rows are streamed and
+    reading stops as soon as every recognized column present in the
+    header has a value.
+    """
+    out = dict.fromkeys(CSV_FIELDS.values())
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return None
+
+        # same column resolution as csv.DictReader: last duplicate wins
+        index = {name: i for i, name in enumerate(header)}
+        pending = [(CSV_FIELDS[name], i) for name, i in index.items() if name in CSV_FIELDS]
+
+        for row in reader:
+            if not pending:
+                break
+            if not row:
+                continue
+            still = []
+            for field, i in pending:
+                if i < len(row) and row[i].strip() != "":
+                    out[field] = ffloat(row[i])
+                else:
+                    still.append((field, i))
+            pending = still
+
+    if all(v is None for v in out.values()):
+        return None
+    return out
+
+
+# column naming the material of a row in multi-material CSV libraries
+CSV_MATERIAL_COLUMNS = ("material", "Material", "name")
+
+
+def _material_column(header):
+    for name in CSV_MATERIAL_COLUMNS:
+        if name in header:
+            return header.index(name)
+    return None
+
+
+def csv_material_names(path):
+    """
+    Material names of the non-empty rows of a CSV library ([] if there is no
+    material column).
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        i = _material_column(header)
+        if i is None:
+            return []
+        return [(row[i].strip() if i < len(row) else "") or None for row in reader if row]
+
+
+def parse_csv_records(path):
+    """
+    One pass over a CSV library with one material per row:
+    [(name, fields dict or None), ...] in file order. [] if there is no
+    material column (a plain single-material CSV; only the header is read).
+    """
+    records = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        i_name = _material_column(header)
+        if i_name is None:
+            return records
+        index = {name: i for i, name in enumerate(header)}
+        columns = [(CSV_FIELDS[name], i) for name, i in index.items() if name in CSV_FIELDS]
+
+        for row in reader:
+            if not row:
+                continue
+            name = (row[i_name].strip() if i_name < len(row) else "") or None
+            out = dict.fromkeys(CSV_FIELDS.values())
+            for field, i in columns:
+                if i < len(row):
+                    out[field] = ffloat(row[i])
+            records.append((name, None if all(v is None for v in out.values()) else out))
+    return records
+
+
+def record_keys(names):
+    """
+    Stable, unique child-archive keys for a list of material names
+    (position-based for unnamed records).
+    """
+    keys = []
+    seen = {}
+    for i, name in enumerate(names):
+        key = re.sub(r"[^A-Za-z0-9_.-]+", "_", name) if name else f"record{i}"
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        keys.append(key if n == 0 else f"{key}__{n + 1}")
+    return keys
@@ -0,0 +1,166 @@
+"""
+Grouping of optical files into multi-dataset entries.
+
+Two ways to put several n,k files into one OpticalConstantsEntry:
+
+  * a manifest (*.nkset, JSON) listing the member files and their metadata:
+        {"material": "ITO",
+         "files": ["ITO_a.nk", {"file": "ITO_b.nk", "source_doi": "10.1/x"}]}
+  * grouping by material prefix (``<material>_<anything>.nk|.txt``): the first
+    file of each prefix (sorted by name) becomes the mainfile of the group.
+
+Directory scans are cached per (directory, mtime, manifest mtimes) so that
+matching every file of a large upload does not list the directory over and
+over, while a manifest edited in place (which leaves the directory mtime
+alone) is still re-read.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+OPTICAL_EXTENSIONS = (".nk", ".txt")
+MANIFEST_EXTENSION = ".nkset"
+
+# per-dataset metadata a manifest may carry
+MANIFEST_FIELDS = ("source_doi", "source_name", "method", "temperature", "bandgap")
+
+
+def material_prefix(path):
+    base = os.path.splitext(os.path.basename(path))[0]
+    return base.split("_", 1)[0]
+
+
+def read_manifest(path):
+    """
+    Returns (material, members) where members is a list of dicts with an
+    absolute "file" path plus optional MANIFEST_FIELDS.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+
+    root = os.path.dirname(os.path.abspath(path))
+    members = []
+    for item in doc.get("files") or []:
+        if isinstance(item, str):
+            item = {"file": item}
+        if not isinstance(item, dict) or not item.get("file"):
+            continue
+        member = {k: item[k] for k in MANIFEST_FIELDS if item.get(k) is not None}
+        member["file"] = os.path.normpath(os.path.join(root, item["file"]))
+        members.append(member)
+
+    material = doc.get("material") or material_prefix(path)
+    return material, members
+
+
+def sniff_manifest_buffer(buffer):
+    """True if the head of a file looks like an .nkset JSON manifest."""
+    if isinstance(buffer, bytes):
+        buffer = buffer.decode("utf-8", errors="ignore")
+    head = (buffer or "").lstrip()
+    return head.startswith("{") and '"files"' in head
+
+
+@lru_cache(maxsize=64)
+def _list_directory(dirname, mtime_ns):
+    """Sorted file names of a directory, one listing per directory state."""
+    try:
+        return tuple(sorted(os.listdir(dirname)))
+    except OSError:
+        return None
+
+
+def _manifest_state(dirname, names):
+    """((name, mtime_ns), ...) of the manifests among names: edits in place keep the directory mtime."""
+    state = []
+    for name in names:
+        if name.lower().endswith(MANIFEST_EXTENSION):
+            try:
+                state.append((name, os.stat(os.path.join(dirname, name)).st_mtime_ns))
+            except OSError:
+                continue
+    return tuple(state)
+
+
+@lru_cache(maxsize=64)
+def _scan_directory(dirname, mtime_ns, manifests):
+    """
+    One scan per directory and manifest state: returns (groups,
+    manifest_members) with groups mapping material prefix -> sorted
+    member paths.
+    """
+    names = _list_directory(dirname, mtime_ns)
+    if names is None:
+        return {}, frozenset()
+
+    groups = {}
+    manifest_members = set()
+    for name in names:
+        if name.lower().endswith(OPTICAL_EXTENSIONS):
+            groups.setdefault(material_prefix(name), []).append(os.path.join(dirname, name))
+    for name, _ in manifests:
+        try:
+            _, members = read_manifest(os.path.join(dirname, name))
+        except (OSError, ValueError):
+            continue
+        manifest_members.update(m["file"] for m in members)
+
+    groups = {k: tuple(v) for k, v in groups.items()}
+    return groups, frozenset(manifest_members)
+
+
+def scan_directory(dirname):
+    try:
+        mtime_ns = os.stat(dirname).st_mtime_ns
+    except OSError:
+        return {}, frozenset()
+    names = _list_directory(dirname, mtime_ns) or ()
+    return _scan_directory(dirname, mtime_ns, _manifest_state(dirname, names))
+
+
+def in_manifest(path):
+    """True if a sibling .nkset manifest already claims this file."""
+    path = os.path.normpath(os.path.abspath(path))
+    _, members = scan_directory(os.path.dirname(path))
+    return path in members
+
+
+def material_group(path):
+    """
+    Files sharing the material prefix of `path` in its directory, sorted by
+    name, excluding files claimed by a manifest.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    groups, members = scan_directory(os.path.dirname(path))
+    return [p for p in groups.get(material_prefix(path), ()) if p not in members]
+
+
+def group_leader(path, accept):
+    """
+    Mainfile of the material group of `path`: the first member (by name)
+    for which `accept(member)` holds. Stops at the first hit.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    for p in material_group(path):
+        if p == path or accept(p):
+            return p
+    return path
+
+
+def load_batch(paths, loader, max_workers=8):
+    """
+    Parse many files with `loader`, overlapping file I/O in a thread pool.
+    Returns a list of (path, result or exception) in input order.
+    """
+    def run(p):
+        try:
+            return p, loader(p)
+        except Exception as e:
+            return p, e
+
+    if len(paths) <= 1 or max_workers <= 1:
+        return [run(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        return list(pool.map(run, paths))
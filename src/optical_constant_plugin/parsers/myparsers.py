@@ -1,25 +1,118 @@
 from nomad.config.models.plugins import ParserEntryPoint
+from pydantic import Field
 
 
 # =========================
-# OPTICAL PARSER (UNCHANGED)
+# OPTICAL PARSER
 # =========================
 
 class OpticalParserEntryPoint(ParserEntryPoint):
     name: str = "optical_parser"
-    description: str = "Minimal parser for optical constants (wavelength[nm], n, k)."
+    description: str = "Parser for optical constants (wavelength[nm], n, k): text .nk/.txt or binary .npz/.h5."
+
+    streaming_threshold_bytes: int | None = Field(
+        512 * 1024 ** 2,
+        description="Files above this size are parsed in bounded-memory chunks (None disables).",
+    )
+    streaming_chunk_bytes: int = Field(
+        16 * 1024 ** 2,
+        description="Chunk size used by the streaming parser.",
+    )
+    group_by_material: bool = Field(
+        False,
+        description=(
+            "Merge all .nk/.txt files sharing a material prefix in a directory into one "
+            "entry with many datasets (.nkset manifests are always grouped)."
+        ),
+    )
+    batch_workers: int = Field(8, description="Threads used to read the files of a group.")
+    cache_dir: str | None = Field(
+        None,
+        description="Directory of the content-addressed result cache (None disables caching).",
+    )
+    cache_max_bytes: int = Field(2 * 1024 ** 3, description="Size above which the cache evicts LRU results.")
 
     def load(self):
         from nomad.parsing.parser import Parser
-        import numpy as np
         import os
 
+        from optical_constant_plugin.cache import file_digest, get_cache
+        from optical_constant_plugin.parsers.grouping import (
+            MANIFEST_EXTENSION,
+            group_leader,
+            in_manifest,
+            load_batch,
+            material_group,
+            material_prefix,
+            read_manifest,
+            sniff_manifest_buffer,
+        )
+        from optical_constant_plugin.parsers.optical_io import (
+            BINARY_EXTENSIONS,
+            load_nk_arrays,
+            load_nk_text,
+            read_head,
+            sniff_nk_binary,
+            sniff_nk_buffer,
+        )
+
+        config = self
+
+        def is_nk_file(path):
+            return sniff_nk_buffer(read_head(path))
+
+        def load_nk(path):
+            """
+            Returns (wavelength, n, k, meta) for a text or binary optical file.
+            """
+            if path.lower().endswith(BINARY_EXTENSIONS):
+                # already columnar: memory-mapped, no need for the cache
+                return load_nk_arrays(path)
+
+            cache = get_cache(config.cache_dir, config.cache_max_bytes)
+            if cache is not None:
+                key = cache.key("optical_parser", file_digest(path))
+                hit = cache.get(key)
+                if hit is not None:
+                    arr = hit["data"]
+                    return arr[:, 0], arr[:, 1], arr[:, 2], {}
+
+            arr = load_nk_text(
+                path,
+                streaming_threshold=config.streaming_threshold_bytes,
+                chunk_bytes=config.streaming_chunk_bytes,
+            )
+            if cache is not None and len(arr):
+                cache.put(key, {"data": arr})
+            return arr[:, 0], arr[:, 1], arr[:, 2], {}
+
         class OpticalParser(Parser):
-            def is_mainfile(self, filename, *args, **kwargs):
+            def is_mainfile(self, filename, mime=None, buffer=None, decoded_buffer=None,
+                            compression=None, *args, **kwargs):
                 if not filename:
                     return False
                 fn = filename.lower()
-                return fn.endswith(".txt") or fn.endswith(".nk")
+
+                # only look at the head NOMAD already read, never parse the file
+                head = decoded_buffer or buffer
+                if head is None:
+                    head = read_head(filename)
+
+                if fn.endswith(MANIFEST_EXTENSION):
+                    return sniff_manifest_buffer(head)
+                if fn.endswith(BINARY_EXTENSIONS):
+                    return not in_manifest(filename) and sniff_nk_binary(filename)
+                if not (fn.endswith(".txt") or fn.endswith(".nk")):
+                    return False
+                if not sniff_nk_buffer(head):
+                    return False
+
+                # files listed in a manifest are parsed as part of it
+                if in_manifest(filename):
+                    return False
+                if config.group_by_material:
+                    return group_leader(filename, is_nk_file) == os.path.normpath(os.path.abspath(filename))
+                return True
 
             def parse(self, mainfile, archive, logger):
                 from optical_constant_plugin.schema_packages.mypackage import (
@@ -27,51 +120,69 @@ class OpticalParserEntryPoint(ParserEntryPoint):
                     OpticalDataset,
                 )
 
-                base = os.path.splitext(os.path.basename(mainfile))[0]
-                material_name = base.split("_", 1)[0]
-
-                data = []
-                with open(mainfile, "r", encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line or line.startswith("#"):
-                            continue
-
-                        parts = line.split()
-                        if len(parts) < 3:
-                            continue
-
-                        try:
-                            wl = float(parts[0])
-                            n = float(parts[1])
-                            k = float(parts[2])
-                            data.append((wl, n, k))
-                        except ValueError:
-                            continue
-
-                if not data:
-                    raise ValueError(f"No valid wavelength n k data found in {mainfile}")
+                if mainfile.lower().endswith(MANIFEST_EXTENSION):
+                    material_name, members = read_manifest(mainfile)
+                elif config.group_by_material:
+                    material_name = material_prefix(mainfile)
+                    this = os.path.normpath(os.path.abspath(mainfile))
+                    members = [
+                        {"file": p} for p in material_group(mainfile)
+                        if p == this or is_nk_file(p)
+                    ]
+                else:
+                    material_name = material_prefix(mainfile)
+                    members = [{"file": mainfile}]
 
-                arr = np.array(data, dtype=float)
-                arr = arr[np.argsort(arr[:, 0])]
+                results = load_batch(
+                    [m["file"] for m in members], load_nk, max_workers=config.batch_workers
+                )
 
                 entry = OpticalConstantsEntry()
                 entry.material = material_name
 
-                dataset = OpticalDataset()
-                dataset.source_name = base
-                dataset.wavelength = arr[:, 0]
-                dataset.n = arr[:, 1]
-                dataset.k = arr[:, 2]
+                datasets = []
+                n_points = 0
+                for member, (path, result) in zip(members, results):
+                    if isinstance(result, Exception) or not len(result[0]):
+                        logger.warning(
+                            "Skipping optical file without valid wavelength n k data",
+                            file=os.path.basename(path),
+                            error=str(result) if isinstance(result, Exception) else None,
+                        )
+                        continue
+
+                    wl, n, k, meta = result
+                    # manifest metadata overrides what the file carries
+                    meta = {**meta, **member}
+
+                    dataset = OpticalDataset()
+                    dataset.source_name = meta.get(
+                        "source_name", os.path.splitext(os.path.basename(path))[0]
+                    )
+                    for key in ("source_doi", "method", "temperature", "bandgap"):
+                        if meta.get(key) is not None:
+                            setattr(dataset, key, meta[key])
+                    dataset.wavelength = wl
+                    dataset.n = n
+                    dataset.k = k
+                    datasets.append(dataset)
+                    n_points += len(wl)
+
+                if not datasets:
+                    raise ValueError(f"No valid wavelength n k data found in {mainfile}")
 
-                entry.datasets = [dataset]
+                entry.datasets = datasets
                 archive.data = entry
 
                 logger.info(
                     "Optical constants parsed successfully",
                     material=material_name,
-                    n_points=len(arr),
+                    n_datasets=len(datasets),
+                    n_points=n_points,
                 )
+                cache = get_cache(config.cache_dir, config.cache_max_bytes)
+                if cache is not None:
+                    logger.debug("Result cache statistics", **cache.stats())
 
         return OpticalParser()
 
@@ -80,214 +191,202 @@ optical_parser = OpticalParserEntryPoint()
 
 
 # =========================
-# ELECTRICAL PARSER (NEW)
+# ELECTRICAL PARSER
 # =========================
 
 class ElectricalParserEntryPoint(ParserEntryPoint):
     name: str = "electrical_parser"
     description: str = "Parser for electrical properties: TiberCAD .dat or standard .csv."
 
+    fan_out_materials: bool = Field(
+        False,
+        description=(
+            "Treat CSVs with a material column and .dat files with several [material] "
+            "blocks as libraries: one ElectricalConstantsEntry per row/block (child archives)."
+        ),
+    )
+    cache_dir: str | None = Field(
+        None,
+        description="Directory of the content-addressed result cache (None disables caching).",
+    )
+    cache_max_bytes: int = Field(2 * 1024 ** 3, description="Size above which the cache evicts LRU results.")
+
     def load(self):
         from nomad.parsing.parser import Parser
         import os
-        import re
-        import csv
-
-        def ffloat(x):
-            if x is None:
-                return None
-            if isinstance(x, (int, float)):
-                return float(x)
-            s = str(x).strip()
-            if s == "":
-                return None
-            try:
-                return float(s)
-            except Exception:
-                return None
 
-        def parse_tibercad_dat(path):
+        from optical_constant_plugin.cache import file_digest, get_cache
+        from optical_constant_plugin.parsers.electrical_io import (
+            csv_material_names,
+            parse_csv_records,
+            parse_electrical_csv,
+            parse_tibercad_blocks,
+            parse_tibercad_dat,
+            record_keys,
+            sniff_electrical_csv_buffer,
+            sniff_tibercad_buffer,
+            tibercad_material_names,
+        )
+        from optical_constant_plugin.parsers.optical_io import read_head
+
+        config = self
+
+        def cached_parse(parse_fn, path):
             """
-            Minimal extraction from TiberCAD .dat:
-              [bandgap] Eg_G
-              [valenceband] E_v (-> Ev)
-              [conductionband] E_c (if present) (-> Ec)
-              [permittivity] permittivity (scalar or tuple -> average)
-              [mobility/constant] mu_max (mu_e, mu_h)
-              [conductionband] m_dos -> mdos_e
-              [valenceband]   m_dos -> mdos_h
+            Run parse_fn(path) -> dict of floats (or None) through the result
+            cache; None values are not stored and come back as missing keys.
             """
-            section = None
-            out = {
-                "Eg": None, "Ec": None, "Ev": None,
-                "eps_r": None,
-                "mu_e": None, "mu_h": None,
-                "mdos_e": None, "mdos_h": None,
-            }
-
-            re_section = re.compile(r"^\s*\[(.+?)\]\s*$")
-            re_kv = re.compile(r"^\s*([A-Za-z0-9_]+)\s*=\s*(.+?)\s*$")
-            re_tuple = re.compile(r"^\(\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*,\s*([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*\)\s*$")
-
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    m = re_section.match(line)
-                    if m:
-                        section = m.group(1).strip().lower()
-                        continue
-
-                    m = re_kv.match(line)
-                    if not m:
-                        continue
-
-                    key = m.group(1).strip()
-                    val = m.group(2).split("#", 1)[0].strip()
-
-                    if section == "bandgap" and key == "Eg_G":
-                        out["Eg"] = ffloat(val)
-
-                    if section == "valenceband" and key in ("E_v", "Ev"):
-                        out["Ev"] = ffloat(val)
-
-                    if section == "conductionband" and key in ("E_c", "Ec", "E_c0"):
-                        out["Ec"] = ffloat(val)
-
-                    if section == "permittivity" and key == "permittivity":
-                        mt = re_tuple.match(val)
-                        if mt:
-                            a = ffloat(mt.group(1))
-                            b = ffloat(mt.group(2))
-                            if a is not None and b is not None:
-                                out["eps_r"] = 0.5 * (a + b)
-                        else:
-                            out["eps_r"] = ffloat(val)
-
-                    if section == "mobility/constant" and key == "mu_max":
-                        mt = re_tuple.match(val)
-                        if mt:
-                            out["mu_e"] = ffloat(mt.group(1))
-                            out["mu_h"] = ffloat(mt.group(2))
-
-                    if section == "conductionband" and key == "m_dos":
-                        out["mdos_e"] = ffloat(val)
-
-                    if section == "valenceband" and key == "m_dos":
-                        out["mdos_h"] = ffloat(val)
-
-            if all(v is None for v in out.values()):
-                return None
+            cache = get_cache(config.cache_dir, config.cache_max_bytes)
+            if cache is None:
+                return parse_fn(path)
+
+            key = cache.key("electrical_parser", parse_fn.__name__, file_digest(path))
+            hit = cache.get(key)
+            if hit is not None:
+                return {k: float(v) for k, v in hit.items()}
+
+            out = parse_fn(path)
+            if out:
+                cache.put(key, out)
             return out
 
-        def parse_electrical_csv(path):
+        # parsed field -> ElectricalDataset quantity
+        dataset_quantities = {
+            "Eg": "bandgap",
+            "chi": "electron_affinity",
+            "mu_e": "mobility_e",
+            "mu_h": "mobility_h",
+            "Nc": "Nc",
+            "Nv": "Nv",
+            "eps_r": "relative_permittivity",
+            "Ec": "Ec",
+            "Ev": "Ev",
+            "mdos_e": "mdos_e",
+            "mdos_h": "mdos_h",
+            "varshni_alpha": "varshni_alpha",
+            "varshni_beta": "varshni_beta",
+        }
+
+        def material_records(path):
             """
-            Standard CSV headers (one row is enough):
-              Eg_eV, chi_eV, mobility_e_cm2_Vs, mobility_h_cm2_Vs,
-              Nc_cm-3, Nv_cm-3, eps_r
-            Optional helpers:
-              Ec_eV, Ev_eV, mdos_e, mdos_h
+            [(name, fields)] for multi-material libraries (more than one
+            [material] block / a material column and more than one row),
+            else None. Only used when fan-out is enabled.
             """
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            if not rows:
-                return None
-
-            def first(col):
-                for r in rows:
-                    v = r.get(col)
-                    if v is None:
-                        continue
-                    if str(v).strip() == "":
-                        continue
-                    return v
+            if not config.fan_out_materials:
                 return None
-
-            out = {
-                "Eg": ffloat(first("Eg_eV")),
-                "chi": ffloat(first("chi_eV")),
-                "mu_e": ffloat(first("mobility_e_cm2_Vs")),
-                "mu_h": ffloat(first("mobility_h_cm2_Vs")),
-                "Nc": ffloat(first("Nc_cm-3")),
-                "Nv": ffloat(first("Nv_cm-3")),
-                "eps_r": ffloat(first("eps_r")),
-                "Ec": ffloat(first("Ec_eV")),
-                "Ev": ffloat(first("Ev_eV")),
-                "mdos_e": ffloat(first("mdos_e")),
-                "mdos_h": ffloat(first("mdos_h")),
-            }
-
-            if all(out[k] is None for k in out):
-                return None
-            return out
+            if path.lower().endswith(".dat"):
+                records = parse_tibercad_blocks(path)
+            else:
+                records = parse_csv_records(path)
+            return records if len(records) > 1 else None
+
+        def make_entry(material_name, source_name, d, method):
+            from optical_constant_plugin.schema_packages.mypackage import (
+                ElectricalConstantsEntry,
+                ElectricalDataset,
+            )
+
+            entry = ElectricalConstantsEntry()
+            entry.material = material_name
+
+            ds = ElectricalDataset()
+            ds.source_name = source_name
+            ds.temperature = 300.0
+            ds.method = method
+            for key, quantity in dataset_quantities.items():
+                if key in d:
+                    setattr(ds, quantity, d[key])
+
+            entry.datasets = [ds]
+            return entry
 
         class ElectricalParser(Parser):
-            def is_mainfile(self, filename, *args, **kwargs):
+            def is_mainfile(self, filename, mime=None, buffer=None, decoded_buffer=None,
+                            compression=None, *args, **kwargs):
                 if not filename:
                     return False
                 fn = filename.lower()
-                return fn.endswith(".dat") or fn.endswith(".csv")
-
-            def parse(self, mainfile, archive, logger):
-                from optical_constant_plugin.schema_packages.mypackage import (
-                    ElectricalConstantsEntry,
-                    ElectricalDataset,
-                )
+                if not (fn.endswith(".dat") or fn.endswith(".csv")):
+                    return False
 
+                # only look at the head NOMAD already read, never parse the file
+                head = decoded_buffer or buffer
+                if head is None:
+                    head = read_head(filename)
+                if fn.endswith(".dat"):
+                    matched = sniff_tibercad_buffer(head)
+                else:
+                    matched = sniff_electrical_csv_buffer(head)
+                if not matched or not config.fan_out_materials:
+                    return matched
+
+                # libraries: the first record goes to the main archive,
+                # every further record to a child archive
+                if fn.endswith(".dat"):
+                    names = tibercad_material_names(filename)
+                else:
+                    names = csv_material_names(filename)
+                if len(names) > 1:
+                    return set(record_keys(names)[1:])
+                return True
+
+            def parse(self, mainfile, archive, logger, child_archives=None):
+                self._parse(mainfile, archive, logger, child_archives)
+                cache = get_cache(config.cache_dir, config.cache_max_bytes)
+                if cache is not None:
+                    logger.debug("Result cache statistics", **cache.stats())
+
+            def _parse(self, mainfile, archive, logger, child_archives):
                 base = os.path.splitext(os.path.basename(mainfile))[0]
                 material_name = base.split("_", 1)[0]
 
                 low = mainfile.lower()
-                entry = ElectricalConstantsEntry()
-                entry.material = material_name
-
-                ds = ElectricalDataset()
-                ds.source_name = base
-                ds.temperature = 300.0
-
                 if low.endswith(".dat"):
-                    d = parse_tibercad_dat(mainfile)
+                    method = "TiberCAD"
+                elif low.endswith(".csv"):
+                    method = "CSV"
+                else:
+                    raise ValueError(f"Unsupported mainfile: {mainfile}")
+
+                records = material_records(mainfile)
+                if records:
+                    keys = record_keys([name for name, _ in records])
+                    children = child_archives or {}
+                    n_entries = 0
+                    for i, (key, (name, d)) in enumerate(zip(keys, records)):
+                        target = archive if i == 0 else children.get(key)
+                        if target is None:
+                            continue
+                        if not d:
+                            logger.warning("Material record without recognized fields", record=key)
+                            continue
+                        target.data = make_entry(name or material_name, f"{base}:{key}", d, method)
+                        n_entries += 1
+
+                    logger.info(
+                        "Electrical library parsed successfully",
+                        n_records=len(records),
+                        n_entries=n_entries,
+                        method=method,
+                    )
+                    return
+
+                if method == "TiberCAD":
+                    d = cached_parse(parse_tibercad_dat, mainfile)
                     if not d:
                         raise ValueError(f"No recognized electrical fields in {mainfile}")
-                    ds.method = "TiberCAD"
-                    ds.bandgap = d.get("Eg")
-                    ds.Ec = d.get("Ec")
-                    ds.Ev = d.get("Ev")
-                    ds.relative_permittivity = d.get("eps_r")
-                    ds.mobility_e = d.get("mu_e")
-                    ds.mobility_h = d.get("mu_h")
-                    ds.mdos_e = d.get("mdos_e")
-                    ds.mdos_h = d.get("mdos_h")
-
-                elif low.endswith(".csv"):
-                    d = parse_electrical_csv(mainfile)
+                else:
+                    d = cached_parse(parse_electrical_csv, mainfile)
                     if not d:
                         raise ValueError(f"No recognized electrical CSV fields in {mainfile}")
-                    ds.method = "CSV"
-                    ds.bandgap = d.get("Eg")
-                    ds.electron_affinity = d.get("chi")
-                    ds.mobility_e = d.get("mu_e")
-                    ds.mobility_h = d.get("mu_h")
-                    ds.Nc = d.get("Nc")
-                    ds.Nv = d.get("Nv")
-                    ds.relative_permittivity = d.get("eps_r")
-                    ds.Ec = d.get("Ec")
-                    ds.Ev = d.get("Ev")
-                    ds.mdos_e = d.get("mdos_e")
-                    ds.mdos_h = d.get("mdos_h")
-                else:
-                    raise ValueError(f"Unsupported mainfile: {mainfile}")
 
-                entry.datasets = [ds]
-                archive.data = entry
+                archive.data = make_entry(material_name, base, d, method)
 
                 logger.info(
                     "Electrical properties parsed successfully",
                     material=material_name,
-                    method=ds.method,
+                    method=method,
                 )
 
         return ElectricalParser()
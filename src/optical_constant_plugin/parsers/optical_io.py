@@ -0,0 +1,421 @@
+"""
+Numeric loaders for optical constant tables (wavelength[nm], n, k).
+
+Kept free of NOMAD imports so they can be used (and benchmarked) on their own.
+"""
+
+import io
+import os
+import re
+import warnings
+
+import numpy as np
+
+# below this many lines a failing block is parsed line by line
+_MIN_BISECT_LINES = 256
+# failed block parses after which failing blocks are no longer split
+_MAX_FAILED_BLOCKS = 32
+
+# how much of a file is looked at when matching mainfiles (optical and electrical parsers)
+SNIFF_BYTES = 4096
+
+_NUM = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_re_triplet = re.compile(rf"^\s*{_NUM}\s+{_NUM}\s+{_NUM}(?:\s|$)")
+
+# streaming defaults (overridable from the parser entry point config)
+DEFAULT_STREAMING_THRESHOLD_BYTES = 512 * 1024 ** 2
+DEFAULT_CHUNK_BYTES = 16 * 1024 ** 2
+
+
+def _parse_lines_slow(lines):
+    """
+    Reference per-line parser: first three float columns of every
+    non-empty, non-comment line; unparsable lines are skipped.
+    """
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+
+        try:
+            rows.append((float(parts[0]), float(parts[1]), float(parts[2])))
+        except ValueError:
+            continue
+
+    if not rows:
+        return np.empty((0, 3), dtype=np.float64)
+    return np.array(rows, dtype=np.float64)
+
+
+def _parse_block(source):
+    """
+    Vectorized parse of a whole block (file-like or list of lines).
+    Raises ValueError if any line is not a numeric row with >= 3 columns.
+    """
+    with warnings.catch_warnings():
+        # empty / comment-only input is handled by the caller
+        warnings.simplefilter("ignore", UserWarning)
+        arr = np.loadtxt(
+            source,
+            dtype=np.float64,
+            comments="#",
+            usecols=(0, 1, 2),
+            ndmin=2,
+        )
+    return arr.reshape(-1, 3)
+
+
+def _split(start, stop):
+    """Halves of [start, stop) in pending-stack order (first half popped first)."""
+    mid = (start + stop) // 2
+    return [(mid, stop), (start, mid)]
+
+
+def _parse_lines_bisect(lines, whole_failed=False):
+    """
+    Parse a list of lines, splitting failing blocks in halves so that
+    only the offending lines end up in the slow per-line path. After
+    _MAX_FAILED_BLOCKS failed attempts (bad lines scattered all over the
+    file) failing blocks are no longer split but parsed in one linear
+    per-line pass, so the number of block attempts stays bounded.
+    whole_failed: the caller already tried the whole list as one block.
+    """
+    failures = 0
+    pending = [(0, len(lines))]              # (start, stop), next block last
+    if whole_failed:
+        failures = 1
+        pending = _split(0, len(lines)) if len(lines) > _MIN_BISECT_LINES else []
+        if not pending:
+            return _parse_lines_slow(lines)
+
+    parts = []
+    while pending:
+        start, stop = pending.pop()
+        block = lines[start:stop]
+        try:
+            parts.append(_parse_block(block))
+            continue
+        except ValueError:
+            failures += 1
+        if stop - start <= _MIN_BISECT_LINES or failures >= _MAX_FAILED_BLOCKS:
+            # no more splits: one linear pass over this block
+            parts.append(_parse_lines_slow(block))
+        else:
+            pending.extend(_split(start, stop))
+    if not parts:
+        return np.empty((0, 3), dtype=np.float64)
+    return np.concatenate(parts)
+
+
+def sort_by_wavelength(arr):
+    """
+    Sort rows by wavelength (stable: rows with equal wavelengths keep
+    their file order); skips the argsort when the column is already
+    ascending, or strictly descending (-> reversed view).
+    """
+    if len(arr) < 2:
+        return arr
+    d = np.diff(arr[:, 0])
+    if np.all(d >= 0):
+        return arr
+    if np.all(d < 0):
+        return arr[::-1]
+    return arr[np.argsort(arr[:, 0], kind="stable")]
+
+
+def _parse_raw(raw):
+    text = raw.decode("utf-8", errors="ignore")
+    try:
+        return _parse_block(io.StringIO(text))
+    except ValueError:
+        return _parse_lines_bisect(text.splitlines(), whole_failed=True)
+
+
+def parse_nk_buffer(raw):
+    """
+    Parse raw file bytes into an (N, 3) float64 array [wavelength, n, k],
+    sorted by wavelength.
+    """
+    return sort_by_wavelength(_parse_raw(raw))
+
+
+class _RowBuffer:
+    """
+    Preallocated (capacity, 3) float64 buffer that grows geometrically
+    and is trimmed in place at the end.
+    """
+
+    def __init__(self, capacity):
+        self.arr = np.empty((max(int(capacity), 16), 3), dtype=np.float64)
+        self.size = 0
+
+    def extend(self, block):
+        need = self.size + len(block)
+        if need > len(self.arr):
+            self.arr.resize((max(need, int(len(self.arr) * 1.25)), 3), refcheck=False)
+        self.arr[self.size:need] = block
+        self.size = need
+
+    def finalize(self):
+        self.arr.resize((self.size, 3), refcheck=False)
+        return self.arr
+
+
+def stream_nk_text(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Bounded-memory variant of load_nk_text for very large files.
+
+    The file is read in fixed-size chunks cut at line boundaries; each chunk is
+    parsed and copied into a growable buffer sized from the bytes/row ratio of
+    the first chunk, so peak memory stays close to the final array.
+    """
+    file_size = os.path.getsize(path)
+    buf = None
+    tail = b""
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            chunk = tail + chunk
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0:
+                tail = chunk
+                continue
+            tail = chunk[cut:]
+
+            block = _parse_raw(chunk[:cut])
+            if buf is None:
+                # estimate final row count, with 5 % headroom
+                per_row = cut / max(len(block), 1)
+                buf = _RowBuffer(1.05 * file_size / per_row)
+            buf.extend(block)
+
+    if tail.strip():
+        block = _parse_raw(tail)
+        if buf is None:
+            buf = _RowBuffer(len(block))
+        buf.extend(block)
+
+    if buf is None:
+        return np.empty((0, 3), dtype=np.float64)
+    return sort_by_wavelength(buf.finalize())
+
+
+def load_nk_text(path, streaming_threshold=DEFAULT_STREAMING_THRESHOLD_BYTES,
+                 chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Load a whitespace separated wavelength/n/k text file (.nk/.txt).
+
+    The file is read in binary and the numeric block is converted in one
+    vectorized pass; header or malformed lines fall back to the per-line path.
+    Files larger than streaming_threshold bytes go through stream_nk_text
+    (None disables streaming).
+    """
+    if streaming_threshold is not None and os.path.getsize(path) > streaming_threshold:
+        return stream_nk_text(path, chunk_bytes=chunk_bytes)
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    return parse_nk_buffer(raw)
+
+
+def read_head(path, size=SNIFF_BYTES):
+    """First `size` bytes of a file (empty on error)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(size)
+    except OSError:
+        return b""
+
+
+def sniff_nk_buffer(buffer, min_rows=3):
+    """
+    Cheap check on the head of a file: True if it looks like a
+    wavelength/n/k table, i.e. at least min_rows numeric triplets appear
+    anywhere in it (so a long metadata header does not hide the data).
+
+    Comment and blank lines are skipped and a truncated last line is
+    ignored. Short files (fewer than min_rows rows) are accepted if the
+    triplets outnumber the other lines.
+    """
+    if not buffer:
+        return False
+    if isinstance(buffer, bytes):
+        buffer = buffer.decode("utf-8", errors="ignore")
+
+    lines = buffer.splitlines()
+    if lines and not buffer.endswith(("\n", "\r")):
+        lines = lines[:-1]
+
+    rows = 0
+    other = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if _re_triplet.match(line):
+            rows += 1
+            if rows >= min_rows:
+                return True
+        else:
+            # header lines (column names, units, metadata)
+            other += 1
+
+    return rows > other
+
+
+# =========================
+# BINARY COLUMNAR INPUT (.npz / .h5)
+# =========================
+
+BINARY_EXTENSIONS = (".npz", ".h5", ".hdf5")
+ARRAY_NAMES = ("wavelength", "n", "k")
+META_NAMES = ("source_doi", "source_name", "method", "temperature", "bandgap")
+
+
+def _npz_member_memmap(path, info):
+    """
+    Memory-map an uncompressed (ZIP_STORED) .npy member of an .npz archive.
+    Returns None if the member cannot be mapped.
+    """
+    import zipfile
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(path, "rb") as f:
+        # local file header: 30 bytes + name + extra field
+        f.seek(info.header_offset)
+        local = f.read(30)
+        if local[:4] != b"PK\x03\x04":
+            return None
+        name_len = int.from_bytes(local[26:28], "little")
+        extra_len = int.from_bytes(local[28:30], "little")
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        if dtype.hasobject:
+            return None
+        offset = f.tell()
+
+    if not shape or 0 in shape:
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran else "C")
+
+
+def _load_npz(path):
+    import zipfile
+
+    arrays = {}
+    meta = {}
+    with zipfile.ZipFile(path) as zf:
+        infos = {i.filename[:-4]: i for i in zf.infolist() if i.filename.endswith(".npy")}
+
+    missing = [name for name in ARRAY_NAMES if name not in infos]
+    if missing:
+        raise ValueError(f"{path} is missing arrays: {', '.join(missing)}")
+
+    with np.load(path, allow_pickle=False) as z:
+        for name in ARRAY_NAMES:
+            arr = _npz_member_memmap(path, infos[name])
+            arrays[name] = arr if arr is not None else z[name]
+        for name in META_NAMES:
+            if name in infos:
+                meta[name] = z[name].item()
+    return arrays, meta
+
+
+def _h5_dataset_array(path, dset):
+    """
+    Memory-map contiguous, uncompressed HDF5 datasets; read everything else.
+    """
+    offset = dset.id.get_offset() if dset.chunks is None and dset.compression is None else None
+    if offset is not None and dset.size:
+        return np.memmap(path, dtype=dset.dtype, mode="r", offset=offset, shape=dset.shape)
+    return dset[()]
+
+
+def _load_h5(path):
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError("Reading HDF5 optical datasets requires h5py.") from e
+
+    arrays = {}
+    meta = {}
+    with h5py.File(path, "r") as f:
+        missing = [name for name in ARRAY_NAMES if name not in f]
+        if missing:
+            raise ValueError(f"{path} is missing arrays: {', '.join(missing)}")
+        for name in ARRAY_NAMES:
+            arrays[name] = _h5_dataset_array(path, f[name])
+        for name in META_NAMES:
+            if name in f.attrs:
+                val = f.attrs[name]
+                if isinstance(val, bytes):
+                    val = val.decode("utf-8", errors="ignore")
+                meta[name] = val.item() if isinstance(val, np.generic) else val
+    return arrays, meta
+
+
+def load_nk_arrays(path):
+    """
+    Load wavelength, n and k from a binary .npz or HDF5 file, memory-mapped
+    where the storage layout allows it (no text round-trip).
+
+    Returns (wavelength, n, k, meta); arrays are only copied if they need
+    to be sorted by wavelength.
+    """
+    if path.lower().endswith(".npz"):
+        arrays, meta = _load_npz(path)
+    else:
+        arrays, meta = _load_h5(path)
+
+    wl, n, k = (np.asarray(arrays[name]).reshape(-1) for name in ARRAY_NAMES)
+    if not (len(wl) == len(n) == len(k)):
+        raise ValueError(f"wavelength, n and k have different lengths in {path}")
+    # float64 per array: files may store e.g. wavelength as float64 and n,k as float32
+    wl, n, k = (a if a.dtype == np.float64 else a.astype(np.float64) for a in (wl, n, k))
+
+    if len(wl) > 1:
+        d = np.diff(wl)
+        if np.all(d >= 0):
+            pass
+        elif np.all(d < 0):
+            # strictly decreasing only: reversing would flip rows with equal wavelengths
+            wl, n, k = wl[::-1], n[::-1], k[::-1]
+        else:
+            order = np.argsort(wl, kind="stable")
+            wl, n, k = wl[order], n[order], k[order]
+    return wl, n, k, meta
+
+
+def sniff_nk_binary(path):
+    """Cheap check that an .npz/.h5 file carries wavelength, n and k arrays."""
+    low = path.lower()
+    try:
+        if low.endswith(".npz"):
+            import zipfile
+
+            with zipfile.ZipFile(path) as zf:
+                names = {name[:-4] for name in zf.namelist() if name.endswith(".npy")}
+            return all(name in names for name in ARRAY_NAMES)
+
+        import h5py
+
+        with h5py.File(path, "r") as f:
+            return all(name in f for name in ARRAY_NAMES)
+    except Exception:
+        return False
@@ -1,5 +1,7 @@
+import numpy as np
 from nomad.metainfo import SchemaPackage, MSection, Quantity, Section, SubSection
 from nomad.datamodel.data import EntryData
+from nomad.datamodel.hdf5 import HDF5Reference
 from nomad.config.models.plugins import SchemaPackageEntryPoint
 from nomad.datamodel.metainfo.plot import PlotSection
 
@@ -7,9 +9,27 @@ m_package = SchemaPackage()
 
 
 # =========================
-# OPTICAL (UNCHANGED)
+# OPTICAL
 # =========================
 
+class DispersionFit(MSection):
+    """
+    Dispersion model fitted to one OpticalDataset. n,k can be evaluated at
+    any wavelength inside [wavelength_min, wavelength_max] from the
+    parameters alone (see normalizers/dispersion.py: evaluate_model).
+    """
+
+    model = Quantity(type=str, description="cauchy, sellmeier or tauc_lorentz.")
+    parameter_names = Quantity(type=str, shape=["*"], description="Names of the model parameters (units in the suffix).")
+    parameters = Quantity(type=float, shape=["*"], description="Fitted model parameters, same order as parameter_names.")
+
+    rms_n = Quantity(type=float, description="RMS deviation of n from the data over the fitted range.")
+    rms_k = Quantity(type=float, description="RMS deviation of k from the data over the fitted range.")
+    wavelength_min = Quantity(type=float, description="Lower end of the valid (fitted) range (nm).")
+    wavelength_max = Quantity(type=float, description="Upper end of the valid (fitted) range (nm).")
+    n_points = Quantity(type=int, description="Number of data points in the fitted range.")
+
+
 class OpticalDataset(PlotSection, MSection):
     m_def = Section(
         label="OpticalDataset",
@@ -21,16 +41,16 @@ class OpticalDataset(PlotSection, MSection):
                         "type": "scatter",
                         "mode": "lines",
                         "name": "n",
-                        "x": "#wavelength",
-                        "y": "#n",
+                        "x": "#wavelength_plot",
+                        "y": "#n_plot",
                         "line": {"width": 2},
                     },
                     {
                         "type": "scatter",
                         "mode": "lines",
                         "name": "k",
-                        "x": "#wavelength",
-                        "y": "#k",
+                        "x": "#wavelength_plot",
+                        "y": "#k_plot",
                         "yaxis": "y2",
                         "line": {"width": 2},
                     },
@@ -83,6 +103,35 @@ class OpticalDataset(PlotSection, MSection):
     n = Quantity(type=float, shape=["*"], description="Refractive index n(λ).")
     k = Quantity(type=float, shape=["*"], description="Extinction coefficient k(λ).")
 
+    # downsampled (peak-preserving) copy for the dataset plot; stays inline when the arrays are offloaded
+    wavelength_plot = Quantity(type=float, shape=["*"], description="Wavelength for the dataset plot (nm), downsampled.")
+    n_plot = Quantity(type=float, shape=["*"], description="n for the dataset plot, downsampled.")
+    k_plot = Quantity(type=float, shape=["*"], description="k for the dataset plot, downsampled.")
+
+    # derived by the normalizer on the same wavelength axis
+    absorption_coefficient = Quantity(type=float, shape=["*"], description="Absorption coefficient 4πk/λ (1/cm).")
+    eps1 = Quantity(type=float, shape=["*"], description="Real permittivity n² − k².")
+    eps2 = Quantity(type=float, shape=["*"], description="Imaginary permittivity 2nk.")
+    reflectance = Quantity(type=float, shape=["*"], description="Normal-incidence reflectance from air.")
+    penetration_depth = Quantity(type=float, shape=["*"], description="Penetration depth 1/alpha (nm).")
+
+    # Kramers-Kronig consistency check (filled by the normalizer)
+    kk_score = Quantity(type=float, description="Kramers-Kronig consistency score in (0, 1]; 1 = consistent.")
+    kk_residual = Quantity(type=float, shape=["*"], description="n minus its Kramers-Kronig prediction from k (+ smooth background).")
+
+    # arrays offloaded to the HDF5 side file (see array_storage.py); the inline value is then empty
+    wavelength_ref = Quantity(type=HDF5Reference, description="HDF5 reference of wavelength, if offloaded.")
+    n_ref = Quantity(type=HDF5Reference, description="HDF5 reference of n, if offloaded.")
+    k_ref = Quantity(type=HDF5Reference, description="HDF5 reference of k, if offloaded.")
+    absorption_coefficient_ref = Quantity(type=HDF5Reference, description="HDF5 reference of absorption_coefficient, if offloaded.")
+    eps1_ref = Quantity(type=HDF5Reference, description="HDF5 reference of eps1, if offloaded.")
+    eps2_ref = Quantity(type=HDF5Reference, description="HDF5 reference of eps2, if offloaded.")
+    reflectance_ref = Quantity(type=HDF5Reference, description="HDF5 reference of reflectance, if offloaded.")
+    penetration_depth_ref = Quantity(type=HDF5Reference, description="HDF5 reference of penetration_depth, if offloaded.")
+    kk_residual_ref = Quantity(type=HDF5Reference, description="HDF5 reference of kk_residual, if offloaded.")
+
+    dispersion_fits = SubSection(section_def=DispersionFit, repeats=True)
+
 
 class OpticalConstantsEntry(PlotSection, EntryData):
     m_def = Section(
@@ -149,26 +198,69 @@ class OpticalConstantsEntry(PlotSection, EntryData):
     material = Quantity(type=str, description="Material name (e.g., ITO, ZnO, C60).")
     reference = Quantity(type=str, description="Reference for the optical constants (DOI if available, otherwise source name).")
 
+    # fixed-wavelength table (configurable list, see OpticalNormalizerEntryPoint.fixed_wavelengths_nm)
+    fixed_wavelengths = Quantity(type=float, shape=["*"], description="Wavelengths of the fixed-point table (nm).")
+    fixed_n = Quantity(type=float, shape=["*"], description="n at fixed_wavelengths (interpolated; NaN outside the measured range).")
+    fixed_k = Quantity(type=float, shape=["*"], description="k at fixed_wavelengths (interpolated; NaN outside the measured range).")
+
+    # searchable values promoted from the table
     n_400nm = Quantity(type=float, description="n at 400 nm (interpolated).")
     k_400nm = Quantity(type=float, description="k at 400 nm (interpolated).")
     n_700nm = Quantity(type=float, description="n at 700 nm (interpolated).")
     k_700nm = Quantity(type=float, description="k at 700 nm (interpolated).")
-    n_800nm = Quantity(type=float, description="n at 800 nm (interpolated).")
-    k_800nm = Quantity(type=float, description="k at 800 nm (interpolated).")
-    n_900nm = Quantity(type=float, description="n at 900 nm (interpolated).")
-    k_900nm = Quantity(type=float, description="k at 900 nm (interpolated).")
-    n_1200nm = Quantity(type=float, description="n at 1200 nm (interpolated).")
-    k_1200nm = Quantity(type=float, description="k at 1200 nm (interpolated).")
-
-    wavelength_plot = Quantity(type=float, shape=["*"], description="Wavelength for main plot (nm).")
-    n_plot = Quantity(type=float, shape=["*"], description="n for main plot.")
-    k_plot = Quantity(type=float, shape=["*"], description="k for main plot.")
+    # deprecated: filled from the table for one more release, use fixed_n/fixed_k
+    n_800nm = Quantity(type=float, description="Deprecated, use fixed_n: n at 800 nm (interpolated).")
+    k_800nm = Quantity(type=float, description="Deprecated, use fixed_k: k at 800 nm (interpolated).")
+    n_900nm = Quantity(type=float, description="Deprecated, use fixed_n: n at 900 nm (interpolated).")
+    k_900nm = Quantity(type=float, description="Deprecated, use fixed_k: k at 900 nm (interpolated).")
+    n_1200nm = Quantity(type=float, description="Deprecated, use fixed_n: n at 1200 nm (interpolated).")
+    k_1200nm = Quantity(type=float, description="Deprecated, use fixed_k: k at 1200 nm (interpolated).")
+
+    alpha_max = Quantity(type=float, description="Maximum absorption coefficient (1/cm).")
+    wavelength_alpha_max = Quantity(type=float, description="Wavelength of the maximum absorption coefficient (nm).")
+    reflectance_mean = Quantity(type=float, description="Mean normal-incidence reflectance over the measured range.")
+    kk_score = Quantity(type=float, description="Lowest Kramers-Kronig consistency score over the datasets.")
+
+    # solar-weighted and band-averaged descriptors of the merged curve
+    k_solar_weighted = Quantity(type=float, description="Mean k weighted by the reference solar spectrum (see solar_spectrum).")
+    solar_absorptance = Quantity(type=float, description="Photon-flux-weighted absorptance 1 - exp(-alpha d) up to the bandgap.")
+    solar_absorptance_thickness = Quantity(type=float, description="Film thickness d used for solar_absorptance (nm).")
+    solar_coverage = Quantity(type=float, description="Fraction of the reference spectrum power inside the measured range.")
+    solar_spectrum = Quantity(type=str, description="Reference spectrum of the solar descriptors (file and column, or the blackbody fallback).")
+    # the band limits are configurable (normalizer bands_nm); the defaults are given
+    n_uv = Quantity(type=float, description="Mean n over the uv band (default 300-400 nm).")
+    k_uv = Quantity(type=float, description="Mean k over the uv band (default 300-400 nm).")
+    n_vis = Quantity(type=float, description="Mean n over the vis band (default 400-700 nm).")
+    k_vis = Quantity(type=float, description="Mean k over the vis band (default 400-700 nm).")
+    n_nir = Quantity(type=float, description="Mean n over the nir band (default 700-1100 nm).")
+    k_nir = Quantity(type=float, description="Mean k over the nir band (default 700-1100 nm).")
+    band_names = Quantity(type=str, shape=["*"], description="Names of all configured averaging bands.")
+    band_n = Quantity(type=float, shape=["*"], description="Mean n per band (same order as band_names).")
+    band_k = Quantity(type=float, shape=["*"], description="Mean k per band (same order as band_names).")
+
+    # merged n,k resampled on a fixed uniform grid: precomputed input for bulk analytics
+    canonical_wavelength_range = Quantity(type=float, shape=[2], description="Start and stop (nm) of the uniform canonical grid.")
+    canonical_n = Quantity(type=np.float32, shape=["*"], description="n on the canonical grid (0 where not covered).")
+    canonical_k = Quantity(type=np.float32, shape=["*"], description="k on the canonical grid (0 where not covered).")
+    canonical_mask = Quantity(type=bool, shape=["*"], description="True where the canonical grid lies inside the measured range.")
+    canonical_coverage = Quantity(type=float, description="Fraction of the canonical grid covered by data.")
+
+    # downsampled (peak-preserving) copies of the merged curve for the main plot
+    # (median over datasets on their union grid); full data lives in datasets
+    wavelength_plot = Quantity(type=float, shape=["*"], description="Wavelength for main plot (nm), downsampled.")
+    n_plot = Quantity(type=float, shape=["*"], description="n for main plot, downsampled.")
+    k_plot = Quantity(type=float, shape=["*"], description="k for main plot, downsampled.")
+    n_spread_plot = Quantity(type=float, shape=["*"], description="Std. deviation of n across merged datasets, at wavelength_plot.")
+    k_spread_plot = Quantity(type=float, shape=["*"], description="Std. deviation of k across merged datasets, at wavelength_plot.")
+    n_spread_plot_ref = Quantity(type=HDF5Reference, description="HDF5 reference of n_spread_plot, if offloaded.")
+    k_spread_plot_ref = Quantity(type=HDF5Reference, description="HDF5 reference of k_spread_plot, if offloaded.")
+    n_datasets_merged = Quantity(type=int, description="Number of datasets merged into the main curve and promoted values.")
 
     datasets = SubSection(section_def=OpticalDataset, repeats=True)
 
 
 # =========================
-# ELECTRICAL (NEW)
+# ELECTRICAL
 # =========================
 
 class ElectricalDataset(MSection):
@@ -205,11 +297,36 @@ class ElectricalDataset(MSection):
     mdos_e = Quantity(type=float, description="DOS mass electrons (m0 units), optional.")
     mdos_h = Quantity(type=float, description="DOS mass holes (m0 units), optional.")
 
+    # Optional Varshni parameters: Eg(T) = Eg0 - alpha*T^2/(T+beta), anchored at Eg(300 K)
+    varshni_alpha = Quantity(type=float, unit="eV/K", description="Varshni alpha (optional).")
+    varshni_beta = Quantity(type=float, unit="K", description="Varshni beta (optional).")
+
+    # Temperature dependence evaluated by the normalizer on temperature_grid
+    temperature_grid = Quantity(type=float, shape=["*"], unit="K", description="Temperature grid for the *_T arrays.")
+    Nc_T = Quantity(type=float, shape=["*"], unit="1/cm^3", description="Nc(T) [cm^-3]")
+    Nv_T = Quantity(type=float, shape=["*"], unit="1/cm^3", description="Nv(T) [cm^-3]")
+    Eg_T = Quantity(type=float, shape=["*"], unit="eV", description="Eg(T) (Varshni, else constant) [eV]")
+    ni_T = Quantity(type=float, shape=["*"], unit="1/cm^3", description="Intrinsic carrier density n_i(T) [cm^-3]")
+
     chi_derived = Quantity(type=bool)
     Nc_derived = Quantity(type=bool)
     Nv_derived = Quantity(type=bool)
 
 
+class ElectricalStatistic(MSection):
+    """
+    Statistics of one quantity over all ElectricalDatasets of an entry
+    (missing values ignored). Values are in the unit of the promoted scalar.
+    """
+
+    quantity = Quantity(type=str, description="Promoted scalar name (Eg, chi, mu_e, mu_h, Nc_300K, Nv_300K, eps_r).")
+    unit = Quantity(type=str, description="Unit of median/min/max.")
+    median = Quantity(type=float, description="Median over the datasets.")
+    min = Quantity(type=float, description="Minimum over the datasets.")
+    max = Quantity(type=float, description="Maximum over the datasets.")
+    count = Quantity(type=int, description="Number of datasets providing the quantity.")
+
+
 class ElectricalConstantsEntry(EntryData):
     """
     One entry per electrical dataset (.dat or .csv).
@@ -228,6 +345,10 @@ class ElectricalConstantsEntry(EntryData):
     Nv_300K = Quantity(type=float, unit="1/cm^3")
     eps_r = Quantity(type=float)
 
+    # Aggregation over all datasets (the promoted scalars are the medians)
+    n_datasets = Quantity(type=int, description="Number of datasets aggregated into the promoted scalars.")
+    statistics = SubSection(section_def=ElectricalStatistic, repeats=True)
+
     datasets = SubSection(section_def=ElectricalDataset, repeats=True)
 
 
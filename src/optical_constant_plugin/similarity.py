@@ -0,0 +1,314 @@
+"""
+Spectral similarity index over the canonical n,k vectors of optical entries
+(see normalizers/optical_math.py: canonical_vector).
+
+The normalizer writes one small ``<root>/vectors/<key[:2]>/<key>.npz`` per
+entry (atomically, from whichever process normalizes it), so the index
+grows incrementally and concurrently. SimilarityIndex picks those files up,
+compresses the features [n, k] with PCA and answers nearest-neighbour
+queries with a batched matrix search in PCA space, followed by an exact
+re-ranking of the candidates on the raw vectors (spectral_distance).
+
+``save()`` writes a consolidated ``<root>/index.npz`` snapshot (rows plus
+the mtime of every vector file they came from) so that later loads only
+read vector files added or rewritten after it.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_COMPONENTS = 32
+SNAPSHOT = "index.npz"
+
+
+def _entry_key(entry_id):
+    return hashlib.blake2b(str(entry_id).encode(), digest_size=20).hexdigest()
+
+
+def _atomic_savez(path, **arrays):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def fill_uncovered(V, M):
+    """
+    Features [n, k] (rows of V) with uncovered grid points (M False) set to
+    the nearest covered value of the same row: constant extension past the
+    measured range, hold across gaps.
+    """
+    D = M.shape[-1]
+    idx = np.maximum.accumulate(np.where(M, np.arange(D), -1), axis=-1)
+    idx = np.where(idx < 0, M.argmax(axis=-1)[..., None], idx)
+    return np.take_along_axis(V, np.concatenate([idx, idx + D], axis=-1), axis=-1)
+
+
+def spectral_distance(V, M, v, m):
+    """
+    RMS difference of n and k between rows (V, M) and one vector (v, m) over
+    the grid points covered by either curve, each extended as in
+    fill_uncovered. Using the union (not the overlap) keeps curves that
+    barely overlap from looking artificially close.
+    """
+    union = M | m
+    diff = fill_uncovered(V, M) - fill_uncovered(v, m)
+    diff = np.where(np.concatenate([union, union], axis=-1), diff, 0.0)
+    counts = 2 * union.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rms = np.sqrt(np.einsum("...d,...d->...", diff, diff) / counts)
+    return np.where(counts > 0, rms, np.inf)
+
+
+def write_vector(root, entry_id, n, k, mask, material=None):
+    """Store (or replace) the canonical vector of one entry under root. Returns the file path."""
+    key = _entry_key(entry_id)
+    path = os.path.join(root, "vectors", key[:2], key + ".npz")
+    _atomic_savez(
+        path,
+        entry_id=np.array(str(entry_id)),
+        material=np.array(material or ""),
+        n=np.asarray(n, dtype=np.float32),
+        k=np.asarray(k, dtype=np.float32),
+        mask=np.asarray(mask, dtype=bool),
+    )
+    return path
+
+
+class SimilarityIndex:
+    """
+    In-memory index of canonical vectors; optionally backed by a directory
+    (root) shared with the normalizers.
+
+    Rows are kept in geometrically grown float32 buffers. Re-adding an
+    entry id replaces its row. PCA is (re)fitted lazily when the number of
+    rows has doubled since the last fit; rows added in between are
+    projected on the existing basis.
+    """
+
+    def __init__(self, root=None, components=DEFAULT_COMPONENTS):
+        self.root = os.path.expanduser(root) if root else None
+        self.components = components
+        self.ids = []
+        self.materials = []
+        self._row = {}
+        self._V = None          # (capacity, 2D) float32 features [n, k]
+        self._M = None          # (capacity, D) coverage masks
+        self._Z = None          # (capacity, c) float32 embeddings
+        self._mean = None
+        self._basis = None
+        self._fitted_size = 0
+        self._seen = {}         # vector file key -> mtime_ns already loaded
+        self._snapshot_loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ----- storage -----
+
+    def _append(self, entry_id, n, k, mask, material=""):
+        v = np.concatenate([np.asarray(n, dtype=np.float32), np.asarray(k, dtype=np.float32)])
+        mask = np.asarray(mask, dtype=bool)
+        if self._V is None:
+            self._V = np.empty((16, v.size), dtype=np.float32)
+            self._M = np.empty((16, mask.size), dtype=bool)
+        elif v.size != self._V.shape[1]:
+            raise ValueError(f"Vector length {v.size} does not match the index ({self._V.shape[1]}).")
+
+        i = self._row.get(entry_id)
+        if i is None:
+            i = len(self.ids)
+            if i == len(self._V):
+                cap = int(len(self._V) * 1.5) + 16
+                self._V.resize((cap, self._V.shape[1]), refcheck=False)
+                self._M.resize((cap, self._M.shape[1]), refcheck=False)
+                if self._Z is not None:
+                    self._Z.resize((cap, self._Z.shape[1]), refcheck=False)
+            self._row[entry_id] = i
+            self.ids.append(entry_id)
+            self.materials.append(material)
+        else:
+            self.materials[i] = material
+
+        self._V[i] = v
+        self._M[i] = mask
+        if self._basis is not None:
+            self._Z[i] = self._embed(v[None, :], mask[None, :])[0]
+
+    def add(self, entry_id, n, k, mask, material=None):
+        """Add or replace one entry (also written to root, if any)."""
+        with self._lock:
+            if self.root:
+                path = write_vector(self.root, entry_id, n, k, mask, material)
+                self._seen[os.path.basename(path)] = os.stat(path).st_mtime_ns
+            self._append(str(entry_id), n, k, mask, material or "")
+
+    def refresh(self):
+        """Load the snapshot (once) and vector files written since. Returns rows added/updated."""
+        if not self.root:
+            return 0
+        count = 0
+        with self._lock:
+            if not self._snapshot_loaded:
+                self._snapshot_loaded = True
+                count += self._load_snapshot()
+
+            for dirpath, _, names in os.walk(os.path.join(self.root, "vectors")):
+                for name in names:
+                    if not name.endswith(".npz"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        mtime = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+                    if self._seen.get(name) == mtime:
+                        continue
+                    try:
+                        with np.load(path, allow_pickle=False) as z:
+                            self._append(str(z["entry_id"]), z["n"], z["k"], z["mask"], str(z["material"]))
+                    except (OSError, ValueError, KeyError):
+                        continue
+                    self._seen[name] = mtime
+                    count += 1
+        return count
+
+    def _load_snapshot(self):
+        path = os.path.join(self.root, SNAPSHOT)
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                ids, materials = z["ids"].tolist(), z["materials"].tolist()
+                V, M = z["V"], z["M"]
+                seen = dict(zip(z["files"].tolist(), z["mtimes"].tolist()))
+        except (OSError, ValueError, KeyError):
+            return 0
+        if not self.ids:
+            # fresh index: take the snapshot arrays as the buffers
+            self._V, self._M = np.array(V, dtype=np.float32), np.array(M, dtype=bool)
+            self.ids, self.materials = ids, materials
+            self._row = {entry_id: i for i, entry_id in enumerate(ids)}
+        else:
+            D = M.shape[1]
+            for i, entry_id in enumerate(ids):
+                self._append(entry_id, V[i, :D], V[i, D:], M[i], materials[i])
+        self._seen.update(seen)
+        return len(ids)
+
+    def save(self):
+        """Write the consolidated snapshot of all loaded rows to root."""
+        if not self.root or not self.ids:
+            return
+        with self._lock:
+            N = len(self.ids)
+            _atomic_savez(
+                os.path.join(self.root, SNAPSHOT),
+                ids=np.array(self.ids),
+                materials=np.array(self.materials),
+                V=self._V[:N],
+                M=self._M[:N],
+                files=np.array(list(self._seen), dtype=str),
+                mtimes=np.array(list(self._seen.values()), dtype=np.int64),
+            )
+
+    # ----- embedding -----
+
+    def _embed(self, V, M):
+        return ((fill_uncovered(V, M) - self._mean) @ self._basis).astype(np.float32)
+
+    def fit(self):
+        """(Re)fit the PCA basis on all rows and embed them."""
+        N = len(self.ids)
+        if not N:
+            return
+        X = fill_uncovered(self._V[:N], self._M[:N])
+        self._mean = X.mean(axis=0, dtype=np.float64).astype(np.float32)
+        X -= self._mean
+        # eigen-decomposition of the (2D x 2D) covariance instead of an SVD of X
+        cov = (X.T @ X).astype(np.float64) / max(N - 1, 1)
+        w, vecs = np.linalg.eigh(cov)
+        c = min(self.components, vecs.shape[1])
+        self._basis = vecs[:, ::-1][:, :c].astype(np.float32)
+
+        self._Z = np.empty((len(self._V), c), dtype=np.float32)
+        self._Z[:N] = X @ self._basis
+        self._fitted_size = N
+
+    def _ensure_fitted(self):
+        if self._basis is None or len(self.ids) > 2 * self._fitted_size:
+            self.fit()
+
+    # ----- queries -----
+
+    def query_batch(self, N_q, K_q, M_q, top=10, candidates=64, chunk=256):
+        """
+        Nearest entries for a batch of query vectors (rows of N_q, K_q, M_q).
+
+        candidates per query are preselected by squared distance in PCA
+        space (one matrix product per chunk of queries) and re-ranked by the
+        exact spectral_distance on the raw vectors.
+        Returns one list of (entry_id, material, rms) per query.
+        """
+        self._ensure_fitted()
+        N = len(self.ids)
+        if not N:
+            return [[] for _ in range(len(M_q))]
+
+        Vq = np.concatenate([np.asarray(N_q, dtype=np.float32), np.asarray(K_q, dtype=np.float32)], axis=1)
+        Mq = np.asarray(M_q, dtype=bool)
+        Zq = self._embed(Vq, Mq)
+        Z = self._Z[:N]
+        z2 = np.einsum("ij,ij->i", Z, Z)
+        c = min(max(candidates, top), N)
+
+        out = []
+        for s in range(0, len(Zq), chunk):
+            zq = Zq[s:s + chunk]
+            d2 = z2[None, :] - 2.0 * (zq @ Z.T)
+            cand = np.argpartition(d2, c - 1, axis=1)[:, :c] if c < N else np.tile(np.arange(N), (len(zq), 1))
+
+            # exact re-ranking on the raw vectors
+            rms = spectral_distance(
+                self._V[cand], self._M[cand], Vq[s:s + chunk, None, :], Mq[s:s + chunk, None, :]
+            )
+
+            for b in range(len(zq)):
+                order = np.argsort(rms[b], kind="stable")[:top]
+                out.append([
+                    (self.ids[j], self.materials[j], float(rms[b, o]))
+                    for o, j in zip(order, cand[b, order])
+                    if np.isfinite(rms[b, o])
+                ])
+        return out
+
+    def query(self, n, k, mask, top=10, candidates=64):
+        """Nearest entries to one canonical n,k vector: list of (entry_id, material, rms)."""
+        return self.query_batch([n], [k], [mask], top=top, candidates=candidates)[0]
+
+    def query_entry(self, entry_id, top=10, candidates=64):
+        """Nearest entries to an indexed entry (excluding itself)."""
+        i = self._row[str(entry_id)]
+        D = self._M.shape[1]
+        hits = self.query(self._V[i, :D], self._V[i, D:], self._M[i], top=top + 1, candidates=candidates)
+        return [h for h in hits if h[0] != str(entry_id)][:top]
+
+
+@lru_cache(maxsize=None)
+def get_index(root, components=DEFAULT_COMPONENTS):
+    """Shared index per directory, loaded on first use (None -> no index)."""
+    if not root:
+        return None
+    index = SimilarityIndex(root, components=components)
+    index.refresh()
+    return index
@@ -0,0 +1,214 @@
+"""
+Thin-film transfer-matrix simulator on stored n,k data.
+
+A stack is an incident medium, coherent layers (material + thickness) and
+an exit medium. Reflectance, transmittance and absorptance (total and per
+layer) are computed for all wavelengths x angles x thickness-sweep points
+at once: each layer's 2x2 characteristic matrix is applied to the
+(B, C) field vector from the back of the stack to the front, as NumPy
+operations over (T, A, W) arrays. Net power flux Re(B C*) at every
+interface gives the per-layer absorption in the same pass.
+
+Complex indices interpolated onto a wavelength grid are cached per
+(material, grid fingerprint), so thickness/angle sweeps on the same grid
+never interpolate again.
+
+    glass = Material.from_entry(glass_entry)
+    stack = [(Material.from_entry(ito), 150.0), (Material.from_entry(pvk), np.linspace(300, 800, 101))]
+    res = simulate_stack(stack, wl=np.linspace(350, 1000, 651), angles_deg=[0, 30, 60], incident=glass)
+    res["R"].shape  # (101, 3, 651)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from optical_constant_plugin.array_storage import section_arrays
+from optical_constant_plugin.cache import content_digest
+from optical_constant_plugin.normalizers.optical_math import merge_spectra, sorted_spectrum
+
+POLARIZATIONS = ("s", "p", "unpolarized")
+
+
+class Material:
+    """
+    Tabulated complex refractive index N = n + ik on a wavelength axis (nm).
+    Outside the tabulated range the edge values are held.
+    """
+
+    def __init__(self, wl, n, k=None, name=None):
+        k = np.zeros_like(np.asarray(n, dtype=float)) if k is None else k
+        wl, (n, k) = sorted_spectrum(wl, n, k)
+        ok = np.isfinite(n) & np.isfinite(k)
+        self.wl, self.n, self.k = wl[ok], n[ok], k[ok]
+        if self.wl.size == 0:
+            raise ValueError(f"Material {name!r} has no finite n,k data.")
+        self.name = name
+        self.key = content_digest(self.wl, self.n, self.k)
+
+    @classmethod
+    def constant(cls, n, k=0.0, name=None):
+        return cls([0.0, 1e9], [n, n], [k, k], name=name or f"n={n}")
+
+    @classmethod
+    def from_entry(cls, entry, max_points=20000, archive=None, root=None):
+        """
+        Material of an OpticalConstantsEntry: its single valid dataset, or the
+        median of all datasets on their union grid (as in the normalizer).
+        Offloaded wavelength/n/k are read from the HDF5 side file (pass the
+        archive, or root for a local side-file directory).
+        """
+        arrays = []
+        for ds in getattr(entry, "datasets", None) or []:
+            wl, n, k = section_arrays(archive, ds, ("wavelength", "n", "k"), root=root)
+            if wl is not None and n is not None and k is not None and len(wl) and len(n) == len(k) == len(wl):
+                arrays.append((np.asarray(wl, dtype=float), np.asarray(n, dtype=float), np.asarray(k, dtype=float)))
+        if not arrays:
+            raise ValueError(f"Entry {getattr(entry, 'material', None)!r} has no valid n,k dataset.")
+        if len(arrays) == 1:
+            return cls(*arrays[0], name=getattr(entry, "material", None))
+        grid, merged = merge_spectra(*zip(*arrays), max_points=max_points)
+        return cls(grid, merged["n"], merged["k"], name=getattr(entry, "material", None))
+
+    def covers(self, wl):
+        return self.wl[0] <= np.min(wl) and np.max(wl) <= self.wl[-1]
+
+    def index(self, wl):
+        """Complex N at wavelengths wl (nm), uncached."""
+        return np.interp(wl, self.wl, self.n) + 1j * np.interp(wl, self.wl, self.k)
+
+
+class IndexCache:
+    """Bounded LRU of interpolated complex indices keyed by (material, grid fingerprint)."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, material, wl, fingerprint=None):
+        if fingerprint is None:
+            fingerprint = hashlib.blake2b(np.ascontiguousarray(wl, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+        key = (material.key, fingerprint)
+        with self._lock:
+            N = self._items.get(key)
+            if N is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return N
+            self.misses += 1
+        N = material.index(wl)
+        N.flags.writeable = False
+        with self._lock:
+            self._items[key] = N
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return N
+
+
+_INDEX_CACHE = IndexCache()
+
+
+def _as_material(m):
+    if isinstance(m, Material):
+        return m
+    m = complex(m)
+    return Material.constant(m.real, m.imag)
+
+
+def _cos_theta(N, n0_sin):
+    """cos of the (complex) propagation angle in a medium of index N = n - ik, on the decaying branch."""
+    cos = np.sqrt(1.0 - (n0_sin / N) ** 2 + 0j)
+    flip = (N * cos).imag > 0
+    return np.where(flip, -cos, cos)
+
+
+def _admittance(N, cos, pol):
+    return N * cos if pol == "s" else N / cos
+
+
+def _simulate_pol(indices, thicknesses, wl, n0_sin, pol):
+    """
+    R, T, per-layer A for one polarization; arrays of shape (T, A, W).
+    indices use the N = n - ik convention of the characteristic matrix.
+    """
+    N0, *N_layers, N_exit = indices
+    eta0 = _admittance(N0, _cos_theta(N0, n0_sin), pol)
+    eta_exit = _admittance(N_exit, _cos_theta(N_exit, n0_sin), pol)
+
+    shape = np.broadcast_shapes(*(d.shape for d in thicknesses), eta0.shape)
+    B = np.ones(shape, dtype=complex)
+    C = np.broadcast_to(eta_exit, shape).astype(complex)
+    flux = [np.broadcast_to(eta_exit.real, shape)]     # Re(B C*) at each interface, back to front
+
+    for N, d in zip(reversed(N_layers), reversed(thicknesses)):
+        cos = _cos_theta(N, n0_sin)
+        eta = _admittance(N, cos, pol)
+        delta = (2.0 * np.pi / wl) * N * cos * d
+        c, s = np.cos(delta), np.sin(delta)
+        B, C = c * B + 1j * s / eta * C, 1j * eta * s * B + c * C
+        flux.append((B * C.conj()).real)
+
+    denom = eta0 * B + C
+    r = (eta0 * B - C) / denom
+    R = np.abs(r) ** 2
+    # fraction of the incident power crossing each interface
+    scale = np.divide(1.0 - R, flux[-1], out=np.zeros(shape), where=flux[-1] > 0)
+    P = [f * scale for f in reversed(flux)]             # front to back
+    A_layers = np.stack([P[j] - P[j + 1] for j in range(len(N_layers))]) if N_layers else np.zeros((0, *shape))
+    return R, P[-1], A_layers
+
+
+def simulate_stack(layers, wl, angles_deg=0.0, incident=1.0, exit=1.0, polarization="unpolarized",
+                   cache=_INDEX_CACHE, check_range=True):
+    """
+    Reflectance, transmittance and absorptance of a coherent thin-film stack.
+
+    layers: list of (material, thickness_nm); a thickness may be a scalar or
+    a 1-D array of sweep points (all sweep arrays share one length T and
+    are zipped; build grids with np.meshgrid + ravel). incident and exit are
+    Materials or (complex) numbers; the incident medium should be
+    non-absorbing. Angles are in the incident medium.
+
+    Returns a dict of arrays with shape (T, A, W) (T = 1 without sweeps):
+    R, T, A (= 1 - R - T) and A_layers with a leading layer axis.
+    """
+    if polarization not in POLARIZATIONS:
+        raise ValueError(f"Unknown polarization: {polarization}")
+    wl = np.atleast_1d(np.asarray(wl, dtype=float))
+    angles = np.deg2rad(np.atleast_1d(np.asarray(angles_deg, dtype=float)))
+
+    incident, exit = _as_material(incident), _as_material(exit)
+    materials = [incident, *(_as_material(m) for m, _ in layers), exit]
+    if check_range:
+        for m in materials:
+            if not m.covers(wl):
+                raise ValueError(
+                    f"Material {m.name!r} covers {m.wl[0]:g}-{m.wl[-1]:g} nm, not {wl.min():g}-{wl.max():g} nm."
+                )
+
+    fp = hashlib.blake2b(np.ascontiguousarray(wl).tobytes(), digest_size=16).hexdigest()
+    indices = [np.conj(cache.get(m, wl, fp) if cache else m.index(wl)) for m in materials]
+
+    # thickness sweeps on axis 0, angles on axis 1, wavelengths on axis 2
+    thicknesses = []
+    for _, d in layers:
+        d = np.asarray(d, dtype=float)
+        if d.ndim > 1:
+            raise ValueError("Thickness sweeps must be scalars or 1-D arrays.")
+        thicknesses.append(d.reshape(-1, 1, 1))
+    n0_sin = (indices[0].real[None, None, :] * np.sin(angles)[None, :, None])
+
+    pols = ("s", "p") if polarization == "unpolarized" else (polarization,)
+    results = [_simulate_pol(indices, thicknesses, wl, n0_sin, pol) for pol in pols]
+    R, T, A_layers = (sum(parts) / len(pols) for parts in zip(*results))
+
+    shape = (max(d.shape[0] for d in thicknesses) if thicknesses else 1, angles.size, wl.size)
+    R = np.broadcast_to(R, shape)
+    T = np.broadcast_to(T, shape)
+    A_layers = np.broadcast_to(A_layers, (len(layers), *shape))
+    return {"R": R, "T": T, "A": 1.0 - R - T, "A_layers": A_layers}
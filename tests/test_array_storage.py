@@ -0,0 +1,91 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from optical_constant_plugin.array_storage import (
+    DATASET_ARRAYS,
+    offload_arrays,
+    section_array,
+    section_arrays,
+    side_file,
+)
+
+pytest.importorskip("h5py")
+
+
+def make_archive(points=500):
+    wl = np.linspace(300.0, 1000.0, points)
+    ds = SimpleNamespace(wavelength=wl, n=1.5 + 0.01 * wl / 1000, k=np.exp(-wl / 300))
+    for name in DATASET_ARRAYS:
+        if not hasattr(ds, name):
+            setattr(ds, name, np.sin(wl / 50.0) + len(name))
+        setattr(ds, f"{name}_ref", None)
+    # the inline downsampled copies the dataset plot reads
+    ds.wavelength_plot, ds.n_plot, ds.k_plot = wl[::10], ds.n[::10], ds.k[::10]
+    data = SimpleNamespace(datasets=[ds])
+    return SimpleNamespace(data=data, metadata=SimpleNamespace(mainfile="raw/si.nk"))
+
+
+def offload(archive, root, min_points=100, **kwargs):
+    sections = [(ds, f"datasets/{i}", DATASET_ARRAYS) for i, ds in enumerate(archive.data.datasets)]
+    return offload_arrays(archive, sections, min_points, root=root, **kwargs)
+
+
+def test_round_trip(tmp_path):
+    archive = make_archive()
+    ds = archive.data.datasets[0]
+    expected = {name: getattr(ds, name).copy() for name in DATASET_ARRAYS}
+
+    assert offload(archive, str(tmp_path)) == len(DATASET_ARRAYS)
+    assert os.path.exists(tmp_path / side_file(archive)[0])
+    for name in DATASET_ARRAYS:
+        assert getattr(ds, name) is None
+        assert getattr(ds, f"{name}_ref").startswith("raw/si.nk.arrays.h5#/entry/datasets/0/")
+    for name, values in zip(DATASET_ARRAYS, section_arrays(archive, ds, DATASET_ARRAYS, root=str(tmp_path))):
+        assert np.array_equal(values, expected[name])
+
+
+def test_nk_offloaded_and_plot_copies_stay_inline(tmp_path):
+    archive = make_archive()
+    ds = archive.data.datasets[0]
+    wl, n, k = ds.wavelength.copy(), ds.n.copy(), ds.k.copy()
+    offload(archive, str(tmp_path))
+
+    assert ds.wavelength is None and ds.n is None and ds.k is None
+    read = section_arrays(archive, ds, ("wavelength", "n", "k"), root=str(tmp_path))
+    for values, expected in zip(read, (wl, n, k)):
+        assert np.array_equal(values, expected)
+    # the OpticalDataset plot reads #wavelength_plot/#n_plot/#k_plot straight from the archive
+    for name in ("wavelength_plot", "n_plot", "k_plot"):
+        assert len(getattr(ds, name)) == 50
+        assert not hasattr(ds, f"{name}_ref")
+
+
+def test_float32_and_short_arrays(tmp_path):
+    archive = make_archive(points=50)
+    ds = archive.data.datasets[0]
+    ds.eps1 = np.linspace(0.0, 1.0, 200) / 3
+    expected = ds.eps1.copy()
+
+    assert offload(archive, str(tmp_path), float32=True, compression="lzf") == 1
+    assert ds.absorption_coefficient_ref is None and len(ds.absorption_coefficient) == 50
+    values = section_array(archive, ds, "eps1", root=str(tmp_path))
+    assert values.dtype == np.float64
+    np.testing.assert_allclose(values, expected, rtol=1e-6)
+    assert not np.array_equal(values, expected)
+
+
+def test_renormalization_rewrites_in_place(tmp_path):
+    archive = make_archive()
+    offload(archive, str(tmp_path))
+    path = tmp_path / side_file(archive)[0]
+    size = os.path.getsize(path)
+
+    again = make_archive()
+    ds = again.data.datasets[0]
+    ds.eps2 = ds.eps2 * 2
+    offload(again, str(tmp_path))
+    assert os.path.getsize(path) == size
+    assert np.array_equal(section_array(again, ds, "eps2", root=str(tmp_path)), make_archive().data.datasets[0].eps2 * 2)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from optical_constant_plugin.cache import content_digest, get_cache
+
+
+def test_digest_of_long_string_list():
+    names = [f"Mat_{i}" for i in range(20)]
+    assert content_digest(names) == content_digest(list(names))
+    assert content_digest(names) != content_digest(names[::-1])
+
+
+def test_digest_of_numeric_sequences_matches_arrays():
+    values = list(range(20))
+    assert content_digest(values) == content_digest(np.arange(20.0))
+    assert content_digest(values) != content_digest(np.arange(21.0))
+
+
+def test_cache_round_trip(tmp_path):
+    cache = get_cache(str(tmp_path), 1024 ** 2)
+    key = cache.key("optical_parser", ["a.nk"] * 10, np.linspace(0, 1, 50))
+    assert cache.get(key) is None
+    cache.put(key, {"n": np.ones(3), "k": None})
+    out = cache.get(key)
+    assert list(out) == ["n"] and np.array_equal(out["n"], np.ones(3))
+
+
+def test_stats_count_hits_and_misses(tmp_path):
+    cache = get_cache(str(tmp_path / "stats"), 1024 ** 2)
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+    key = cache.key("optical_parser", "a")
+    cache.get(key)
+    cache.put(key, {"n": np.ones(3)})
+    cache.get(key)
+    cache.get(key)
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
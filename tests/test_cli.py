@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+pytest.importorskip("nomad")
+
+from optical_constant_plugin import cli
+
+NK = "# wl n k\n" + "".join(f"{wl} {1.5 + wl / 1e4:.4f} {0.01:.4f}\n" for wl in range(300, 1001, 10))
+
+
+def make_tree(root):
+    files = {
+        "optical/TiO2.nk": NK,
+        "optical/notes.txt": "measured on a sunny day\n",
+        "electrical/Si_hall.csv": "Eg_eV,chi_eV,eps_r\n1.12,4.05,11.7\n",
+        "electrical/empty.csv": "Eg_eV,chi_eV\n,\n",
+        "broken/GaAs.nk": NK,
+    }
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def test_run_records_status_per_file(tmp_path, monkeypatch):
+    make_tree(tmp_path / "data")
+    match = cli._match
+
+    def failing_match(path):
+        if "broken" in path:
+            raise OSError("unreadable")
+        return match(path)
+
+    monkeypatch.setattr(cli, "_match", failing_match)
+    rows = cli.run(str(tmp_path / "data"), str(tmp_path / "out"), jobs=1, fmt="json")
+
+    status = {row["file"]: row for row in rows}
+    assert {f: r["status"] for f, r in status.items()} == {
+        os.path.join("broken", "GaAs.nk"): "failed",
+        os.path.join("electrical", "Si_hall.csv"): "ok",
+        os.path.join("electrical", "empty.csv"): "failed",
+        os.path.join("optical", "TiO2.nk"): "ok",
+        os.path.join("optical", "notes.txt"): "skipped",
+    }
+    assert status[os.path.join("broken", "GaAs.nk")]["error"] == "OSError: unreadable"
+    assert status[os.path.join("optical", "TiO2.nk")]["parser"] == "optical_parser"
+    assert status[os.path.join("electrical", "Si_hall.csv")]["material"] == "Si"
+    assert os.path.exists(tmp_path / "out" / "optical" / "TiO2.nk.archive.json")
+
+
+@pytest.mark.parametrize("fmt, summary", [("json", False), ("summary", True), ("both", True)])
+def test_summary_csv_only_when_requested(tmp_path, fmt, summary):
+    make_tree(tmp_path / "data")
+    out = tmp_path / "out"
+    cli.main([str(tmp_path / "data"), "-o", str(out), "-j", "1", "--format", fmt])
+    assert (out / "summary.csv").exists() is summary
+    assert (out / "optical" / "TiO2.nk.archive.json").exists() is (fmt != "summary")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from optical_constant_plugin.normalizers.dispersion import PARAMETER_NAMES, evaluate_model, fit_dispersion
+
+# (model, parameters in PARAMETER_NAMES order, wavelength range in nm, rtol of the recovered parameters)
+KNOWN = [
+    ("cauchy", (1.45, 0.004, 1e-4), (400.0, 1600.0), 1e-6),
+    ("sellmeier", (1.0, 1.0, 0.01, 0.9, 100.0), (300.0, 2000.0), 3e-3),
+    ("tauc_lorentz", (1.5, 100.0, 3.5, 1.5, 1.6), (250.0, 1500.0), 1e-3),
+]
+
+
+@pytest.mark.parametrize("model, params, bounds, rtol", KNOWN)
+def test_fit_recovers_known_parameters(model, params, bounds, rtol):
+    wl = np.linspace(*bounds, 700)
+    n, k = evaluate_model(model, params, wl)
+
+    (fit,) = fit_dispersion(wl, n, k, models=[model], max_fit_points=256, transparent_k=0.01)
+    assert fit["model"] == model
+    assert fit["parameter_names"] == list(PARAMETER_NAMES[model])
+    np.testing.assert_allclose(fit["parameters"], params, rtol=rtol)
+    assert fit["rms_n"] < 1e-3 and fit["rms_k"] < 1e-3
+    # goodness of fit uses every point, not only the subsample
+    assert fit["n_points"] == wl.size
+    assert (fit["wavelength_min"], fit["wavelength_max"]) == bounds
+
+
+def test_transparent_models_fit_only_where_k_is_small():
+    params = (1.5, 100.0, 3.5, 1.5, 1.6)
+    wl = np.linspace(250.0, 1500.0, 700)
+    n, k = evaluate_model("tauc_lorentz", params, wl)
+
+    fits = {f["model"]: f for f in fit_dispersion(wl, n, k, transparent_k=0.01)}
+    assert set(fits) == {"cauchy", "sellmeier", "tauc_lorentz"}
+    transparent = wl[k <= 0.01]
+    for model in ("cauchy", "sellmeier"):
+        assert fits[model]["wavelength_min"] == transparent.min()
+        assert fits[model]["n_points"] == transparent.size
+        assert fits[model]["rms_n"] < 0.01
+    assert fits["tauc_lorentz"]["n_points"] == wl.size
+
+
+def test_evaluate_model_closed_forms():
+    wl = np.array([500.0, 1000.0])
+    n, k = evaluate_model("cauchy", (1.5, 0.01, 0.001), wl)
+    np.testing.assert_allclose(n, [1.5 + 0.04 + 0.016, 1.511])
+    assert not k.any()
+
+    # one UV term, the IR term switched off: n^2 = A + B1 lam^2 / (lam^2 - C1)
+    n, _ = evaluate_model("sellmeier", (1.0, 1.0, 0.01, 0.0, 100.0), wl)
+    np.testing.assert_allclose(n ** 2, 1.0 + wl ** 2 / (wl ** 2 - 1e4))
+
+    # below the gap Tauc-Lorentz is lossless
+    n, k = evaluate_model("tauc_lorentz", (1.5, 100.0, 3.5, 1.5, 1.6), [1000.0, 1200.0])
+    assert not k.any() and np.all(n > 1.0)
+
+    with pytest.raises(ValueError):
+        evaluate_model("drude", (1.0,), wl)
+
+
+def test_too_few_points_and_unknown_model():
+    # 2x the parameter count: enough for Cauchy (3), not for Sellmeier (5)
+    wl = np.linspace(400.0, 800.0, 8)
+    n, k = evaluate_model("cauchy", (1.45, 0.004, 1e-4), wl)
+    assert [f["model"] for f in fit_dispersion(wl, n, k, models=["cauchy", "sellmeier"])] == ["cauchy"]
+    with pytest.raises(ValueError):
+        fit_dispersion(wl, n, k, models=["drude"])
@@ -0,0 +1,159 @@
+import re
+
+import pytest
+
+from optical_constant_plugin.parsers.electrical_io import (
+    csv_material_names,
+    ffloat,
+    parse_csv_records,
+    parse_electrical_csv,
+    parse_tibercad_dat,
+    record_keys,
+    sniff_electrical_csv_buffer,
+    sniff_tibercad_buffer,
+)
+
+SINGLE = "Eg_eV,chi_eV,eps_r\n1.12,,\n,4.05,11.7\n"
+LIBRARY = "material,Eg_eV,chi_eV\nSi,1.12,4.05\nGaAs,1.42,4.07\n,3.2,\n"
+BANDS = """[bandgap]
+Eg_G = 1.55
+[valenceband]
+E_v = -5.4
+m_dos = 0.8
+[conductionband]
+{ec}m_dos = 0.25
+[permittivity]
+permittivity = (6.5, 6.7)
+[mobility/constant]
+mu_max = (20.0, 5.0)
+"""
+LATER = "[bandgap]\nEg_G = 9.9\n[conductionband]\nE_c = -3.0\n"
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_plain_csv_takes_first_value_of_each_column(tmp_path):
+    d = parse_electrical_csv(write(tmp_path, "si.csv", SINGLE))
+    assert (d["Eg"], d["chi"], d["eps_r"]) == (1.12, 4.05, 11.7)
+
+
+def test_csv_without_material_column_is_not_a_library(tmp_path):
+    path = write(tmp_path, "si.csv", SINGLE)
+    assert parse_csv_records(path) == []
+    assert csv_material_names(path) == []
+
+
+def test_csv_library_one_record_per_row(tmp_path):
+    path = write(tmp_path, "lib.csv", LIBRARY)
+    records = parse_csv_records(path)
+    assert [name for name, _ in records] == ["Si", "GaAs", None]
+    assert records[1][1]["Eg"] == 1.42
+    assert records[2][1]["Eg"] == 3.2
+    assert record_keys(csv_material_names(path)) == ["Si", "GaAs", "record2"]
+
+
+def test_tibercad_fields(tmp_path):
+    d = parse_tibercad_dat(write(tmp_path, "pvk.dat", BANDS.format(ec="E_c = -3.9\n")))
+    assert d == {"Eg": 1.55, "Ec": -3.9, "Ev": -5.4, "eps_r": 6.6,
+                 "mu_e": 20.0, "mu_h": 5.0, "mdos_e": 0.25, "mdos_h": 0.8}
+
+
+def test_tibercad_stops_without_waiting_for_optional_ec(tmp_path):
+    d = parse_tibercad_dat(write(tmp_path, "pvk.dat", BANDS.format(ec="") + LATER))
+    assert d["Eg"] == 1.55
+    assert d["Ec"] is None
+
+
+def test_tibercad_reads_on_until_required_fields_are_found(tmp_path):
+    d = parse_tibercad_dat(write(tmp_path, "pvk.dat", LATER + BANDS.format(ec="")))
+    assert (d["Eg"], d["Ec"], d["mdos_e"]) == (9.9, -3.0, 0.25)
+
+
+def legacy_tibercad(text):
+    """The original regex loop (last occurrence wins)."""
+    out = dict.fromkeys(("Eg", "Ec", "Ev", "eps_r", "mu_e", "mu_h", "mdos_e", "mdos_h"))
+    re_tuple = re.compile(r"^\(\s*([^,]+?)\s*,\s*([^)]+?)\s*\)$")
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        m = re.match(r"^\[(.+?)\]$", line)
+        if m:
+            section = m.group(1).strip().lower()
+            continue
+        m = re.match(r"^([A-Za-z0-9_]+)\s*=\s*(.+?)$", line)
+        if not m:
+            continue
+        key, val = m.group(1), m.group(2).split("#", 1)[0].strip()
+        pair = re_tuple.match(val)
+        if section == "bandgap" and key == "Eg_G":
+            out["Eg"] = ffloat(val)
+        if section == "valenceband" and key in ("E_v", "Ev"):
+            out["Ev"] = ffloat(val)
+        if section == "conductionband" and key in ("E_c", "Ec", "E_c0"):
+            out["Ec"] = ffloat(val)
+        if section == "permittivity" and key == "permittivity":
+            out["eps_r"] = 0.5 * (ffloat(pair.group(1)) + ffloat(pair.group(2))) if pair else ffloat(val)
+        if section == "mobility/constant" and key == "mu_max" and pair:
+            out["mu_e"], out["mu_h"] = ffloat(pair.group(1)), ffloat(pair.group(2))
+        if section == "conductionband" and key == "m_dos":
+            out["mdos_e"] = ffloat(val)
+        if section == "valenceband" and key == "m_dos":
+            out["mdos_h"] = ffloat(val)
+    return out
+
+
+CONDUCTION_LAST = """[bandgap]
+Eg_G = 1.55
+[valenceband]
+E_v = -5.4
+m_dos = 0.8
+[permittivity]
+permittivity = (6.5, 6.7)
+[mobility/constant]
+mu_max = (20.0, 5.0)
+[conductionband]
+m_dos = 0.2
+{between}E_c = -3.9
+[thermal]
+kappa = 1.3
+"""
+
+
+@pytest.mark.parametrize("between", ["", "tau = 1e-9\n", "# comment\n\nchi = 4.0\n"])
+def test_tibercad_ec_after_required_keys_matches_legacy(tmp_path, between):
+    text = CONDUCTION_LAST.format(between=between)
+    d = parse_tibercad_dat(write(tmp_path, "pvk.dat", text))
+    assert d["Ec"] == -3.9
+    assert d == legacy_tibercad(text)
+
+
+def test_tibercad_default_layout_matches_legacy(tmp_path):
+    for ec in ("", "E_c = -3.9\n"):
+        text = BANDS.format(ec=ec)
+        assert parse_tibercad_dat(write(tmp_path, "pvk.dat", text)) == legacy_tibercad(text)
+
+
+@pytest.mark.parametrize(
+    "text, tibercad, csv",
+    [
+        (BANDS.format(ec=""), True, False),
+        ("# header\n  [ Mobility/Constant ]\nmu = 1\n", True, False),
+        ("[unknown]\nx = 1\n", False, False),
+        (SINGLE, False, True),
+        ("\ufeffmaterial,Eg_eV\nSi,1.12\n", False, True),
+        ('\n"Eg_eV","chi_eV"\n1.1,4.0\n', False, True),
+        ("a,b,c\n1,2,3\n", False, False),
+        ("400 1.5 0.1\n500 1.6 0.2\n", False, False),
+        ("", False, False),
+    ],
+)
+def test_sniffers(text, tibercad, csv):
+    for buffer in (text, text.encode()):
+        assert sniff_tibercad_buffer(buffer) is tibercad
+        assert sniff_electrical_csv_buffer(buffer) is csv
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from optical_constant_plugin.normalizers.electrical_model import (
+    KB_EV,
+    derive_band_parameters,
+    dos_3d_cm3,
+    evaluate_temperature_models,
+)
+
+# Si: Varshni parameters of Eg(T) = 1.17 - 4.73e-4 T^2 / (T + 636)
+ALPHA, BETA = 4.73e-4, 636.0
+NAN = np.nan
+
+
+def test_dos_matches_textbook_prefactor():
+    # Nc = 2.509e19 cm^-3 (m*/m0)^1.5 at 300 K
+    assert dos_3d_cm3(1.0) == pytest.approx(2.509e19, rel=1e-3)
+    assert dos_3d_cm3(1.09) == pytest.approx(2.509e19 * 1.09 ** 1.5, rel=1e-3)
+
+
+def test_varshni_anchored_at_300k():
+    T = np.array([10.0, 77.0, 300.0, 500.0])
+    Eg = evaluate_temperature_models(T, Eg=1.12, Nc=2.8e19, Nv=1.04e19, alpha=ALPHA, beta=BETA)["Eg"]
+    # Eg(0 K) follows from the anchor: 1.12 + 4.73e-4 * 300^2 / 936
+    eg0 = 1.16548
+    np.testing.assert_allclose(Eg, eg0 - ALPHA * T ** 2 / (T + BETA), atol=1e-5)
+    assert Eg[2] == pytest.approx(1.12)
+
+    # without Varshni parameters the gap stays at its 300 K value
+    flat = evaluate_temperature_models(T, Eg=1.12, Nc=2.8e19, Nv=1.04e19)["Eg"]
+    np.testing.assert_allclose(flat, 1.12)
+
+
+def test_effective_dos_scales_as_t_to_the_1_5():
+    T = np.array([150.0, 300.0, 600.0])
+    out = evaluate_temperature_models(T, Nc=2.8e19, mdos_h=0.81)
+    np.testing.assert_allclose(out["Nc"], 2.8e19 * (T / 300.0) ** 1.5)
+    # from the DOS mass where no explicit value is given
+    np.testing.assert_allclose(out["Nv"], dos_3d_cm3(0.81, 300.0) * (T / 300.0) ** 1.5)
+    assert np.isnan(out["Eg"]).all() and np.isnan(out["ni"]).all()
+
+
+def test_intrinsic_density_closed_form():
+    T = np.array([250.0, 300.0, 400.0])
+    out = evaluate_temperature_models(T, Eg=1.12, Nc=2.8e19, Nv=1.04e19, alpha=ALPHA, beta=BETA)
+    expected = np.sqrt(2.8e19 * 1.04e19) * (T / 300.0) ** 1.5 * np.exp(-out["Eg"] / (2 * KB_EV * T))
+    np.testing.assert_allclose(out["ni"], expected)
+    # the textbook order of magnitude of Si at room temperature
+    assert 5e9 < out["ni"][1] < 1e10
+
+
+def test_batched_materials_match_single_evaluations():
+    T = np.linspace(100.0, 500.0, 9)
+    params = {"Eg": [1.12, 1.42], "Nc": [2.8e19, NAN], "Nv": [1.04e19, 9.0e18],
+              "mdos_e": [NAN, 0.063], "alpha": [ALPHA, 5.405e-4], "beta": [BETA, 204.0]}
+    batch = evaluate_temperature_models(T, **{k: np.array(v) for k, v in params.items()})
+    assert batch["ni"].shape == (2, T.size)
+    for i in range(2):
+        single = evaluate_temperature_models(T, **{k: v[i] for k, v in params.items()})
+        for name in ("Nc", "Nv", "Eg", "ni"):
+            np.testing.assert_allclose(batch[name][i], single[name])
+
+
+def test_derive_band_parameters():
+    out = derive_band_parameters(
+        Eg=[1.12, 1.55, 1.6, NAN],
+        Ec=[NAN, -3.9, NAN, NAN],
+        Ev=[NAN, NAN, -5.4, NAN],
+        chi=[4.05, NAN, NAN, NAN],
+        Nc=[2.8e19, NAN, NAN, NAN],
+        Nv=[NAN, 1.0e18, NAN, NAN],
+        mdos_e=[1.09, 0.25, NAN, NAN],
+        mdos_h=[0.81, NAN, 0.8, NAN],
+    )
+    # explicit chi wins, then -Ec, then -(Ev + Eg)
+    np.testing.assert_allclose(out["chi"][:3], [4.05, 3.9, 3.8])
+    assert list(out["chi_derived"]) == [False, True, True, False]
+    assert np.isnan(out["chi"][3])
+
+    np.testing.assert_allclose(out["Nc"][:2], [2.8e19, dos_3d_cm3(0.25)])
+    assert list(out["Nc_derived"]) == [False, True, False, False]
+    np.testing.assert_allclose(out["Nv"][:3], [dos_3d_cm3(0.81), 1.0e18, dos_3d_cm3(0.8)])
+    assert list(out["Nv_derived"]) == [True, False, True, False]
+    assert np.isnan(out["Nc"][2:]).all() and np.isnan(out["Nv"][3])
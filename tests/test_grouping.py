@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+from optical_constant_plugin.parsers.grouping import in_manifest, material_group, sniff_manifest_buffer
+
+
+def touch(path, text="400 1.5 0.0\n500 1.5 0.0\n600 1.5 0.0\n"):
+    path.write_text(text)
+    return str(path)
+
+
+def test_material_group_excludes_manifest_members(tmp_path):
+    a = touch(tmp_path / "ITO_a.nk")
+    b = touch(tmp_path / "ITO_b.nk")
+    touch(tmp_path / "ITO.nkset", json.dumps({"material": "ITO", "files": ["ITO_b.nk"]}))
+    assert material_group(a) == [a]
+    assert in_manifest(b) and not in_manifest(a)
+
+
+def test_manifest_edited_in_place_is_reread(tmp_path):
+    a = touch(tmp_path / "ITO_a.nk")
+    b = touch(tmp_path / "ITO_b.nk")
+    manifest = tmp_path / "ITO.nkset"
+    manifest.write_text(json.dumps({"files": ["ITO_a.nk"]}))
+    assert in_manifest(a) and not in_manifest(b)
+
+    dir_stat = os.stat(tmp_path)
+    manifest.write_text(json.dumps({"files": ["ITO_b.nk"]}))
+    stat = os.stat(manifest)
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    os.utime(tmp_path, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    assert in_manifest(b) and not in_manifest(a)
+    assert material_group(a) == [a]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"material": "ITO", "files": ["ITO_a.nk"]}', True),
+        ('\n  {\n  "files": [\n', True),
+        ('{"material": "ITO"}', False),
+        ('["files"]', False),
+        ("400 1.5 0.1\n", False),
+        ("", False),
+    ],
+)
+def test_sniff_manifest(text, expected):
+    assert sniff_manifest_buffer(text) is expected
+    assert sniff_manifest_buffer(text.encode()) is expected
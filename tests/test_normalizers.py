@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("nomad")
+
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from optical_constant_plugin.material_index import MaterialIndex
+from optical_constant_plugin.normalizers.mynormalizer import (
+    ElectricalNormalizerEntryPoint,
+    OpticalNormalizerEntryPoint,
+)
+from optical_constant_plugin.schema_packages.mypackage import (
+    ElectricalConstantsEntry,
+    ElectricalDataset,
+    OpticalConstantsEntry,
+    OpticalDataset,
+)
+
+
+class Logger:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def optical_archive(entry_id="opt1", material="TiO2"):
+    wl = np.linspace(300.0, 1200.0, 200)
+    ds = OpticalDataset(source_name="ellipsometry", wavelength=wl, n=2.4 + 0.0 * wl, k=0.1 * np.exp(-wl / 300.0))
+    data = OpticalConstantsEntry(material=material, datasets=[ds])
+    return EntryArchive(data=data, metadata=EntryMetadata(entry_id=entry_id, mainfile=f"{entry_id}.nk"))
+
+
+def electrical_archive(entry_id="el1", material="TiO2"):
+    ds = ElectricalDataset(source_name="Hall", bandgap=3.2, electron_affinity=4.2, mobility_e=10.0)
+    data = ElectricalConstantsEntry(material=material, datasets=[ds])
+    return EntryArchive(data=data, metadata=EntryMetadata(entry_id=entry_id, mainfile=f"{entry_id}.csv"))
+
+
+@pytest.fixture
+def normalizers(tmp_path):
+    path = str(tmp_path / "materials.sqlite")
+    optical = OpticalNormalizerEntryPoint(
+        material_index_path=path, dispersion_models=[], kk_check=False
+    ).load()
+    electrical = ElectricalNormalizerEntryPoint(material_index_path=path, temperature_points=5).load()
+    return optical, electrical, path
+
+
+def test_electrical_normalizer_ignores_optical_entries(normalizers):
+    optical, electrical, path = normalizers
+    archive = optical_archive()
+    optical.normalize(archive, Logger())
+    reference = archive.data.reference
+    electrical.normalize(archive, Logger())
+
+    assert archive.data.reference == reference
+    ds = archive.data.datasets[0]
+    for name in ("chi_derived", "Nc_derived", "temperature_grid", "Eg_T"):
+        assert getattr(ds, name, None) is None
+    assert getattr(archive.data, "statistics", None) is None
+    rec = MaterialIndex(path).lookup("TiO2")
+    assert list(rec["optical"]) == ["opt1"]
+    assert rec["electrical"] == {}
+
+
+def test_optical_normalizer_ignores_electrical_entries(normalizers):
+    optical, electrical, path = normalizers
+    archive = electrical_archive()
+    electrical.normalize(archive, Logger())
+    optical.normalize(archive, Logger())
+
+    assert archive.data.Eg.magnitude == pytest.approx(3.2)
+    rec = MaterialIndex(path).lookup("tio2")
+    assert rec["optical"] == {}
+    assert list(rec["electrical"]) == ["el1"]
+
+
+def test_material_index_joins_both_kinds(normalizers):
+    optical, electrical, path = normalizers
+    for archive in (optical_archive(), electrical_archive()):
+        optical.normalize(archive, Logger())
+        electrical.normalize(archive, Logger())
+
+    (rec,) = MaterialIndex(path).joined()
+    assert rec["optical"]["opt1"]["n_400nm"] == pytest.approx(2.4)
+    assert rec["electrical"]["el1"]["Eg"] == pytest.approx(3.2)
+
+
+def test_electrical_normalizer_aggregates_all_datasets(normalizers):
+    _, electrical, _ = normalizers
+    data = ElectricalConstantsEntry(
+        material="MAPbI3",
+        datasets=[
+            ElectricalDataset(source_name="TiberCAD", bandgap=1.60, Ec=-3.9),
+            ElectricalDataset(source_name="Hall", bandgap=1.55, mobility_e=10.0),
+            ElectricalDataset(source_doi="10.1/x", bandgap=1.70, electron_affinity=4.0),
+        ],
+    )
+    archive = EntryArchive(data=data, metadata=EntryMetadata(entry_id="el2", mainfile="el2.csv"))
+    electrical.normalize(archive, Logger())
+
+    assert data.Eg.magnitude == pytest.approx(1.60)
+    assert data.chi.magnitude == pytest.approx(3.95)
+    assert data.n_datasets == 3
+    assert data.reference == "TiberCAD; Hall; 10.1/x"
+    stats = {s.quantity: s for s in data.statistics}
+    assert (stats["Eg"].min, stats["Eg"].max, stats["Eg"].count) == (pytest.approx(1.55), pytest.approx(1.70), 3)
+    assert stats["mu_e"].count == 1
+    assert data.datasets[0].chi_derived
+
+
+def test_fixed_point_table_and_deprecated_aliases(normalizers):
+    optical, _, _ = normalizers
+    archive = optical_archive()
+    optical.normalize(archive, Logger())
+    data = archive.data
+    assert list(data.fixed_wavelengths) == [400.0, 700.0, 800.0, 900.0, 1200.0]
+    expected_k = 0.1 * np.exp(-np.asarray(data.fixed_wavelengths) / 300.0)
+    np.testing.assert_allclose(data.fixed_k, expected_k, rtol=1e-3)
+    for i, t in enumerate((400, 700, 800, 900, 1200)):
+        assert getattr(data, f"n_{t}nm") == pytest.approx(data.fixed_n[i])
+        assert getattr(data, f"k_{t}nm") == pytest.approx(data.fixed_k[i])
+
+
+def test_band_averages_promote_only_mapped_bands(tmp_path):
+    class Recorder:
+        def __init__(self):
+            self.warnings = []
+
+        def warning(self, event, **kwargs):
+            self.warnings.append((event, kwargs))
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    optical = OpticalNormalizerEntryPoint(
+        bands_nm={"vis": (450.0, 650.0), "swir": (1000.0, 1200.0)}, dispersion_models=[], kk_check=False
+    ).load()
+    archive = optical_archive()
+    logger = Recorder()
+    optical.normalize(archive, logger)
+
+    data = archive.data
+    assert list(data.band_names) == ["vis", "swir"]
+    assert data.n_vis == pytest.approx(2.4)
+    assert data.k_vis == pytest.approx(data.band_k[0])
+    assert data.n_uv is None and data.n_nir is None
+    assert [kwargs["band"] for _, kwargs in logger.warnings] == ["swir"]
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from optical_constant_plugin.parsers import optical_io
+from optical_constant_plugin.parsers.optical_io import (
+    load_nk_arrays,
+    load_nk_text,
+    parse_nk_buffer,
+    sniff_nk_buffer,
+)
+
+
+def legacy_loop(text):
+    """The original per-line loader, with a stable sort."""
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        try:
+            rows.append((float(parts[0]), float(parts[1]), float(parts[2])))
+        except ValueError:
+            continue
+    arr = np.array(rows, dtype=float).reshape(-1, 3)
+    return arr[np.argsort(arr[:, 0], kind="stable")]
+
+
+def table(rows, seed=0, bad_every=None, header=True, descending=False):
+    rng = np.random.default_rng(seed)
+    wl = np.round(np.linspace(250.0, 2500.0, rows), 3)
+    if descending:
+        wl = wl[::-1]
+    lines = ["wavelength n k"] if header else []
+    for i, w in enumerate(wl):
+        if bad_every and i % bad_every == 0:
+            lines.append(rng.choice(["n/a", "1.0 2.0", "# comment", "", "300 1.5 nan?"]))
+        lines.append(f"{w} {2 + rng.random():.6f} {rng.random():.6e}")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"header": False},
+        {"descending": True},
+        {"bad_every": 7},
+        {"bad_every": 997},
+        {"bad_every": 3, "descending": True},
+    ],
+)
+def test_parity_with_legacy_loop(kwargs):
+    text = table(5000, **kwargs)
+    assert np.array_equal(parse_nk_buffer(text.encode()), legacy_loop(text))
+
+
+def test_duplicate_wavelengths_keep_file_order():
+    text = "500 1.0 0.1\n400 2.0 0.2\n400 3.0 0.3\n300 4.0 0.4\n"
+    arr = parse_nk_buffer(text.encode())
+    assert arr[:, 1].tolist() == [4.0, 2.0, 3.0, 1.0]
+    assert np.array_equal(arr, legacy_loop(text))
+
+
+def test_scattered_bad_lines_bounded_block_attempts(monkeypatch):
+    calls = []
+    parse_block = optical_io._parse_block
+
+    def counting(source):
+        calls.append(1)
+        return parse_block(source)
+
+    monkeypatch.setattr(optical_io, "_parse_block", counting)
+    text = table(20000, bad_every=50)
+    assert np.array_equal(parse_nk_buffer(text.encode()), legacy_loop(text))
+    # every failure splits at most once into two attempts
+    assert len(calls) <= 2 * optical_io._MAX_FAILED_BLOCKS + 1
+
+
+def test_streaming_matches_whole_file(tmp_path):
+    path = tmp_path / "x.nk"
+    text = table(3000, bad_every=101)
+    path.write_text(text)
+    streamed = load_nk_text(str(path), streaming_threshold=0, chunk_bytes=4096)
+    assert np.array_equal(streamed, legacy_loop(text))
+
+
+def test_binary_arrays_converted_to_float64_individually(tmp_path):
+    path = str(tmp_path / "si.npz")
+    wl = np.array([700.0, 400.0, 500.0])
+    np.savez(path, wavelength=wl, n=np.array([3.7, 5.6, 4.3], dtype=np.float32), k=np.array([0, 1, 2], dtype=np.int32))
+    wl, n, k, _ = load_nk_arrays(path)
+    assert (wl.dtype, n.dtype, k.dtype) == (np.float64,) * 3
+    assert wl.tolist() == [400.0, 500.0, 700.0]
+    assert np.allclose(n, [5.6, 4.3, 3.7]) and k.tolist() == [1.0, 2.0, 0.0]
+
+
+def test_binary_duplicate_wavelengths_keep_file_order(tmp_path):
+    path = str(tmp_path / "dup.npz")
+    np.savez(path, wavelength=[500.0, 400.0, 400.0, 300.0], n=[1.0, 2.0, 3.0, 4.0], k=[0.0] * 4)
+    _, n, _, _ = load_nk_arrays(path)
+    assert n.tolist() == [4.0, 2.0, 3.0, 1.0]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "400 1.5 0.1\n500 1.6 0.2\n600 1.7 0.3\n",
+        "# comment\n\nwavelength n k\nnm - -\n400 1.5 0.1\n500 1.6 0.2\n600 1.7 0.3\n",
+        # metadata header longer than a couple of lines
+        "".join(f"key{i}: value {i}\n" for i in range(10)) + "wl n k\n400 1.5 0.1\n500 1.6 0.2\n600 1.7 0.3\n",
+        "wl n k\n400 1.5 0.1\n500 1.6 0.2\n",
+        "400 1.5 0.1\n500 1.6 0.2\n600 1.7 0.3\n700 1.",
+    ],
+)
+def test_sniff_accepts_nk_tables(text):
+    assert sniff_nk_buffer(text)
+    assert sniff_nk_buffer(text.encode())
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "just some prose\nwith a number 400\n",
+        "a b\nc d\n400 1.5 0.1\n",
+        "400 1.5\n500 1.6\n600 1.7\n",
+        "[bandgap]\nEg_G = 1.55\n",
+        "400,1.5,0.1\n500,1.6,0.2\n600,1.7,0.3\n",
+    ],
+)
+def test_sniff_rejects_other_text(text):
+    assert not sniff_nk_buffer(text)
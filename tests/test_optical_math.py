@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from optical_constant_plugin.normalizers.dispersion import nk_from_eps, tauc_lorentz_eps
+from optical_constant_plugin.normalizers.optical_math import (
+    HC_EV_NM,
+    canonical_grid,
+    canonical_vector,
+    column_median,
+    derived_quantities,
+    derived_scalars,
+    downsample_spectrum,
+    fixed_point_values,
+    kk_consistency,
+    lttb_indices,
+    merge_spectra,
+    minmax_indices,
+)
+
+
+def tauc_lorentz_nk(wl, A=100.0, E0=3.5, C=1.5, Eg=1.6, eps_inf=1.5):
+    return nk_from_eps(*tauc_lorentz_eps(HC_EV_NM / wl, A, E0, C, Eg, eps_inf))
+
+
+@pytest.mark.parametrize("lo,hi", [(250.0, 1500.0), (300.0, 900.0), (400.0, 2000.0), (20.0, 3000.0)])
+def test_kk_consistent_data_scores_high(lo, hi):
+    wl = np.linspace(lo, hi, 1000)
+    n, k = tauc_lorentz_nk(wl)
+    score, residual = kk_consistency(wl, n, k)
+    assert score > 0.9
+    assert residual.shape == wl.shape and np.isfinite(residual).all()
+
+
+@pytest.mark.parametrize("lo,hi", [(250.0, 1500.0), (300.0, 900.0), (400.0, 2000.0), (20.0, 3000.0)])
+def test_kk_stitched_data_scores_low(lo, hi):
+    wl = np.linspace(lo, hi, 1000)
+    n, k = tauc_lorentz_nk(wl)
+    consistent, _ = kk_consistency(wl, n, k)
+    stitched, residual = kk_consistency(wl, n + 0.05 * (wl > (lo + hi) / 2), k)
+    assert stitched < 0.7 < consistent
+    # the residual steps where the sources were stitched
+    mid = np.searchsorted(wl, (lo + hi) / 2)
+    assert residual[mid + 5] - residual[mid - 5] > 0.03
+
+
+def test_kk_wrong_k_units_score_low():
+    wl = np.linspace(250.0, 1500.0, 1000)
+    n, k = tauc_lorentz_nk(wl)
+    assert kk_consistency(wl, n, 10 * k)[0] < 0.5
+
+
+def test_kk_too_few_points():
+    score, residual = kk_consistency(np.linspace(400, 800, 10), np.ones(10), np.zeros(10))
+    assert np.isnan(score) and np.isnan(residual).all()
+
+
+def test_fixed_point_values_sorts_and_interpolates():
+    wl = np.array([800.0, 300.0, 600.0, np.nan, 1000.0])
+    n = 1.0 + wl / 1000.0
+    k = np.array([0.2, np.nan, 0.4, 9.0, 0.0])
+    n_vals, k_vals = fixed_point_values(wl, n, k, targets=(250.0, 400.0, 700.0, 1000.0))
+    np.testing.assert_allclose(n_vals, [np.nan, 1.4, 1.7, 2.0])
+    # k only uses its own finite points (600-1000 nm)
+    np.testing.assert_allclose(k_vals, [np.nan, np.nan, 0.3, 0.0])
+
+
+def test_minmax_keeps_peaks_and_ends():
+    x = np.linspace(0.0, 1.0, 10001)
+    y = np.sin(40 * x)
+    y[1234] = 5.0
+    y[8765] = -5.0
+    idx = minmax_indices([y], 200)
+    assert idx.size <= 200 and np.all(np.diff(idx) > 0)
+    assert {0, 1234, 8765, 10000} <= set(idx.tolist())
+    assert np.array_equal(minmax_indices([y[:100]], 200), np.arange(100))
+
+
+def test_lttb_keeps_peaks_and_ends():
+    x = np.linspace(0.0, 1.0, 10001)
+    y = np.zeros_like(x)
+    y[4321] = 1.0
+    idx = lttb_indices(x, y, 100)
+    assert idx.size <= 100 and np.all(np.diff(idx) > 0)
+    assert {0, 4321, 10000} <= set(idx.tolist())
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_spectrum(method):
+    wl = np.linspace(300.0, 1200.0, 20000)
+    n = 2.0 + 0.1 * np.sin(wl / 20.0)
+    k = np.exp(-((wl - 500.0) / 5.0) ** 2)
+    wl_d, (n_d, k_d) = downsample_spectrum(wl, [n, k], 500, method=method)
+    assert wl_d.size <= 500 and np.all(np.diff(wl_d) > 0)
+    assert (wl_d[0], wl_d[-1]) == (300.0, 1200.0)
+    # shared indices: every kept point is an original sample
+    np.testing.assert_array_equal(n_d, np.interp(wl_d, wl, n))
+    # the 10 nm wide absorption peak survives (LTTB keeps a point next to its top)
+    assert k_d.max() == pytest.approx(k.max(), rel=1e-2)
+
+    assert downsample_spectrum(wl, [n, k], 0)[0] is wl
+    with pytest.raises(ValueError):
+        downsample_spectrum(wl, [n, k], 500, method="every_nth")
+
+
+def test_derived_quantities_closed_form():
+    wl = np.array([500.0, 1000.0])
+    n = np.array([2.0, 1.5])
+    k = np.array([0.5, 0.0])
+    d = derived_quantities(wl, n, k)
+    np.testing.assert_allclose(d["absorption_coefficient"], [4 * np.pi * 0.5 / 500e-7, 0.0])
+    np.testing.assert_allclose(d["eps1"], [3.75, 2.25])
+    np.testing.assert_allclose(d["eps2"], [2.0, 0.0])
+    np.testing.assert_allclose(d["reflectance"], [1.25 / 9.25, 0.04])
+    assert d["penetration_depth"][0] == pytest.approx(500.0 / (2 * np.pi))
+    assert np.isnan(d["penetration_depth"][1])
+
+    s = derived_scalars(wl, d)
+    assert s["wavelength_alpha_max"] == 500.0
+    assert s["reflectance_mean"] == pytest.approx((1.25 / 9.25 + 0.04) / 2)
+
+
+def test_column_median_matches_nanmedian():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(7, 50))
+    M[rng.random(M.shape) < 0.3] = np.nan
+    M[:, 0] = np.nan
+    with pytest.warns(RuntimeWarning):
+        expected = np.nanmedian(M, axis=0)
+    np.testing.assert_allclose(column_median(M), expected)
+    assert np.isnan(column_median(np.empty((0, 3)))).all()
+
+
+def test_merge_spectra_median_over_covering_datasets():
+    wls = [np.array([400.0, 500.0, 600.0]), np.array([500.0, 600.0, 700.0]), np.array([400.0, 700.0])]
+    ns = [np.full(3, 1.0), np.full(3, 2.0), np.full(2, 4.0)]
+    ks = [np.zeros(3), np.full(3, 0.2), np.full(2, 0.4)]
+    grid, merged = merge_spectra(wls, ns, ks)
+    np.testing.assert_array_equal(grid, [400.0, 500.0, 600.0, 700.0])
+    np.testing.assert_allclose(merged["n"], [2.5, 2.0, 2.0, 3.0])
+    np.testing.assert_allclose(merged["k"], [0.2, 0.2, 0.2, 0.3])
+    np.testing.assert_array_equal(merged["count"], [2, 3, 3, 2])
+    np.testing.assert_allclose(merged["n_spread"], [1.5, np.std([1.0, 2.0, 4.0]), np.std([1.0, 2.0, 4.0]), 1.0])
+
+    grid, merged = merge_spectra(wls, ns, ks, max_points=3, statistic="mean")
+    np.testing.assert_array_equal(grid, [400.0, 550.0, 700.0])
+    np.testing.assert_allclose(merged["n"], [2.5, 7 / 3, 3.0])
+    with pytest.raises(ValueError):
+        merge_spectra(wls, ns, ks, statistic="mode")
+
+
+def test_canonical_vector_masks_uncovered_points():
+    grid = canonical_grid(300.0, 700.0, 5)
+    wl = np.array([400.0, 500.0, 600.0])
+    n_vec, k_vec, mask = canonical_vector(wl, [1.4, 1.5, 1.6], [0.1, np.nan, 0.3], grid)
+    assert n_vec.dtype == np.float32 and k_vec.dtype == np.float32
+    np.testing.assert_array_equal(mask, [False, True, True, True, False])
+    np.testing.assert_allclose(n_vec, [0.0, 1.4, 1.5, 1.6, 0.0], rtol=1e-6)
+    np.testing.assert_allclose(k_vec, [0.0, 0.1, 0.2, 0.3, 0.0], rtol=1e-6)
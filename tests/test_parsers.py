@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("nomad")
+
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from optical_constant_plugin.parsers.myparsers import ElectricalParserEntryPoint
+
+
+class Logger:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.mark.parametrize("fan_out", [False, True])
+def test_fan_out_keeps_plain_csv_rows(tmp_path, fan_out):
+    path = tmp_path / "Si_hall.csv"
+    path.write_text("Eg_eV,chi_eV,eps_r\n1.12,,\n,4.05,11.7\n")
+    parser = ElectricalParserEntryPoint(fan_out_materials=fan_out).load()
+
+    assert parser.is_mainfile(str(path)) is True
+    archive = EntryArchive(metadata=EntryMetadata(mainfile=path.name))
+    parser.parse(str(path), archive, Logger())
+
+    ds = archive.data.datasets[0]
+    assert archive.data.material == "Si"
+    assert ds.bandgap.magnitude == pytest.approx(1.12)
+    assert ds.electron_affinity.magnitude == pytest.approx(4.05)
+    assert ds.relative_permittivity == pytest.approx(11.7)
+
+
+def test_fan_out_splits_csv_library(tmp_path):
+    path = tmp_path / "library.csv"
+    path.write_text("material,Eg_eV\nSi,1.12\nGaAs,1.42\n")
+    parser = ElectricalParserEntryPoint(fan_out_materials=True).load()
+
+    keys = parser.is_mainfile(str(path))
+    assert keys == {"GaAs"}
+    archive = EntryArchive(metadata=EntryMetadata(mainfile=path.name))
+    children = {key: EntryArchive(metadata=EntryMetadata(mainfile=path.name, mainfile_key=key)) for key in keys}
+    parser.parse(str(path), archive, Logger(), child_archives=children)
+
+    assert archive.data.material == "Si"
+    assert children["GaAs"].data.datasets[0].bandgap.magnitude == pytest.approx(1.42)
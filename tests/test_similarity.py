@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from optical_constant_plugin.normalizers.optical_math import canonical_grid, canonical_vector
+from optical_constant_plugin.similarity import SNAPSHOT, SimilarityIndex, spectral_distance
+
+GRID = canonical_grid(300.0, 1200.0, 91)
+
+
+def curve(n0, edge, lo=300.0, hi=1200.0):
+    """Canonical vector of a Cauchy-like n with an absorption edge at `edge` nm."""
+    wl = np.linspace(lo, hi, 400)
+    n = n0 + 1e4 / wl ** 2
+    k = 0.5 / (1.0 + np.exp((wl - edge) / 20.0))
+    return canonical_vector(wl, n, k, GRID)
+
+
+def library():
+    rng = np.random.default_rng(1)
+    return {
+        f"entry{i}": (f"mat{i % 7}", curve(1.4 + rng.uniform(0.0, 1.5), rng.uniform(350.0, 900.0)))
+        for i in range(60)
+    }
+
+
+def test_add_refresh_save_query_round_trip(tmp_path):
+    root = str(tmp_path / "index")
+    entries = library()
+    writer = SimilarityIndex(root, components=8)
+    for entry_id, (material, vec) in entries.items():
+        writer.add(entry_id, *vec, material=material)
+
+    # a second process sees the entries through the vector files
+    reader = SimilarityIndex(root, components=8)
+    assert reader.refresh() == len(entries)
+    assert reader.refresh() == 0
+    reader.save()
+    assert os.path.exists(os.path.join(root, SNAPSHOT))
+
+    # re-adding an id replaces its row; a new id after the snapshot is picked up too
+    target = curve(2.0, 600.0)
+    writer.add("entry3", *target, material="mat3")
+    writer.add("late", *curve(2.01, 605.0), material="late")
+
+    loaded = SimilarityIndex(root, components=8)
+    assert loaded.refresh() == len(entries) + 2
+    assert len(loaded) == len(entries) + 1
+    assert loaded.refresh() == 0
+
+    hits = loaded.query(*target, top=3)
+    assert [h[0] for h in hits[:2]] == ["entry3", "late"]
+    assert hits[0][1] == "mat3" and hits[0][2] == pytest.approx(0.0, abs=1e-6)
+    assert [h[0] for h in loaded.query_entry("entry3", top=1)] == ["late"]
+
+
+def test_query_matches_brute_force():
+    entries = library()
+    index = SimilarityIndex(components=8)
+    for entry_id, (material, vec) in entries.items():
+        index.add(entry_id, *vec, material=material)
+
+    ids = list(entries)
+    V = np.stack([np.concatenate(entries[i][1][:2]) for i in ids])
+    M = np.stack([entries[i][1][2] for i in ids])
+    for n, k, mask in (curve(1.7, 500.0), curve(2.5, 800.0, lo=500.0), curve(1.5, 400.0, hi=800.0)):
+        rms = spectral_distance(V, M, np.concatenate([n, k])[None, :], mask[None, :])
+        expected = [ids[j] for j in np.argsort(rms, kind="stable")[:5]]
+        # all rows are candidates, so the PCA preselection cannot drop any
+        assert [h[0] for h in index.query(n, k, mask, top=5, candidates=len(ids))] == expected
+        assert [h[0] for h in index.query(n, k, mask, top=5)] == expected
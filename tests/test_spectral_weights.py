@@ -0,0 +1,30 @@
+import numpy as np
+
+from optical_constant_plugin.normalizers.spectral_weights import (
+    blackbody_spectrum,
+    hat_weights,
+    solar_descriptors,
+    spectrum_label,
+)
+
+
+def test_hat_weights_integrate_linear_interpolant():
+    x = np.array([0.0, 1.0, 3.0, 4.0])
+    y = np.array([1.0, 3.0, -1.0, 2.0])
+    assert np.isclose(hat_weights(x, x[0], x[-1]) @ y, 4.5)
+    # partial interval [0.5, 2]: 0.5 * (2 + 3) / 2 + 1 * (3 + 1) / 2
+    assert np.isclose(hat_weights(x, 0.5, 2.0) @ y, 3.25)
+
+
+def test_blackbody_scaled_to_total():
+    wl, irr = blackbody_spectrum(total=1000.0)
+    assert np.isclose(hat_weights(wl, wl[0], wl[-1]) @ irr, 1000.0)
+
+
+def test_solar_descriptors_of_constant_k():
+    wl = np.linspace(300.0, 1000.0, 200)
+    out = solar_descriptors(wl, np.full(wl.size, 2.0), np.full(wl.size, 0.3))
+    assert np.isclose(out["k_solar_weighted"], 0.3)
+    assert 0.0 < out["solar_coverage"] < 1.0
+    assert spectrum_label() == "blackbody 5778 K"
+    assert spectrum_label("/data/astm_g173.csv", 2) == "astm_g173.csv (column 2)"
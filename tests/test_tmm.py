@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from optical_constant_plugin.tmm import Material, simulate_stack
+
+WL = np.linspace(400.0, 800.0, 41)
+
+
+def test_bare_interface_fresnel():
+    res = simulate_stack([], WL, incident=1.0, exit=1.5)
+    np.testing.assert_allclose(res["R"], 0.04, atol=1e-12)
+    np.testing.assert_allclose(res["T"], 0.96, atol=1e-12)
+
+
+def test_quarter_wave_antireflection():
+    n_ar = np.sqrt(1.5)
+    res = simulate_stack([(Material.constant(n_ar), 600.0 / (4 * n_ar))], [600.0], exit=1.5)
+    assert res["R"][0, 0, 0] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_brewster_angle_p_polarization():
+    theta_b = np.degrees(np.arctan(1.5))
+    res = simulate_stack([], [600.0], angles_deg=theta_b, exit=1.5, polarization="p")
+    assert res["R"][0, 0, 0] == pytest.approx(0.0, abs=1e-12)
+
+
+@pytest.mark.parametrize("polarization", ["s", "p", "unpolarized"])
+def test_lossless_stack_conserves_energy(polarization):
+    stack = [(Material.constant(2.0), 120.0), (Material.constant(1.45), 90.0), (Material.constant(2.3), 60.0)]
+    res = simulate_stack(stack, WL, angles_deg=[0.0, 30.0, 60.0], exit=1.52, polarization=polarization)
+    np.testing.assert_allclose(res["R"] + res["T"], 1.0, atol=1e-12)
+    np.testing.assert_allclose(res["A_layers"], 0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize("polarization", ["s", "p", "unpolarized"])
+def test_absorbing_stack_layer_absorption_sums_to_total(polarization):
+    wl = np.linspace(300.0, 1000.0, 50)
+    absorber = Material(wl, 2.5 + 0.2 * np.sin(wl / 100.0), 0.3 * np.exp(-wl / 400.0), name="absorber")
+    stack = [(Material.constant(1.9, 0.01), 80.0), (absorber, np.linspace(50.0, 500.0, 7))]
+    res = simulate_stack(stack, WL, angles_deg=[0.0, 45.0], exit=1.5, polarization=polarization)
+    assert res["R"].shape == (7, 2, WL.size)
+    np.testing.assert_allclose(res["A_layers"].sum(axis=0), res["A"], atol=1e-10)
+    assert np.all(res["A_layers"] >= -1e-12)
+    assert np.all((res["R"] >= 0) & (res["T"] >= 0) & (res["A"] >= -1e-12))
+
+
+def test_thick_absorber_matches_beer_lambert():
+    # matched n (reflections only of order (k / 2n)^2): T = exp(-4 pi k d / lambda)
+    k, d = 0.01, 2000.0
+    res = simulate_stack([(Material.constant(1.5, k), d)], WL, incident=1.5, exit=1.5)
+    np.testing.assert_allclose(res["R"], 0.0, atol=1e-4)
+    np.testing.assert_allclose(res["T"][0, 0], np.exp(-4 * np.pi * k * d / WL), rtol=1e-3)